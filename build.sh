@@ -1,4 +1,6 @@
 #!/usr/bin/env bash
+# Build step of the web service (render.yaml). The task worker and the scheduled
+# commands (expire_jobs, rank_profiles, apply_retention) are separate services there.
 # exit on error
 set -o errexit
 
@@ -6,6 +8,9 @@ set -o errexit
 pip install -r requirements.txt
 
 # 2. Convert static assets
+# Moves any new inline <style> blocks into static bundles (no-op when there are none),
+# then collectstatic builds the hashed + gzip/Brotli precompressed files
+python manage.py extract_css
 python manage.py collectstatic --no-input
 
 # 3. Apply database migrations (Fixes "UndefinedTable" error)
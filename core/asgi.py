@@ -3,6 +3,22 @@ ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with uvicorn when the site has async views that wait on the network
+(talents.views.payments.verify_payment waits on Paystack): while one request waits, the
+worker's event loop keeps serving the others, instead of a sync worker sitting idle.
+
+    # Single host
+    uvicorn core.asgi:application --host 0.0.0.0 --port 8000 --workers 4
+
+    # Under gunicorn, which keeps gunicorn.conf.py's hooks (Prometheus multiprocess
+    # cleanup, worker restarts)
+    gunicorn core.asgi:application -k uvicorn_worker.UvicornWorker --workers 4
+
+Sync views keep working unchanged: Django runs them through sync_to_async, in a thread per
+request, so the ORM never runs on the event loop. Only views that spend their time on
+outbound I/O gain from being async. The talents middleware is async-capable, but
+WhiteNoiseMiddleware is sync-only: every request still crosses to a thread there and back.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -1,6 +1,7 @@
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 import os
+import sys
 import dj_database_url
 
 
@@ -32,9 +33,12 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
-    'cloudinary_storage',
     'django.contrib.staticfiles',
-    'cloudinary',
+    # cloudinary / cloudinary_storage are deliberately not installed apps: only the storage
+    # backend (MEDIA_STORAGE_BACKEND) is used, and as apps their template tag libraries import
+    # the whole SDK (~40ms) at startup of every process. The backend imports it on first use.
+    # This also keeps Django's collectstatic (not Cloudinary's upload-only override), which
+    # builds the hashed, precompressed bundles WhiteNoise serves.
     
     # --- THIRD PARTY APPS ---
     'django.contrib.sites',
@@ -48,6 +52,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'talents.middleware.MetricsMiddleware',  # Prometheus metrics served on /metrics
+    'talents.middleware.RequestProfilingMiddleware',  # Server-Timing header + sampled cProfile
+    'talents.middleware.QueryBudgetMiddleware',  # Off unless QUERY_INSPECTOR_ENABLED
+    'talents.middleware.ReplicaPinMiddleware',  # Off unless DATABASE_REPLICA_URLS is set
     'django.contrib.sessions.middleware.SessionMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -90,9 +98,47 @@ DATABASES = {
     }
 }
 
-db_from_env = dj_database_url.config(conn_max_age=600)
+# PostgreSQL (DATABASE_URL): persistent connections per worker, checked before reuse so a
+# connection dropped by the server or a failover doesn't fail the next request.
+# DB_POOLER=pgbouncer when connecting through PgBouncer in transaction mode: the pooler owns
+# the connections, so Django opens one per request and skips server-side cursors.
+DB_POOLER = config('DB_POOLER', default='')
+db_from_env = dj_database_url.config(
+    conn_max_age=0 if DB_POOLER == 'pgbouncer' else config('DB_CONN_MAX_AGE', default=600, cast=int),
+    conn_health_checks=True,
+    disable_server_side_cursors=DB_POOLER == 'pgbouncer',
+)
 DATABASES['default'].update(db_from_env)
 
+# Read replicas: comma separated URLs, e.g. two local SQLite files
+#   DATABASE_REPLICA_URLS=sqlite:////abs/path/db_replica.sqlite3  (cp db.sqlite3 db_replica.sqlite3)
+# Views decorated with @replica_reads (talents/routers.py) read from a random replica unless
+# the browser wrote in the last REPLICA_PIN_SECONDS. Everything else uses 'default'.
+DATABASE_REPLICAS = []
+for index, url in enumerate(config('DATABASE_REPLICA_URLS', default='', cast=Csv()), start=1):
+    alias = f'replica{index}'
+    DATABASES[alias] = dj_database_url.parse(
+        url, conn_max_age=DATABASES['default'].get('CONN_MAX_AGE', 0), conn_health_checks=True,
+    )
+    # Tests run against one database; replicas mirror it
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['talents.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+# SQLite: applied to every new connection (talents/db.py). WAL lets readers run while one
+# writer commits, synchronous=NORMAL is durable in WAL mode except for the last transactions
+# on power loss, and busy_timeout makes writers from other gunicorn workers wait for the lock
+# instead of failing with "database is locked". See 'manage.py bench_db_writers'.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'temp_store': 'memory',
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,  # KiB, i.e. 20MB per connection
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -138,15 +184,151 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')  
 
+# collectstatic writes content-hashed copies plus .gz/.br files (Brotli needs the 'Brotli' package).
+# WhiteNoise serves hashed files with a far-future immutable Cache-Control header, so the CSS
+# bundles extracted by 'manage.py extract_css' are downloaded once and cached forever.
+
+TESTING = 'test' in sys.argv
+
+# Tests run with DEBUG=False but without collectstatic, so there is no manifest to look up
+if TESTING:
+    STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+
 
 # Media Configuration (For Profile Pics)
 MEDIA_URL = '/media/'
-DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# --- CACHE ---
+# Per-process memory cache. Django's default of 300 entries is less than the media URLs of a
+# single browse page, which would evict each other (and the derivative markers) on every render.
+# Set REDIS_URL (e.g. redis://localhost:6379/0) to share one cache between all workers.
+REDIS_URL = config('REDIS_URL', default='')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }
+}
+if REDIS_URL:
+    CACHES['default'] = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL}
+
+# Public pages (home, browse, job/profile details, blog) are cached whole for visitors without a
+# session, keyed on the URL and query string (talents.pagecache). 0 turns it off; tests render
+# every request so they see the data they create.
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 0 if TESTING else config('ANONYMOUS_PAGE_CACHE_TIMEOUT', default=60, cast=int)
+
+# --- SESSIONS ---
+# SESSION_STORE picks where sessions live:
+#   db              one django_session read per request (Django's default)
+#   cached_db       read from the cache, written through to the database. Needs a shared
+#                   cache (REDIS_URL): with per-process caches a logout on one worker would
+#                   leave the session alive in the others
+#   signed_cookies  no server-side storage at all; the session (auth id, small data) is a
+#                   signed cookie. Can't be revoked server-side before it expires
+# Clean up expired rows of the database stores with 'manage.py purge_sessions'.
+SESSION_STORE = config('SESSION_STORE', default='cached_db' if REDIS_URL else 'db')
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_STORE}'
+
 # --- MEDIA FILES (Images via Cloudinary) ---
 MEDIA_URL = '/media/'
-DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+# talents.storage.CachedURLStorage caches the URLs built by the real backend; tests keep
+# their files in the local MEDIA_ROOT
+DEFAULT_FILE_STORAGE = 'talents.storage.CachedURLStorage'
+MEDIA_STORAGE_BACKEND = (
+    'django.core.files.storage.FileSystemStorage' if TESTING
+    else 'cloudinary_storage.storage.MediaCloudinaryStorage'
+)
+MEDIA_URL_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Resized avatar/cover copies built by talents.images: uploads are resized by the 'images' queue
+# of run_workers, existing pictures by 'manage.py build_image_derivatives' (IMAGE_DERIVATIVE_WORKERS).
+# Widths cover the 30-180px avatars at 1x and 2x pixel density.
+IMAGE_DERIVATIVE_WIDTHS = (48, 96, 192, 400)
+IMAGE_DERIVATIVE_FORMATS = ('webp', 'avif')
+IMAGE_DERIVATIVE_WORKERS = config('IMAGE_DERIVATIVE_WORKERS', default=2, cast=int)
+
+# --- SQL QUERY BUDGETS (talents.middleware.QueryBudgetMiddleware) ---
+# Per URL name maximum number of queries (session and user lookups included). A view going
+# over budget, or running the same query shape QUERY_N_PLUS_ONE_THRESHOLD times (N+1),
+# fails the tests and is logged to 'talents.queries' on staging (QUERY_INSPECTOR_ENABLED=True).
+QUERY_INSPECTOR_ENABLED = config('QUERY_INSPECTOR_ENABLED', default=DEBUG or TESTING, cast=bool)
+QUERY_INSPECTOR_RAISE = TESTING
+QUERY_N_PLUS_ONE_THRESHOLD = 5
+QUERY_BUDGET_DEFAULT = None
+QUERY_BUDGETS = {
+    'home': 14, 'about': 6, 'privacy': 6, 'careers': 6, 'contact': 6, 'blog': 6, 'blog_detail': 6,
+    'register': 2, 'login': 5, 'logout': 4, 'dashboard': 8, 'complete_onboarding': 2,
+    'notifications': 4, 'nav_state': 4, 'profile_update': 8, 'profile_detail': 13, 'browse': 9, 'toggle_follow': 8,
+    'job_list': 11, 'job_feed': 8, 'post_job': 6, 'my_jobs': 9, 'job_detail': 10, 'toggle_save_job': 5,
+    'apply_to_job': 9, 'manage_job': 11, 'edit_job': 7, 'create_contract': 8, 'contract_detail': 13,
+    'inbox': 6, 'chat_detail': 10, 'wallet': 10, 'payment_checkout': 7, 'verify_payment': 5,
+    'settings': 8, 'verify_identity': 6, 'leave_review': 6, 'profile_view': 11, 'hire_freelancer': 9,
+}
+
+# --- REQUEST PROFILING (talents.middleware.RequestProfilingMiddleware) ---
+# Server-Timing header (db/tpl/http/media/app) for staff users and requests sent with
+# 'X-Profile-Token: <manage.py profile_token>', or for everyone with SERVER_TIMING_PUBLIC (it shows
+# DB time and query counts). Those requests, and a PROFILING_SAMPLE_RATE sample of all requests,
+# are run under cProfile and the .prof file written to PROFILING_DIR.
+SERVER_TIMING_ENABLED = config('SERVER_TIMING_ENABLED', default=True, cast=bool)
+SERVER_TIMING_PUBLIC = config('SERVER_TIMING_PUBLIC', default=DEBUG, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_DIR = config('PROFILING_DIR', default=os.path.join(BASE_DIR, 'profiles'))
+PROFILING_TOKEN_MAX_AGE = 60 * 60
+
+# --- TALENT RANKING (talents/ranking.py, 'manage.py rank_profiles' nightly, see render.yaml) ---
+# Profile.rank_score orders home's top talents and browse. Each part is scored 0..1 and
+# weighted: completeness, verified, rating (pulled towards RANK_RATING_PRIOR by
+# RANK_RATING_PRIOR_WEIGHT phantom reviews), response rate to messages of the last
+# RANK_WINDOW_DAYS, and activity (halves every RANK_ACTIVITY_HALF_LIFE_DAYS without any).
+RANK_WEIGHTS = {'completeness': 0.3, 'verified': 0.15, 'rating': 0.25, 'response_rate': 0.15, 'activity': 0.15}
+RANK_RATING_PRIOR = 3.0
+RANK_RATING_PRIOR_WEIGHT = 3
+RANK_WINDOW_DAYS = 90
+RANK_ACTIVITY_HALF_LIFE_DAYS = 30
+
+# --- JOB LIFECYCLE ('manage.py expire_jobs', hourly cron in render.yaml, or with --every) ---
+# Open jobs close JOB_LIFETIME_DAYS after posting if nobody was hired; the client is notified.
+JOB_LIFETIME_DAYS = config('JOB_LIFETIME_DAYS', default=30, cast=int)
+# post_job warns when a new job is this similar (estimated Jaccard of word 3-grams, see
+# talents/minhash.py) to an open job of the same client; 'manage.py dedupe_jobs' closes them.
+DUPLICATE_JOB_THRESHOLD = 0.8
+
+# --- JOB FEED (talents/feed.py) ---
+# Posting or editing a job queues a fan-out ('feeds' queue) into the feed of every freelancer
+# with at least FEED_MATCH_THRESHOLD of its skills. Jobs matching more than FEED_FANOUT_LIMIT
+# freelancers are read from the jobs table instead. Feeds keep FEED_MAX_ENTRIES_PER_USER jobs.
+FEED_MATCH_THRESHOLD = 0.5
+FEED_FANOUT_LIMIT = config('FEED_FANOUT_LIMIT', default=10000, cast=int)
+FEED_MAX_ENTRIES_PER_USER = 500
+FEED_PAGE_SIZE = 20
+
+# --- DATA RETENTION ('manage.py apply_retention', daily cron in render.yaml) ---
+# Rows older than `days` (and matching `filter`) are deleted, or with 'archive' first written
+# to gzipped JSON-lines files in RETENTION_ARCHIVE_DIR. That must be durable storage (not the
+# ephemeral disk of a Render service), so it has no default and 'archive' refuses to run unset.
+RETENTION_POLICIES = {
+    'talents.Notification': {'days': 90, 'filter': {'is_read': True}, 'action': 'delete'},
+    'talents.Message': {'days': 365, 'action': 'archive'},
+    'talents.ContactMessage': {'days': 180, 'action': 'archive'},
+}
+RETENTION_ARCHIVE_DIR = config('RETENTION_ARCHIVE_DIR', default='')
+
+# --- BACKGROUND TASKS (talents/taskqueue.py, run with 'manage.py run_workers') ---
+# Emails, notifications and Paystack checks are queued in the database and run by workers:
+# the 'talenthub-worker' service of render.yaml, or `manage.py run_workers` locally.
+TASKS_EAGER = config('TASKS_EAGER', default=False, cast=bool)  # Run inline, no workers needed
+TASKS_LOCK_TIMEOUT = 15 * 60  # Seconds before a task of a dead worker is requeued
+TASKS_HEARTBEAT = 30  # Seconds between worker heartbeats (talents_background_workers on /metrics)
+TASKS_KEEP_DONE = False  # Finished tasks are deleted; dead ones are kept
+
+# --- METRICS (talents.metrics, scraped from /metrics) ---
+# Under gunicorn set PROMETHEUS_MULTIPROC_DIR to an empty directory so all workers are
+# aggregated (gunicorn.conf.py cleans up after dead workers). /metrics answers 404 until
+# METRICS_TOKEN is set (DEBUG aside); the scraper sends 'Authorization: Bearer <token>'.
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
 
 # 👇 USE THIS EXACT BLOCK 👇
 CLOUDINARY_STORAGE = {
@@ -182,6 +364,11 @@ EMAIL_USE_SSL = False
 EMAIL_HOST_USER = config('EMAIL_HOST_USER') # From your .env file
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD') # From your .env file
 
+# Newsletters ('manage.py send_newsletter'): one SMTP connection per batch, throttled so
+# Gmail's sending limits aren't hit
+NEWSLETTER_BATCH_SIZE = 100
+NEWSLETTER_RATE = config('NEWSLETTER_RATE', default=5, cast=float)  # Messages per second
+
 
 SOCIALACCOUNT_LOGIN_ON_GET = True
 SOCIALACCOUNT_ADAPTER = 'talents.adapters.MySocialAccountAdapter'
@@ -189,4 +376,5 @@ SOCIALACCOUNT_ADAPTER = 'talents.adapters.MySocialAccountAdapter'
 
 # --- PAYSTACK SETTINGS (SECURE) ---
 PAYSTACK_PUBLIC_KEY = config('PAYSTACK_PUBLIC_KEY')
-PAYSTACK_SECRET_KEY = config('PAYSTACK_SECRET_KEY')
\ No newline at end of file
+PAYSTACK_SECRET_KEY = config('PAYSTACK_SECRET_KEY')
+PAYSTACK_API_URL = config('PAYSTACK_API_URL', default='https://api.paystack.co')  # A fake gateway in benchmarks
\ No newline at end of file
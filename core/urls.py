@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include # Import include
 from django.conf import settings # Import settings
 from django.conf.urls.static import static # Import static
+from talents.views.ops import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -13,6 +14,9 @@ urlpatterns = [
     # This activates the 'password_reset/' URLs causing your 404 error
     path('accounts/', include('django.contrib.auth.urls')), 
 
+    # Prometheus scrape endpoint (latency, queries, cache, background tasks)
+    path('metrics', metrics_view, name='metrics'),
+
     # 3. Your App URLs
     path('', include('talents.urls')), 
 ]
@@ -0,0 +1,18 @@
+# Picked up automatically by `gunicorn core.wsgi` when started from the project root.
+import os
+import shutil
+
+
+def on_starting(server):
+    # Prometheus multiprocess mode needs an empty directory on every start
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Drops the live gauges of a worker that died, so they aren't summed forever
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
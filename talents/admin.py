@@ -1,21 +1,188 @@
-from django.contrib import admin
-from .models import Profile, Skill, Job, Proposal, Contract, Review, Notification, BlogPost, ContactMessage, Subscriber, Message, Transaction
-
-
-# Register your models here
-admin.site.register(Profile)
-admin.site.register(Skill)
-admin.site.register(Job)        # <--- THIS WAS MISSING
-admin.site.register(Proposal)
-admin.site.register(Contract)
-admin.site.register(Review)
-admin.site.register(Notification)
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils import timezone
+from django.utils.functional import cached_property
+from . import ranking
+from .models import Profile, Skill, Job, Proposal, Contract, Review, Notification, BlogPost, ContactMessage, Subscriber, Message, Transaction, Task
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator for changelists of big tables. An exact COUNT(*) scans the whole table on
+    PostgreSQL, so an unfiltered changelist uses the planner's row estimate instead (kept up
+    to date by autovacuum) once the table is past ESTIMATE_ABOVE rows. Filtered and
+    searched changelists, and other databases, still count exactly."""
+
+    ESTIMATE_ABOVE = 100_000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            connection = connections[self.object_list.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                                   [self.object_list.model._meta.db_table])
+                    row = cursor.fetchone()
+                if row and row[0] > self.ESTIMATE_ABOVE:
+                    return row[0]
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Defaults for tables that grow without bound: estimated counts, no second COUNT(*) of
+    the whole table next to filtered results, and primary key order (an index scan)."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ('-pk',)
+
+
+def chunked_update(queryset, chunk_size=1000, after_chunk=None, **values):
+    """UPDATE the rows of `queryset` a primary key chunk at a time, so an action on
+    "all 2,000,000 selected" doesn't lock the table in one long statement. update() sends
+    no signals: `after_chunk(pks)` recomputes what they would have. Returns the number of
+    rows updated."""
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    model = queryset.model
+    updated = 0
+    last_pk = 0
+    while True:
+        chunk = list(pks.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return updated
+        updated += model.objects.filter(pk__in=chunk).update(**values)
+        if after_chunk:
+            after_chunk(chunk)
+        last_pk = chunk[-1]
+
+
+@admin.register(Profile)
+class ProfileAdmin(LargeTableAdmin):
+    list_display = ('user', 'role', 'location', 'is_verified', 'onboarding_complete', 'created_at')
+    list_filter = ('role', 'is_verified', 'onboarding_complete')
+    list_select_related = ('user',)
+    # Exact and prefix matches can use the username/slug indexes, LIKE '%...%' can't
+    search_fields = ('user__username__exact', 'slug__startswith', 'location__startswith')
+    raw_id_fields = ('user', 'follows')
+    autocomplete_fields = ('skills',)
+    actions = ('verify_profiles', 'unverify_profiles')
+
+    @admin.action(description='Verify selected profiles')
+    def verify_profiles(self, request, queryset):
+        count = chunked_update(queryset, after_chunk=ranking.refresh, is_verified=True, updated_at=timezone.now())
+        self.message_user(request, f"{count} profiles verified.", messages.SUCCESS)
+
+    @admin.action(description='Remove verification from selected profiles')
+    def unverify_profiles(self, request, queryset):
+        count = chunked_update(queryset, after_chunk=ranking.refresh, is_verified=False, updated_at=timezone.now())
+        self.message_user(request, f"{count} profiles unverified.", messages.SUCCESS)
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    search_fields = ('name',)  # Backs the skill autocompletes
+
+
+@admin.register(Job)
+class JobAdmin(LargeTableAdmin):
+    list_display = ('title', 'client', 'job_type', 'budget', 'is_active', 'created_at')
+    list_filter = ('is_active', 'job_type', 'experience_level')
+    list_select_related = ('client',)
+    search_fields = ('title__startswith', 'slug__exact', 'client__username__exact')
+    raw_id_fields = ('client', 'applicants')
+    autocomplete_fields = ('skills_required',)
+    actions = ('deactivate_jobs',)
+
+    @admin.action(description='Close selected jobs')
+    def deactivate_jobs(self, request, queryset):
+        count = chunked_update(queryset, is_active=False, updated_at=timezone.now())
+        self.message_user(request, f"{count} jobs closed.", messages.SUCCESS)
+
+
+@admin.register(Proposal)
+class ProposalAdmin(LargeTableAdmin):
+    list_display = ('__str__', 'bid_amount', 'status', 'created_at')
+    list_filter = ('status',)
+    list_select_related = ('freelancer', 'job')  # both used by __str__
+    search_fields = ('freelancer__username__exact',)
+    raw_id_fields = ('job', 'freelancer')
+
+
+@admin.register(Contract)
+class ContractAdmin(LargeTableAdmin):
+    list_display = ('__str__', 'client', 'freelancer', 'agreed_price', 'status', 'start_date')
+    list_filter = ('status',)
+    list_select_related = ('job', 'client', 'freelancer')
+    search_fields = ('client__username__exact', 'freelancer__username__exact')
+    raw_id_fields = ('job', 'client', 'freelancer', 'proposal')
+
+
+@admin.register(Review)
+class ReviewAdmin(LargeTableAdmin):
+    list_display = ('__str__', 'rating', 'created_at')
+    list_filter = ('rating',)
+    list_select_related = ('talent__user', 'author')
+    raw_id_fields = ('talent', 'author')
+
+
+@admin.register(Notification)
+class NotificationAdmin(LargeTableAdmin):
+    list_display = ('user', 'message', 'is_read', 'created_at')
+    list_filter = ('is_read',)
+    list_select_related = ('user',)
+    search_fields = ('user__username__exact',)
+    raw_id_fields = ('user',)
+    actions = ('mark_read',)
+
+    @admin.action(description='Mark selected notifications as read')
+    def mark_read(self, request, queryset):
+        count = chunked_update(queryset, is_read=True)
+        self.message_user(request, f"{count} notifications marked as read.", messages.SUCCESS)
+
+
 admin.site.register(BlogPost)
-admin.site.register(ContactMessage)
-admin.site.register(Subscriber)
-admin.site.register(Message)
+
+
+@admin.register(ContactMessage)
+class ContactMessageAdmin(LargeTableAdmin):
+    list_display = ('name', 'email', 'subject', 'created_at')
+    search_fields = ('email__exact',)
+
+
+@admin.register(Subscriber)
+class SubscriberAdmin(LargeTableAdmin):
+    list_display = ('email', 'subscribed_at')
+    search_fields = ('email__startswith',)  # unique, so indexed
+
+
+@admin.register(Message)
+class MessageAdmin(LargeTableAdmin):
+    list_display = ('__str__', 'conversation', 'created_at', 'read_at')
+    list_select_related = ('conversation', 'sender', 'recipient')
+    search_fields = ('sender__username__exact', 'recipient__username__exact')
+    raw_id_fields = ('conversation', 'sender', 'recipient')
+
+
 @admin.register(Transaction)
-class TransactionAdmin(admin.ModelAdmin):
+class TransactionAdmin(LargeTableAdmin):
     list_display = ('user', 'transaction_type', 'amount', 'status', 'created_at')
     list_filter = ('transaction_type', 'status')
-    search_fields = ('user__username', 'reference')
\ No newline at end of file
+    list_select_related = ('user',)
+    # Was a LIKE '%...%' over user__username; exact matches use the username and reference indexes
+    search_fields = ('user__username__exact', 'reference__exact')
+    raw_id_fields = ('user', 'contract')
+
+
+@admin.register(Task)
+class TaskAdmin(LargeTableAdmin):
+    list_display = ('name', 'queue', 'status', 'attempts', 'run_at', 'locked_by')
+    list_filter = ('status', 'queue')
+    # Exact task paths only: LIKE '%...%' over names and error texts reads the whole table
+    search_fields = ('name__exact',)
+    actions = ('requeue',)
+
+    @admin.action(description='Requeue selected tasks')
+    def requeue(self, request, queryset):
+        count = chunked_update(queryset, status='queued', attempts=0, locked_by='', run_at=timezone.now())
+        self.message_user(request, f"{count} tasks requeued.", messages.SUCCESS)
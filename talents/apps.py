@@ -4,3 +4,20 @@ from django.apps import AppConfig
 class TalentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'talents'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .db import configure_connection, install_observers
+
+        connection_created.connect(install_observers, dispatch_uid='talents.db.install_observers')
+        connection_created.connect(configure_connection, dispatch_uid='talents.db.configure_connection')
+
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+        from . import ranking
+        from .models import Profile, Review
+
+        post_save.connect(ranking.profile_saved, sender=Profile, dispatch_uid='talents.ranking.profile_saved')
+        m2m_changed.connect(ranking.profile_skills_changed, sender=Profile.skills.through,
+                            dispatch_uid='talents.ranking.profile_skills_changed')
+        post_save.connect(ranking.review_changed, sender=Review, dispatch_uid='talents.ranking.review_saved')
+        post_delete.connect(ranking.review_changed, sender=Review, dispatch_uid='talents.ranking.review_deleted')
@@ -0,0 +1,78 @@
+import contextlib
+import contextvars
+import functools
+import statistics
+
+from django.conf import settings
+from django.db.models import Aggregate, FloatField
+
+
+class Median(Aggregate):
+    """MEDIAN(expression): percentile_cont on PostgreSQL, a Python aggregate registered on
+    every SQLite connection (below) otherwise."""
+    function = 'MEDIAN'
+    name = 'Median'
+    output_field = FloatField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function='PERCENTILE_CONT',
+                           template='%(function)s(0.5) WITHIN GROUP (ORDER BY %(expressions)s)', **extra_context)
+
+
+class _SQLiteMedian:
+    def __init__(self):
+        self.values = []
+
+    def step(self, value):
+        if value is not None:
+            self.values.append(float(value))
+
+    def finalize(self):
+        return statistics.median(self.values) if self.values else None
+
+
+def configure_connection(sender, connection, **kwargs):
+    """connection_created receiver: applies settings.SQLITE_PRAGMAS to new SQLite connections
+    and registers the MEDIAN aggregate."""
+    if connection.vendor != 'sqlite':
+        return
+    connection.connection.create_aggregate('MEDIAN', 1, _SQLiteMedian)
+    pragmas = dict(getattr(settings, 'SQLITE_PRAGMAS', {}))
+    # An explicit OPTIONS['timeout'] (e.g. seed_scale's bulk writers) is also a busy timeout,
+    # don't shorten it
+    timeout = connection.settings_dict.get('OPTIONS', {}).get('timeout')
+    if timeout and 'busy_timeout' in pragmas:
+        pragmas['busy_timeout'] = max(pragmas['busy_timeout'], int(timeout * 1000))
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+# Execute wrappers of the request being served (see observe_queries). A context variable
+# follows an async request into the sync_to_async threads running its ORM calls, where a
+# connection.execute_wrapper() entered on the event loop's connection wouldn't see them.
+_observers = contextvars.ContextVar('talents_query_observers', default=())
+
+
+def _run_observers(execute, sql, params, many, context):
+    for observer in reversed(_observers.get()):
+        execute = functools.partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+def install_observers(sender, connection, **kwargs):
+    """connection_created receiver: routes every query of the connection through the
+    observers of the current request."""
+    if _run_observers not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _run_observers)
+
+
+@contextlib.contextmanager
+def observe_queries(observer):
+    """Like connection.execute_wrapper(observer), for every connection and thread used while
+    the block (a request) runs. Observers entered first are the outermost."""
+    token = _observers.set(_observers.get() + (observer,))
+    try:
+        yield
+    finally:
+        _observers.reset(token)
@@ -0,0 +1,105 @@
+import math
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import FeedEntry, Job, Profile
+
+
+def threshold():
+    return getattr(settings, 'FEED_MATCH_THRESHOLD', 0.5)
+
+
+def max_entries():
+    return getattr(settings, 'FEED_MAX_ENTRIES_PER_USER', 500)
+
+
+def fanout_limit():
+    return getattr(settings, 'FEED_FANOUT_LIMIT', 10000)
+
+
+def page_size():
+    return getattr(settings, 'FEED_PAGE_SIZE', 20)
+
+
+def matches(skill_ids):
+    """(user id, matched skills) of the freelancers having at least FEED_MATCH_THRESHOLD of
+    `skill_ids`, in user id order."""
+    needed = max(math.ceil(threshold() * len(skill_ids)), 1)
+    return (
+        Profile.skills.through.objects.filter(skill_id__in=skill_ids, profile__role='freelancer')
+        .values_list('profile__user_id').annotate(matched=Count('skill_id')).filter(matched__gte=needed)
+        .order_by('profile__user_id')
+    )
+
+
+def fan_out(job, chunk_size=1000):
+    """Writes `job` into the feed of every matching freelancer (run by the fan_out_job task
+    when a job is posted or edited). Returns the number of entries written.
+
+    Jobs matching more than FEED_FANOUT_LIMIT freelancers (popular skills) aren't pushed
+    at all: they are flagged feed_pull and merged into feeds when they are read.
+    """
+    FeedEntry.objects.filter(job=job).delete()
+    skill_ids = list(job.skills_required.values_list('id', flat=True))
+    if not job.is_active or not skill_ids:
+        return 0
+
+    candidates = matches(skill_ids).exclude(profile__user_id=job.client_id)
+    pull = bool(list(candidates[fanout_limit():fanout_limit() + 1]))
+    if pull != job.feed_pull:
+        Job.objects.filter(id=job.id).update(feed_pull=pull)
+        job.feed_pull = pull
+    if pull:
+        return 0
+
+    written = 0
+    last_user = 0
+    while True:
+        chunk = list(candidates.filter(profile__user_id__gt=last_user)[:chunk_size])
+        if not chunk:
+            return written
+        with transaction.atomic():
+            FeedEntry.objects.bulk_create([
+                FeedEntry(user_id=user_id, job=job, score=matched / len(skill_ids), posted_at=job.created_at)
+                for user_id, matched in chunk
+            ], ignore_conflicts=True)
+            trim([user_id for user_id, _ in chunk])
+        written += len(chunk)
+        last_user = chunk[-1][0]
+
+
+def trim(user_ids):
+    """Drops the oldest entries of the users over FEED_MAX_ENTRIES_PER_USER."""
+    cap = max_entries()
+    full = (FeedEntry.objects.filter(user__in=user_ids).order_by().values_list('user')
+            .annotate(count=Count('id')).filter(count__gt=cap))
+    for user_id, _ in full:
+        entries = FeedEntry.objects.filter(user=user_id)
+        oldest_kept = entries.order_by('-posted_at', '-id').values_list('posted_at', flat=True)[cap - 1]
+        entries.filter(posted_at__lt=oldest_kept).delete()
+
+
+def page(user, before=None, size=None):
+    """The newest feed jobs of `user` posted before `before`: one range of feed_page_idx,
+    plus the few feed_pull jobs matching their skills."""
+    size = size or page_size()
+    pushed = FeedEntry.objects.filter(user=user, job__is_active=True).order_by('-posted_at')
+    pulled = Job.objects.filter(is_active=True, feed_pull=True).order_by('-created_at')
+    if before:
+        pushed = pushed.filter(posted_at__lt=before)
+        pulled = pulled.filter(created_at__lt=before)
+    jobs = [entry.job for entry in pushed.select_related('job').prefetch_related('job__skills_required')[:size]]
+
+    my_skills = list(Profile.skills.through.objects.filter(profile__user=user).values_list('skill_id', flat=True))
+    if my_skills:
+        # The threshold is applied in SQL, so the page is filled by matches only
+        candidates = pulled.exclude(client=user).annotate(
+            required=Count('skills_required', distinct=True),
+            matched=Count('skills_required', filter=Q(skills_required__in=my_skills), distinct=True),
+        ).filter(matched__gt=0, matched__gte=F('required') * threshold())
+        jobs += candidates.prefetch_related('skills_required')[:size]
+
+    jobs.sort(key=lambda job: job.created_at, reverse=True)
+    return jobs[:size]
@@ -44,7 +44,7 @@ class ProfileUpdateForm(forms.ModelForm):
         model = Profile
         # Added: headline, years_experience, availability, english_level, tools, project_link
         fields = [
-            'profile_pic', 'headline', 'bio', 'location', 
+            'profile_pic', 'cover_photo', 'headline', 'bio', 'location', 
             'hourly_rate', 'years_experience', 'availability', 
             'english_level', 'company_name', 'project_link', 
             'tools', 'skills'
@@ -0,0 +1,128 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+# Derivatives live next to the original, e.g.
+#   profile_pics/jane.jpg -> profile_pics/derived/jane_96w.webp
+DERIVED_DIR = 'derived'
+DEFAULT_IMAGE = 'default.jpg'
+
+
+def widths():
+    return tuple(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (48, 96, 192, 400)))
+
+
+def formats():
+    return tuple(getattr(settings, 'IMAGE_DERIVATIVE_FORMATS', ('webp',)))
+
+
+def derivative_name(name, width, fmt):
+    folder, file_name = os.path.split(name)
+    stem = os.path.splitext(file_name)[0]
+    return os.path.join(folder, DERIVED_DIR, f"{stem}_{width}w.{fmt}").replace(os.sep, '/')
+
+
+def _marker_key(name):
+    return f"img-derivatives:{name}"
+
+
+def derived_width(name, storage=default_storage):
+    """Width of the largest derivative of `name`: the largest configured width, or the
+    original's own width when it is narrower (originals are never upscaled). 0 until
+    every derivative has been written.
+
+    The last file generated is checked, and the answer is cached so templates don't
+    hit the storage backend (an HTTP call on Cloudinary) for every card.
+    """
+    from PIL import Image
+
+    if not name or name == DEFAULT_IMAGE:
+        return 0
+    key = _marker_key(name)
+    width = cache.get(key)
+    if width is None:
+        try:
+            with storage.open(derivative_name(name, widths()[-1], formats()[-1]), 'rb') as f:
+                width = Image.open(f).width  # Only reads the header
+        except Exception:
+            # Not written yet, or a storage hiccup: the page serves the original instead
+            width = 0
+        cache.set(key, width, 60 * 60 * 24 if width else 60 * 5)
+    return width
+
+
+def has_derivatives(name, storage=default_storage):
+    return bool(derived_width(name, storage))
+
+
+def srcset_candidates(image, fmt):
+    """The 'url 96w, ...' list of the derivatives of `image`, or '' until they exist.
+
+    Each descriptor is the real width of the file: the copies of a small original made
+    for the wider sizes are the original's size, so only the first of them is listed.
+    """
+    largest = derived_width(image.name, image.storage)
+    if fmt not in formats() or not largest:
+        return ''
+    candidates = []
+    for width in widths():
+        candidates.append(f"{image.storage.url(derivative_name(image.name, width, fmt))} {min(width, largest)}w")
+        if width >= largest:
+            break
+    return ', '.join(candidates)
+
+
+def generate_derivatives(name, storage=default_storage, force=False):
+    """Writes a resized copy of `name` for every configured width and format.
+
+    Returns the number of files written. Works through the storage API, so the same
+    code runs against local MEDIA_ROOT and Cloudinary.
+    """
+    from PIL import Image, ImageOps
+
+    if not name or name == DEFAULT_IMAGE:
+        return 0
+    if not force and has_derivatives(name, storage):
+        return 0
+
+    with storage.open(name, 'rb') as f:
+        original = Image.open(f)
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+    if original.mode not in ('RGB', 'RGBA'):
+        original = original.convert('RGBA' if 'transparency' in original.info else 'RGB')
+
+    written = 0
+    for fmt in formats():
+        for width in widths():
+            # Never upscale: small originals just get copied at their own size
+            target = min(width, original.width)
+            height = round(original.height * target / original.width)
+            resized = original.resize((target, height), Image.LANCZOS)
+
+            buffer = BytesIO()
+            resized.save(buffer, format=fmt.upper(), quality=80)
+            derived = derivative_name(name, width, fmt)
+            if storage.exists(derived):
+                storage.delete(derived)
+            storage.save(derived, ContentFile(buffer.getvalue()))
+            written += 1
+
+    cache.set(_marker_key(name), min(widths()[-1], original.width), 60 * 60 * 24)
+    return written
+
+
+def schedule_derivatives(name):
+    """Queues derivative generation for a freshly uploaded image (the 'images' queue of
+    run_workers) and returns immediately. Until it has run, templates serve the original."""
+    if not name or name == DEFAULT_IMAGE:
+        return None
+    cache.delete(_marker_key(name))
+    from .tasks import build_image_derivatives
+
+    return build_image_derivatives.delay(name)
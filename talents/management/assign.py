@@ -0,0 +1,44 @@
+import time
+from talents import ranking
+from talents.models import Profile
+
+
+def assign_profile_pics(pick, stdout, batch_size=1000, progress_every=10000):
+    """Shared chunked assigner used by assign_images and assign_local_images.
+
+    Streams every non-superuser profile in id order, asks `pick(profile)` for the image
+    name and writes the changes with one bulk_update per `batch_size` rows. Superusers
+    are filtered out in SQL, so no per-row User lookups happen. bulk_update sends no
+    post_save, so each batch's completeness and rank_score are recomputed here.
+    Returns the number of profiles updated.
+    """
+    profiles = (
+        Profile.objects.select_related('user')
+        .filter(user__is_superuser=False)
+        .only('id', 'profile_pic', 'user__is_superuser')
+        .order_by('id')
+    )
+
+    started = time.monotonic()
+    count = 0
+    batch = []
+    for profile in profiles.iterator(chunk_size=batch_size):
+        profile.profile_pic = pick(profile)
+        batch.append(profile)
+        if len(batch) >= batch_size:
+            save(batch)
+            count += len(batch)
+            batch = []
+            if count % progress_every < batch_size:
+                rate = count / max(time.monotonic() - started, 0.001)
+                stdout.write(f"  {count} profiles updated ({rate:,.0f}/s)")
+
+    if batch:
+        save(batch)
+        count += len(batch)
+    return count
+
+
+def save(batch):
+    Profile.objects.bulk_update(batch, ['profile_pic'])
+    ranking.refresh([profile.id for profile in batch])
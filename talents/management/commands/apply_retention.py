@@ -0,0 +1,109 @@
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Deletes or archives expired notifications, messages and contact messages (RETENTION_POLICIES)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', nargs='*', help='Only apply these policies (e.g. talents.Notification)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows deleted per transaction')
+        parser.add_argument('--pause', type=float, default=0.05,
+                            help='Seconds to sleep between chunks, so other writers get the tables')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be removed')
+
+    def handle(self, *args, **options):
+        policies = settings.RETENTION_POLICIES
+        labels = options['only'] or list(policies)
+        unknown = set(labels) - set(policies)
+        if unknown:
+            raise CommandError(f"No retention policy for: {', '.join(sorted(unknown))}")
+        # Refuse before touching anything: archiving to an unset (or ephemeral) directory
+        # would delete the rows for good
+        archived = [label for label in labels if policies[label].get('action', 'delete') == 'archive']
+        if archived and not settings.RETENTION_ARCHIVE_DIR and not options['dry_run']:
+            raise CommandError(
+                f"RETENTION_ARCHIVE_DIR is not set, so these policies can't archive: {', '.join(archived)}. "
+                f"Point it at durable storage, or leave them out with --only."
+            )
+
+        self.stdout.write(f"{'policy':<26}{'action':<9}{'older than':>11}{'rows':>10}{'rows/s':>10}")
+        total = 0
+        for label in labels:
+            total += self.apply(label, policies[label], options)
+
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS(
+            f"Done! {total} rows {'would be ' if options['dry_run'] else ''}removed."
+        ))
+
+    def apply(self, label, policy, options):
+        model = apps.get_model(label)
+        action = policy.get('action', 'delete')
+        cutoff = timezone.now() - timedelta(days=policy['days'])
+        expired = model.objects.filter(created_at__lt=cutoff, **policy.get('filter', {}))
+
+        if options['dry_run']:
+            count = expired.count()
+            self.stdout.write(f"{label:<26}{action:<9}{policy['days']:>10}d{count:>10}{'-':>10}")
+            return count
+
+        archive = None
+        if action == 'archive':
+            os.makedirs(settings.RETENTION_ARCHIVE_DIR, exist_ok=True)
+            path = os.path.join(settings.RETENTION_ARCHIVE_DIR,
+                                f"{label.lower()}-{timezone.now():%Y%m%d-%H%M%S}.jsonl.gz")
+            archive = gzip.open(path, 'at', encoding='utf-8')
+
+        removed = 0
+        last_pk = 0
+        began = time.perf_counter()
+        paused = 0.0
+        try:
+            while True:
+                # 1. The next primary key range, read without locking anything. Ids only
+                # grow, so rows written while this runs land past the range
+                pks = list(
+                    expired.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:options['chunk_size']]
+                )
+                if not pks:
+                    break
+                chunk = expired.filter(pk__gte=pks[0], pk__lte=pks[-1])
+
+                # 2. One short transaction per range: locks are held for a chunk, not the table
+                with transaction.atomic():
+                    if archive:
+                        # Delete exactly the rows written to the archive
+                        rows = list(chunk.order_by('pk').values())
+                        for row in rows:
+                            archive.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+                        archive.flush()
+                        chunk = model.objects.filter(pk__in=[row['id'] for row in rows])
+                    # A single DELETE ... WHERE while nothing depends on these rows
+                    removed += chunk.delete()[0]
+                last_pk = pks[-1]
+
+                if options['pause']:
+                    time.sleep(options['pause'])
+                    paused += options['pause']
+        finally:
+            if archive:
+                archive.close()
+                if not removed:
+                    os.remove(path)
+
+        # Rate of the work itself, the pauses are deliberate
+        elapsed = max(time.perf_counter() - began - paused, 1e-6)
+        self.stdout.write(f"{label:<26}{action:<9}{policy['days']:>10}d{removed:>10}{removed / elapsed:>10,.0f}")
+        if archive and removed:
+            self.stdout.write(f"  archived to {path}")
+        return removed
@@ -1,13 +1,15 @@
-import os
 import random
 from django.core.management.base import BaseCommand
-from talents.models import Profile
-from django.conf import settings
+from talents.management.assign import assign_profile_pics
 
 class Command(BaseCommand):
     help = 'Assigns random images to existing profiles'
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Profiles written per bulk_update')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed, the same seed gives the same assignment')
+
+    def handle(self, *args, **options):
         # 1. Define the list of image filenames you saved
         # Make sure these match EXACTLY what you saved in media/profile_pics/
         AVAILABLE_IMAGES = [
@@ -26,22 +28,13 @@ class Command(BaseCommand):
             # Add more if you have them: 'profile_pics/6.jpg', etc.
         ]
 
-        profiles = Profile.objects.all()
-        count = 0
-
         self.stdout.write('Assigning images...')
 
-        for profile in profiles:
-            # Skip the admin (superuser) if you want to keep your own photo
-            if profile.user.is_superuser:
-                continue
-
-            # Pick a random image from the list
-            random_image = random.choice(AVAILABLE_IMAGES)
-            
-            # Assign it
-            profile.profile_pic = random_image
-            profile.save()
-            count += 1
+        # 2. Seeded RNG + id order = the same image per profile on every run
+        rng = random.Random(options['seed'])
+        count = assign_profile_pics(
+            lambda profile: rng.choice(AVAILABLE_IMAGES),
+            self.stdout, batch_size=options['batch_size'],
+        )
 
-        self.stdout.write(self.style.SUCCESS(f'Successfully updated {count} profiles with random images!'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f'Successfully updated {count} profiles with random images!'))
@@ -1,12 +1,15 @@
 import os
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from talents.models import Profile
+from talents.management.assign import assign_profile_pics
 
 class Command(BaseCommand):
     help = 'Assigns all images found in media/profile_pics to existing profiles'
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Profiles written per bulk_update')
+
+    def handle(self, *args, **options):
         # 1. Locate the folder
         pics_dir = os.path.join(settings.MEDIA_ROOT, 'profile_pics')
         
@@ -15,8 +18,8 @@ class Command(BaseCommand):
         # 2. Get all image files
         try:
             all_files = os.listdir(pics_dir)
-            # Filter to ensure we only get image files
-            images = [f for f in all_files if f.lower().endswith(('.png', '.jpg', '.jpeg', '.webp'))]
+            # Filter to ensure we only get image files (sorted so the assignment is deterministic)
+            images = sorted(f for f in all_files if f.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')))
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f"Folder not found! Please create: {pics_dir}"))
             return
@@ -27,26 +30,12 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS(f"Found {len(images)} images. Assigning them to profiles..."))
 
-        # 3. Get all Profiles
-        profiles = Profile.objects.all()
-        count = 0
-
-        # 4. Loop through profiles and assign images
-        for i, profile in enumerate(profiles):
-            # Skip the admin if you want (optional)
-            if profile.user.is_superuser:
-                continue
-
-            # This math logic cycles the images endlessly
-            # If i = 0, it picks image 0. If i = 50 and you have 20 images, it picks image 10.
-            image_name = images[i % len(images)]
-            
-            # Assign the path relative to MEDIA_ROOT
-            profile.profile_pic = os.path.join('profile_pics', image_name)
-            profile.save()
-            
-            self.stdout.write(f"[{i+1}] Assigned {image_name} to {profile.user.username}")
-            count += 1
+        # 3. Cycle the images by profile id: id 1 gets image 1, and with 20 images id 50 gets image 10.
+        # Paths are relative to MEDIA_ROOT
+        count = assign_profile_pics(
+            lambda profile: os.path.join('profile_pics', images[profile.id % len(images)]),
+            self.stdout, batch_size=options['batch_size'],
+        )
 
         self.stdout.write(self.style.SUCCESS(f"-----------------------------------"))
-        self.stdout.write(self.style.SUCCESS(f"Done! Successfully updated {count} profiles."))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f"Done! Successfully updated {count} profiles."))
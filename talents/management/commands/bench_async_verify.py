@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from asgiref.sync import ThreadSensitiveContext
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+
+class SlowGateway(BaseHTTPRequestHandler):
+    """Fake Paystack: answers every verify call with a successful payment, after a delay."""
+
+    delay = 1.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = json.dumps({'status': True, 'data': {'status': 'success'}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks concurrent verify_payment calls against a slow fake Paystack: the async view '
+            'under ASGI vs a pool of sync (WSGI) workers, with an anonymous page requested meanwhile')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Concurrent verify_payment calls')
+        parser.add_argument('--gateway-delay', type=float, default=1.0, help='Seconds the fake gateway takes to answer')
+        parser.add_argument('--sync-workers', type=int, default=4,
+                            help='Size of the WSGI worker pool (gunicorn --workers x --threads)')
+
+    def handle(self, *args, **options):
+        # 1. The fake gateway, on a free local port
+        SlowGateway.delay = options['gateway_delay']
+        gateway = ThreadingHTTPServer(('127.0.0.1', 0), SlowGateway)
+        gateway.daemon_threads = True
+        threading.Thread(target=gateway.serve_forever, daemon=True).start()
+
+        # 2. A throwaway test database. On SQLite a file rather than memory, since the ASGI
+        # run writes from a thread per request
+        setup_test_environment()
+        tmp_dir = None
+        if connection.vendor == 'sqlite':
+            tmp_dir = tempfile.mkdtemp()
+            connection.settings_dict['TEST']['NAME'] = os.path.join(tmp_dir, 'bench.sqlite3')
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            with override_settings(
+                PAYSTACK_API_URL=f"http://127.0.0.1:{gateway.server_address[1]}",
+                QUERY_INSPECTOR_ENABLED=False,  # measure what production runs
+                STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+            ):
+                user, references = self.create_transactions(options['requests'])
+                self.stdout.write(f"{options['requests']} verify calls, gateway answers in {options['gateway_delay']}s")
+                self.stdout.write(f"{'server':<22}{'wall s':>8}{'req/s':>8}{'p50 s':>8}{'p95 s':>8}{'page s':>8}")
+                self.report(f"wsgi ({options['sync_workers']} workers)", *self.run_wsgi(user, references, options))
+                self.reset(references)
+                self.report('asgi (async view)', *self.run_asgi(user, references))
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+            gateway.shutdown()
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS('Done!'))
+
+    def create_transactions(self, count):
+        from django.contrib.auth.models import User
+        from talents.models import Transaction
+
+        user = User.objects.create_user('bench-payer')
+        references = [f'bench-{i}' for i in range(count)]
+        Transaction.objects.bulk_create(
+            Transaction(user=user, amount=Decimal('1000.00'), transaction_type='deposit', status='pending', reference=ref)
+            for ref in references
+        )
+        return user, references
+
+    def reset(self, references):
+        from talents.models import Notification, Transaction
+
+        Transaction.objects.filter(reference__in=references).update(status='pending')
+        Notification.objects.all().delete()
+
+    def run_wsgi(self, user, references, options):
+        """Every sync worker is held for the whole gateway round trip: calls queue behind
+        each other, and so does any other page."""
+        client = Client()
+        client.force_login(user)
+
+        def get(url, queued_at, cookies=client.cookies):
+            # A client per call, Client isn't thread safe. Latency includes the wait for a worker
+            Client(HTTP_COOKIE=cookies.output(header='', sep=';')).get(url)
+            return time.perf_counter() - queued_at
+
+        began = time.perf_counter()
+        with ThreadPoolExecutor(options['sync_workers']) as pool:
+            calls = [pool.submit(get, reverse('verify_payment', args=[ref]), began) for ref in references]
+            page = pool.submit(get, reverse('about'), time.perf_counter(), SimpleCookie())
+            latencies = [call.result() for call in calls]
+        return time.perf_counter() - began, latencies, page.result()
+
+    def run_asgi(self, user, references):
+        """One event loop: the calls wait on the gateway together, other pages go through."""
+        client = AsyncClient()
+        client.force_login(user)
+
+        async def get(url, client=client):
+            began = time.perf_counter()
+            # What ASGIHandler does for every request (AsyncClient skips it): sync code of
+            # one request, such as the middleware, gets its own thread
+            async with ThreadSensitiveContext():
+                await client.get(url)
+            return time.perf_counter() - began
+
+        async def run():
+            calls = [asyncio.ensure_future(get(reverse('verify_payment', args=[ref]))) for ref in references]
+            page = await get(reverse('about'), AsyncClient())
+            return await asyncio.gather(*calls), page
+
+        began = time.perf_counter()
+        latencies, page = asyncio.run(run())
+        return time.perf_counter() - began, latencies, page
+
+    def report(self, name, wall, latencies, page):
+        from talents.models import Transaction
+
+        p95 = statistics.quantiles(latencies, n=20)[18] if len(latencies) > 1 else latencies[0]
+        self.stdout.write(
+            f"{name:<22}{wall:>8.2f}{len(latencies) / wall:>8.1f}{statistics.median(latencies):>8.2f}"
+            f"{p95:>8.2f}{page:>8.2f}"
+        )
+        pending = Transaction.objects.filter(status='pending').count()
+        if pending:
+            self.stdout.write(self.style.WARNING(f"  {pending} transactions were not settled"))
@@ -0,0 +1,152 @@
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from multiprocessing import Pool
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, connection, transaction
+from django.test.runner import DiscoverRunner
+
+# SQLite profiles are PRAGMA sets (applied by talents.db on connect). 'default' is what SQLite
+# does out of the box; Python's sqlite3 module adds its own 5s busy handler in both cases.
+SQLITE_PROFILES = {
+    'default': {'journal_mode': 'delete', 'synchronous': 'full'},
+    'tuned': settings.SQLITE_PRAGMAS,
+}
+# PostgreSQL profiles are connection settings: a new connection per request vs persistent
+# connections with health checks (the production settings).
+POSTGRES_PROFILES = {
+    'conn-per-request': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+}
+
+_users = None
+
+
+def _init_worker(db_name, profile, users):
+    """Points the forked worker at the benchmark database with the profile's settings."""
+    global _users
+    connection.close()
+    connection.settings_dict['NAME'] = db_name
+    if connection.vendor == 'sqlite':
+        settings.SQLITE_PRAGMAS = profile
+    else:
+        connection.settings_dict.update(profile)
+    _users = users
+
+
+def write(n):
+    """One simulated request: a chat message plus the recipient's notification in a
+    transaction, like chat_detail/toggle_follow. Returns (latency ms, failed)."""
+    from talents.models import Message, Notification
+
+    sender, recipient = _users[n % 2], _users[(n + 1) % 2]
+    began = time.perf_counter()
+    failed = False
+    try:
+        with transaction.atomic():
+            Message.objects.create(sender_id=sender, recipient_id=recipient, content=f'Benchmark message {n}')
+            Notification.objects.create(user_id=recipient, message='You have a new message.')
+    except OperationalError:
+        # "database is locked" once busy_timeout runs out
+        failed = True
+    latency = (time.perf_counter() - began) * 1000
+    # End of "request": drops the connection when CONN_MAX_AGE says so
+    close_old_connections()
+    return latency, failed
+
+
+def read(n):
+    """One simulated read-only request (an inbox-style query) for the concurrent readers."""
+    from talents.models import Message
+
+    began = time.perf_counter()
+    list(Message.objects.filter(recipient_id=_users[n % 2]).order_by('-created_at')[:20])
+    latency = (time.perf_counter() - began) * 1000
+    close_old_connections()
+    return latency, False
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks concurrent writers (and readers) against SQLite PRAGMA sets or PostgreSQL connection settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent writer processes')
+        parser.add_argument('--writes', type=int, default=2000, help='Total write transactions per profile')
+        parser.add_argument('--readers', type=int, default=2, help='Concurrent reader processes')
+        parser.add_argument('--profiles', nargs='*', help='Profiles to compare (default: all for the engine)')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        profiles = SQLITE_PROFILES if vendor == 'sqlite' else POSTGRES_PROFILES
+        names = options['profiles'] or list(profiles)
+
+        # 1. A migrated throwaway database: a temp file on SQLite (in-memory test databases
+        # can't be shared between processes), the usual test database elsewhere
+        self.stdout.write(f"Preparing a {vendor} benchmark database...")
+        runner = old_config = tmp_dir = None
+        if vendor == 'sqlite':
+            tmp_dir = tempfile.mkdtemp()
+            template = os.path.join(tmp_dir, 'template.sqlite3')
+            connection.close()
+            connection.settings_dict['NAME'] = template
+            call_command('migrate', verbosity=0)
+            users = self.create_users()
+            connection.close()
+        else:
+            runner = DiscoverRunner(verbosity=0, interactive=False)
+            old_config = runner.setup_databases()
+            users = self.create_users()
+
+        try:
+            self.stdout.write(f"{'profile':<18}{'writes/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'failed':>8}{'reads/s':>10}{'read p95':>10}")
+            for name in names:
+                db_name = connection.settings_dict['NAME']
+                if tmp_dir:
+                    # Every profile starts from an identical copy, in its own journal mode
+                    db_name = os.path.join(tmp_dir, f'{name}.sqlite3')
+                    shutil.copy(template, db_name)
+                self.run_profile(name, profiles[name], db_name, users, options)
+        finally:
+            if runner:
+                runner.teardown_databases(old_config)
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS('Done!'))
+
+    def create_users(self):
+        from django.contrib.auth.models import User
+
+        return [User.objects.create_user(f'bench{i}').id for i in range(2)]
+
+    def run_profile(self, name, profile, db_name, users, options):
+        connection.close()
+        writers = Pool(options['workers'], initializer=_init_worker, initargs=(db_name, profile, users))
+        readers = Pool(max(options['readers'], 1), initializer=_init_worker, initargs=(db_name, profile, users))
+        try:
+            began = time.perf_counter()
+            pending_reads = readers.map_async(read, range(options['writes'])) if options['readers'] else None
+            results = writers.map(write, range(options['writes']), chunksize=10)
+            elapsed = time.perf_counter() - began
+            read_results = pending_reads.get() if pending_reads else []
+            read_elapsed = time.perf_counter() - began
+        finally:
+            writers.close()
+            readers.close()
+            writers.join()
+            readers.join()
+
+        latencies = [ms for ms, failed in results if not failed] or [0.0]
+        failed = sum(1 for _, f in results if f)
+        p95 = statistics.quantiles(latencies, n=20)[18] if len(latencies) > 1 else latencies[0]
+        reads = [ms for ms, _ in read_results]
+        read_p95 = statistics.quantiles(reads, n=20)[18] if len(reads) > 1 else 0.0
+        self.stdout.write(
+            f"{name:<18}{(len(results) - failed) / elapsed:>10,.0f}{statistics.median(latencies):>9.1f}"
+            f"{p95:>9.1f}{failed:>8}{len(reads) / read_elapsed if reads else 0:>10,.0f}{read_p95:>10.1f}"
+        )
@@ -0,0 +1,243 @@
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.backends import utils as db_utils
+from django.test import Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+BASELINE_PATH = os.path.join(settings.BASE_DIR, 'talents', 'benchmarks', 'endpoints.json')
+
+
+@contextlib.contextmanager
+def count_queries():
+    """Counts queries (through an execute wrapper) and rows fetched (by patching the
+    cursor wrapper's fetch methods) while the block runs."""
+    counter = {'queries': 0, 'rows': 0}
+    originals = {}
+
+    def count_execute(execute, sql, params, many, context):
+        counter['queries'] += 1
+        return execute(sql, params, many, context)
+
+    def wrap(name, counts):
+        def method(self, *args, **kwargs):
+            result = getattr(self.cursor, name)(*args, **kwargs)
+            counter['rows'] += counts(result)
+            return result
+        return method
+
+    patches = {
+        'fetchone': lambda r: 1 if r is not None else 0,
+        'fetchmany': len,
+        'fetchall': len,
+    }
+    for name, counts in patches.items():
+        originals[name] = db_utils.CursorWrapper.__dict__.get(name)
+        setattr(db_utils.CursorWrapper, name, wrap(name, counts))
+    try:
+        with connection.execute_wrapper(count_execute):
+            yield counter
+    finally:
+        for name, original in originals.items():
+            if original is None:
+                delattr(db_utils.CursorWrapper, name)
+            else:
+                setattr(db_utils.CursorWrapper, name, original)
+
+
+def endpoint_kwargs():
+    """URL kwargs for every named route in talents/urls.py, picked from the seeded data.
+
+    Requests are made as the client of a hired job, so owner-only pages (manage_job,
+    contract_detail, ...) render instead of redirecting.
+    """
+    from talents.models import Contract, Conversation, Job, Proposal, Transaction
+
+    contract = Contract.objects.select_related('job', 'client', 'freelancer__profile').order_by('id').first()
+    if contract is None:
+        raise CommandError('The seeded data has no contracts, use a bigger --size.')
+    user = contract.client
+    own_job = contract.job
+    other_job = Job.objects.exclude(client=user).filter(is_active=True).order_by('id').first()
+    partner = Conversation.objects.filter(participants=user).values_list('participants__username', flat=True)
+    partner = next((name for name in partner if name != user.username), contract.freelancer.username)
+    deposit = Transaction.objects.filter(user=user, status='success').exclude(reference=None).order_by('id').first()
+    freelancer = contract.freelancer
+
+    return user, {
+        'blog_detail': {'pk': 1},
+        'profile_detail': {'slug': freelancer.profile.slug},
+        'toggle_follow': {'profile_id': freelancer.profile.id},
+        'job_detail': {'slug': other_job.slug},
+        'toggle_save_job': {'slug': other_job.slug},
+        'apply_to_job': {'slug': other_job.slug},
+        'manage_job': {'slug': own_job.slug},
+        'edit_job': {'slug': own_job.slug},
+        'create_contract': {'proposal_id': Proposal.objects.filter(job=own_job).order_by('id').first().id},
+        'contract_detail': {'pk': contract.id},
+        'chat_detail': {'username': partner},
+        'payment_checkout': {'reference': deposit.reference},
+        'verify_payment': {'reference': deposit.reference},
+        'profile_view': {'username': freelancer.username},
+        'hire_freelancer': {'freelancer_id': freelancer.id},
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks every talents URL (p50/p95 latency, queries, rows) against seed_scale data and a committed baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', default='small', help='seed_scale preset for the benchmark database')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per endpoint')
+        parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline JSON to compare against')
+        parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+        parser.add_argument('--latency-threshold', type=float, default=2.0,
+                            help='Fail when p95 exceeds baseline p95 times this factor (plus --latency-slack)')
+        parser.add_argument('--latency-slack', type=float, default=15.0,
+                            help='Milliseconds of jitter allowed on top of the threshold, for noisy CI machines')
+        parser.add_argument('--only', nargs='*', help='Only run these URL names')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        # 1. Throwaway test database (never the dev DB), local media and unhashed static files
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        media_root = tempfile.mkdtemp()
+        try:
+            with override_settings(
+                DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage', MEDIA_ROOT=media_root,
+                STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+                QUERY_INSPECTOR_ENABLED=False,  # measure what production runs
+            ):
+                call_command('seed_scale', size=options['size'], stdout=io.StringIO())
+                self.create_social_apps()
+                results = self.run_endpoints(options)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        # 2. Compare with (or write) the baseline. A page answering 4xx/5xx is never a baseline
+        errors = [f"{name}: status {result['status']}" for name, result in sorted(results.items())
+                  if result['status'] >= 400]
+        baseline = {}
+        if os.path.exists(options['baseline']):
+            with open(options['baseline']) as f:
+                baseline = json.load(f)['endpoints']
+
+        if options['update_baseline']:
+            if errors:
+                raise CommandError('Not writing a baseline of failing endpoints:\n  ' + '\n  '.join(errors))
+            # --only refreshes those endpoints and keeps the others
+            endpoints = {**baseline, **results} if options['only'] else results
+            os.makedirs(os.path.dirname(options['baseline']), exist_ok=True)
+            with open(options['baseline'], 'w') as f:
+                json.dump({'size': options['size'], 'endpoints': endpoints}, f, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}"))
+            return
+
+        failures = []
+        self.stdout.write(f"{'endpoint':<22}{'status':>7}{'p50 ms':>9}{'p95 ms':>9}{'base p95':>10}{'queries':>9}{'base':>6}{'rows':>8}")
+        for name, result in sorted(results.items()):
+            base = baseline.get(name)
+            line = (
+                f"{name:<22}{result['status']:>7}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+                f"{base['p95_ms'] if base else '-':>10}{result['queries']:>9}{base['queries'] if base else '-':>6}"
+                f"{result['rows']:>8}"
+            )
+            problems = [f"status {result['status']}"] if result['status'] >= 400 else []
+            if base:
+                if result['status'] != base['status']:
+                    problems.append(f"status {base['status']} -> {result['status']}")
+                if result['queries'] > base['queries']:
+                    problems.append(f"queries {base['queries']} -> {result['queries']}")
+                if result['p95_ms'] > base['p95_ms'] * options['latency_threshold'] + options['latency_slack']:
+                    problems.append(f"p95 {base['p95_ms']}ms -> {result['p95_ms']}ms")
+            if problems:
+                failures.append(f"{name}: {', '.join(problems)}")
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        missing = sorted(set(results) - set(baseline))
+        if missing and not options['only']:
+            failures.append(f"not in the baseline (run with --update-baseline): {', '.join(missing)}")
+
+        self.stdout.write(f"Finished in {time.monotonic() - started:.0f}s")
+        if failures:
+            raise CommandError('Regressions against the baseline:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
+
+    def create_social_apps(self):
+        # login/register render Google and GitHub buttons, which need their SocialApp rows
+        from allauth.socialaccount.models import SocialApp
+        from django.contrib.sites.models import Site
+
+        site = Site.objects.get_current()
+        for provider in ('google', 'github'):
+            app = SocialApp.objects.create(provider=provider, name=provider, client_id='bench', secret='bench')
+            app.sites.add(site)
+
+    def run_endpoints(self, options):
+        from talents import urls
+
+        user, kwargs = endpoint_kwargs()
+        # A crashing view is reported as a 500 instead of aborting the whole run
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+
+        # Views that 500 are recorded by status; their tracebacks would drown the report
+        request_logger = logging.getLogger('django.request')
+        request_logger.disabled = True
+
+        results = {}
+        for pattern in urls.urlpatterns:
+            name = pattern.name
+            if options['only'] and name not in options['only']:
+                continue
+            # logout would end the session for every endpoint after it
+            if name == 'logout':
+                continue
+            url = reverse(name, kwargs=kwargs.get(name))
+
+            timings = []
+            # Collector pauses land on random requests and dominate p95 at this sample size
+            gc.collect()
+            gc.disable()
+            for i in range(options['iterations'] + 2):
+                # Each request runs in a rolled back transaction, so toggles and hires don't change the data
+                with transaction.atomic(), count_queries() as counted:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        began = time.perf_counter()
+                        response = client.get(url)
+                        elapsed = (time.perf_counter() - began) * 1000
+                    transaction.set_rollback(True)
+                if i >= 2:  # the first two requests warm up caches and template loading
+                    timings.append(elapsed)
+            gc.enable()
+
+            quantiles = statistics.quantiles(timings, n=20)
+            results[name] = {
+                'status': response.status_code,
+                'p50_ms': round(statistics.median(timings), 2),
+                'p95_ms': round(quantiles[18], 2),
+                'queries': counted['queries'],
+                'rows': counted['rows'],
+            }
+
+        request_logger.disabled = False
+        return results
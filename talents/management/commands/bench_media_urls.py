@@ -0,0 +1,78 @@
+import statistics
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.test.utils import override_settings
+from talents import images
+from talents.models import Profile
+
+# The avatar markup of a browse card: an AVIF <source> and a WebP <img>, each with a srcset
+CARDS = Template(
+    '{% load talent_images %}{% for profile in profiles %}<picture>'
+    '<source type="image/avif" {% srcset profile.profile_pic 100 "avif" %}>'
+    '<img {% srcset profile.profile_pic 100 %} class="p-avatar" loading="lazy">'
+    '</picture>{% endfor %}'
+)
+
+
+class Command(BaseCommand):
+    help = 'Microbenchmarks rendering avatar cards with and without cached media URLs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=100, help='Cards per render')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed renders per setup')
+        parser.add_argument('--default-every', type=int, default=4,
+                            help='Every Nth card shows the default avatar (0 for none)')
+        parser.add_argument('--backend', default=settings.MEDIA_STORAGE_BACKEND,
+                            help='Storage building the URLs (Cloudinary builds them locally, no network)')
+
+    def handle(self, *args, **options):
+        # 1. Unsaved profiles: only the image names matter. Every uploaded picture has its
+        # derivatives, so srcset asks for 1 + len(widths) URLs per format
+        cards = options['cards']
+        every = options['default_every']
+        profiles = [
+            Profile(profile_pic=images.DEFAULT_IMAGE if every and i % every == 0 else f'profile_pics/bench_{i}.jpg')
+            for i in range(cards)
+        ]
+        for profile in profiles:
+            cache.set(images._marker_key(profile.profile_pic.name), True, 60 * 60)
+
+        self.stdout.write(f"Rendering {cards} cards, {options['iterations']} times each, with {options['backend']}")
+        self.stdout.write(f"{'storage':<22}{'p50 ms':>9}{'p95 ms':>9}{'per card µs':>13}")
+
+        # 2. The backend alone, then the cached wrapper with an empty and a warm cache
+        with override_settings(DEFAULT_FILE_STORAGE=options['backend']):
+            self.report('backend', self.render(profiles, options['iterations']), cards)
+
+        with override_settings(DEFAULT_FILE_STORAGE='talents.storage.CachedURLStorage',
+                               MEDIA_STORAGE_BACKEND=options['backend']):
+            from django.core.files.storage import default_storage
+
+            keys = {default_storage.url_key(images.derivative_name(p.profile_pic.name, w, f))
+                    for p in profiles for w in images.widths() for f in images.formats()}
+            keys |= {default_storage.url_key(p.profile_pic.name) for p in profiles}
+            self.report('cached (cold)', self.render(profiles, options['iterations'], lambda: cache.delete_many(keys)), cards)
+            self.report('cached (warm)', self.render(profiles, options['iterations']), cards)
+
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS('Done!'))
+
+    def render(self, profiles, iterations, before=None):
+        context = Context({'profiles': profiles})
+        CARDS.render(context)  # warm up imports and the template
+        timings = []
+        for _ in range(iterations):
+            if before:
+                before()
+            began = time.perf_counter()
+            CARDS.render(context)
+            timings.append((time.perf_counter() - began) * 1000)
+        return timings
+
+    def report(self, name, timings, cards):
+        p50 = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[18] if len(timings) > 1 else timings[0]
+        self.stdout.write(f"{name:<22}{p50:>9.2f}{p95:>9.2f}{p50 * 1000 / cards:>13.1f}")
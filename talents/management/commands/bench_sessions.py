@@ -0,0 +1,74 @@
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from talents.models import Profile
+
+STORES = ['db', 'cached_db', 'signed_cookies']
+
+
+class Command(BaseCommand):
+    help = 'Counts the database round trips per authenticated request for each session store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per store')
+        parser.add_argument('--stores', nargs='*', default=STORES, help='SESSION_STORE values to compare')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            user = User.objects.create_user('bench-sessions', password='bench-sessions')
+            Profile.objects.get_or_create(user=user)[0].save()  # the navbar links to it (fills the slug)
+            self.stdout.write(f"{'store':<16}{'session queries/req':>21}{'queries/req':>13}{'p50 ms':>9}{'login queries':>15}")
+            for store in options['stores']:
+                with override_settings(
+                    SESSION_ENGINE=f'django.contrib.sessions.backends.{store}',
+                    QUERY_INSPECTOR_ENABLED=False,  # measure what production runs
+                    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+                ):
+                    cache.clear()
+                    self.run_store(store, user, options['requests'])
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS('Done!'))
+
+    def run_store(self, store, user, requests):
+        counts = {'session': 0, 'all': 0}
+
+        def count(execute, sql, params, many, context):
+            counts['all'] += 1
+            if 'django_session' in sql:
+                counts['session'] += 1
+            return execute(sql, params, many, context)
+
+        # 1. A real login (writes the session), then authenticated page views (read it)
+        client = Client()
+        with connection.execute_wrapper(count):
+            client.post(reverse('login'), {'username': user.username, 'password': 'bench-sessions'})
+        login_queries = counts['all']
+
+        url = reverse('about')
+        client.get(url)  # warm up templates and the cache
+        counts.update(session=0, all=0)
+        timings = []
+        with connection.execute_wrapper(count):
+            for _ in range(requests):
+                began = time.perf_counter()
+                client.get(url)
+                timings.append((time.perf_counter() - began) * 1000)
+
+        self.stdout.write(
+            f"{store:<16}{counts['session'] / requests:>21.2f}{counts['all'] / requests:>13.2f}"
+            f"{statistics.median(timings):>9.2f}{login_queries:>15}"
+        )
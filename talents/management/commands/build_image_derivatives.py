@@ -0,0 +1,49 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from talents.models import Profile
+from talents import images
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = 'Backfills resized WebP/AVIF derivatives for every profile and cover photo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2),
+                            help='Number of worker processes')
+        parser.add_argument('--force', action='store_true', help='Regenerate derivatives that already exist')
+
+    def handle(self, *args, **options):
+        # 1. Collect the distinct image names (many profiles share the seeded pictures)
+        names = set(
+            Profile.objects.exclude(profile_pic='').exclude(profile_pic=images.DEFAULT_IMAGE)
+            .values_list('profile_pic', flat=True).distinct()
+        )
+        names.update(
+            Profile.objects.exclude(cover_photo='').exclude(cover_photo__isnull=True)
+            .values_list('cover_photo', flat=True).distinct()
+        )
+
+        self.stdout.write(
+            f"Building {images.formats()} at widths {images.widths()} for {len(names)} images "
+            f"using {options['workers']} workers..."
+        )
+
+        # 2. Resize in a process pool, Pillow work is CPU bound
+        written = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+            futures = {pool.submit(images.generate_derivatives, name, force=options['force']): name for name in names}
+            for future in as_completed(futures):
+                try:
+                    written += future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f"Error for {futures[future]}: {e}"))
+
+        self.stdout.write(self.style.SUCCESS('-----------------------------------'))
+        self.stdout.write(self.style.SUCCESS(f"Done! Wrote {written} derivative files ({failed} images failed)."))
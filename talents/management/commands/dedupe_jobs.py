@@ -0,0 +1,86 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from talents.minhash import band_keys, signature
+from talents.models import FeedEntry, Job, JobBand, Notification
+
+
+class Command(BaseCommand):
+    help = 'Closes the open near-duplicates of each client (after signing any unsigned job)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Jobs signed per transaction')
+        parser.add_argument('--threshold', type=float, default=None,
+                            help='Similarity from which jobs are duplicates (default DUPLICATE_JOB_THRESHOLD)')
+        parser.add_argument('--any-client', action='store_true',
+                            help='Also group the duplicates posted by different clients (reported, not closed)')
+        parser.add_argument('--dry-run', action='store_true', help='Only report the duplicates')
+
+    def handle(self, *args, **options):
+        began = time.perf_counter()
+        threshold = options['threshold'] or settings.DUPLICATE_JOB_THRESHOLD
+
+        # 1. Signatures and bands of the jobs written without save() (bulk_create, update()).
+        # Migration 0021 signed the ones posted before the minhash column existed
+        signed = 0
+        last_pk = 0
+        while not options['dry_run']:
+            jobs = list(Job.objects.filter(minhash__isnull=True, pk__gt=last_pk).order_by('pk')
+                        .only('id', 'title', 'description')[:options['chunk_size']])
+            if not jobs:
+                break
+            last_pk = jobs[-1].pk
+            bands = []
+            for job in jobs:
+                job.minhash = signature(job.title, job.description)
+                if job.minhash:
+                    bands += [JobBand(job=job, key=key) for key in band_keys(job.minhash)]
+            with transaction.atomic():
+                Job.objects.bulk_update(jobs, ['minhash'])
+                JobBand.objects.bulk_create(bands)
+            signed += len(jobs)
+        if signed:
+            self.stdout.write(f"{signed} jobs signed.")
+
+        # 2. Group the open duplicates. Each job is only compared with those sharing a band
+        active = Job.objects.filter(is_active=True).annotate(proposal_total=Count('proposals'))
+        seen = set()
+        groups = []
+        for job in active.exclude(minhash__isnull=True).order_by('pk').iterator():
+            if job.pk in seen:
+                continue
+            candidates = active if options['any_client'] else active.filter(client=job.client_id)
+            group = [job] + [dup for dup in job.near_duplicates(candidates, threshold) if dup.pk not in seen]
+            if len(group) > 1:
+                seen.update(dup.pk for dup in group)
+                groups.append(group)
+
+        # 3. Keep the job with the most proposals (the newest on a tie), close the others
+        closed = 0
+        for group in groups:
+            group.sort(key=lambda job: (job.proposal_total, job.created_at), reverse=True)
+            kept, duplicates = group[0], [job for job in group[1:] if job.client_id == group[0].client_id]
+            self.stdout.write(f'"{kept.title}" (#{kept.pk}): {len(group) - 1} duplicates '
+                              f'({", ".join(f"#{job.pk}" for job in group[1:])})')
+            if options['dry_run'] or not duplicates:
+                continue
+            ids = [job.pk for job in duplicates]
+            with transaction.atomic():
+                Job.objects.filter(pk__in=ids).update(is_active=False, updated_at=timezone.now())
+                Notification.objects.bulk_create([
+                    Notification(user_id=job.client_id, message=(
+                        f'Your job "{job.title}" was closed as a duplicate of "{kept.title}", which stays open.'
+                    ))
+                    for job in duplicates
+                ])
+                FeedEntry.objects.filter(job__in=ids).delete()
+            closed += len(ids)
+
+        elapsed = time.perf_counter() - began
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS(
+            f"Done! {len(groups)} groups of duplicates, {closed} jobs closed in {elapsed:.1f}s."
+        ))
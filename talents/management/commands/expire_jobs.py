@@ -0,0 +1,64 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from talents.models import FeedEntry, Job, Notification
+
+
+class Command(BaseCommand):
+    help = 'Closes open jobs past their expires_at and notifies their clients (run hourly, or with --every)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Jobs closed per transaction')
+        parser.add_argument('--pause', type=float, default=0.05, help='Seconds to sleep between chunks')
+        parser.add_argument('--every', type=float, default=0,
+                            help='Keep running, checking every N seconds (instead of cron)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the expired jobs')
+
+    def handle(self, *args, **options):
+        while True:
+            self.expire(options)
+            if not options['every']:
+                break
+            time.sleep(options['every'])
+
+    def expire(self, options):
+        now = timezone.now()
+        # An index range scan of job_active_expiry_idx, whatever the number of closed jobs
+        expired = Job.objects.filter(is_active=True, expires_at__lte=now)
+        if options['dry_run']:
+            self.stdout.write(f"{expired.count()} jobs would be closed.")
+            return
+
+        closed = 0
+        last_pk = 0
+        began = time.perf_counter()
+        while True:
+            # 1. The next primary key range of expired jobs
+            pks = list(expired.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:options['chunk_size']])
+            if not pks:
+                break
+            last_pk = pks[-1]
+
+            # 2. Close them, notify the clients and drop them from the feeds, in one short transaction.
+            # Re-checked under the lock: a client may have hired or edited meanwhile
+            with transaction.atomic():
+                jobs = list(expired.filter(pk__in=pks).select_for_update().values_list('pk', 'client_id', 'title'))
+                ids = [pk for pk, _, _ in jobs]
+                Job.objects.filter(pk__in=ids).update(is_active=False, updated_at=now)
+                Notification.objects.bulk_create([
+                    Notification(user_id=client_id, message=(
+                        f'Your job "{title}" expired without a hire and was closed. '
+                        'Post it again to keep receiving proposals.'
+                    ))
+                    for _, client_id, title in jobs
+                ])
+                FeedEntry.objects.filter(job__in=ids).delete()
+            closed += len(ids)
+
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        elapsed = time.perf_counter() - began
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS(f"Done! {closed} expired jobs closed in {elapsed:.1f}s."))
@@ -0,0 +1,121 @@
+import gzip
+import os
+import re
+import textwrap
+from django.core.management.base import BaseCommand
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional locally, WhiteNoise skips .br files without it
+    brotli = None
+
+STYLE_RE = re.compile(r'[ \t]*<style>(.*?)</style>[ \t]*\n?', re.S)
+BLOCK_RE = re.compile(r"{% block ")
+EXTRA_CSS = '{% block extra_css %}'
+LOAD_STATIC = '{% load static %}'
+BASE_TEMPLATE = os.path.join('talents', 'base.html')
+
+
+class Command(BaseCommand):
+    help = 'Moves inline <style> blocks out of templates into static CSS bundles and reports the byte savings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only print the size report, do not write any files')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        app_dir = os.path.join(settings.BASE_DIR, 'talents')
+        templates_dir = os.path.join(app_dir, 'templates')
+        css_dir = os.path.join(app_dir, 'static', 'talents', 'css')
+
+        # 1. Collect every template that still carries an inline <style> block
+        rows = []
+        for root, _, files in os.walk(templates_dir):
+            for file_name in sorted(files):
+                if not file_name.endswith('.html'):
+                    continue
+                path = os.path.join(root, file_name)
+                rel_path = os.path.relpath(path, templates_dir)
+                with open(path, encoding='utf-8') as f:
+                    source = f.read()
+
+                blocks = STYLE_RE.findall(source)
+                if not blocks:
+                    continue
+
+                # 2. Turn "talents/browse.html" into "talents/css/talents/browse.css"
+                bundle = 'talents/css/' + rel_path[:-len('.html')].replace(os.sep, '/') + '.css'
+                css_path = os.path.join(css_dir, *bundle[len('talents/css/'):].split('/'))
+                link = f'<link rel="stylesheet" href="{{% static \'{bundle}\' %}}">'
+
+                # A page extracted on an earlier deploy keeps its bundle: new rules are appended to it
+                css = ''
+                if os.path.exists(css_path):
+                    with open(css_path, encoding='utf-8') as f:
+                        css = f.read()
+                for block in blocks:
+                    rules = textwrap.dedent(block).strip()
+                    if rules not in css:
+                        css += rules + '\n'
+
+                if link in source:
+                    # Extracted before: the bundle is already linked, only the new <style> goes away
+                    new_source = STYLE_RE.sub('', source)
+                elif rel_path == BASE_TEMPLATE:
+                    # The base template owns <head>: link its bundle and open a hook for child pages
+                    new_source = STYLE_RE.sub(
+                        f'    {link}\n    {EXTRA_CSS}{{% endblock %}}\n', source, count=1
+                    )
+                    new_source = STYLE_RE.sub('', new_source)
+                else:
+                    # Child templates only render what sits inside blocks, so the link goes into extra_css
+                    # (a second {% block extra_css %} would not compile): into the page's own block if it
+                    # has one, else a new one right before the first block (after the {% load %} tags)
+                    new_source = STYLE_RE.sub('', source)
+                    if EXTRA_CSS in new_source:
+                        pos = new_source.index(EXTRA_CSS)
+                        new_source = new_source.replace(EXTRA_CSS, EXTRA_CSS + link, 1)
+                        head = ''
+                    else:
+                        match = BLOCK_RE.search(new_source)
+                        pos = match.start() if match else 0
+                        head = f'{EXTRA_CSS}{link}{{% endblock %}}\n'
+                    if LOAD_STATIC not in new_source[:pos]:
+                        head = f'{LOAD_STATIC}\n{head}'
+                    new_source = new_source[:pos] + head + new_source[pos:]
+
+                rows.append((rel_path, len(source.encode()), len(new_source.encode()), css.encode()))
+
+                if not dry_run:
+                    os.makedirs(os.path.dirname(css_path), exist_ok=True)
+                    with open(css_path, 'w', encoding='utf-8') as f:
+                        f.write(css)
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(new_source)
+
+        if not rows:
+            self.stdout.write(self.style.SUCCESS('No inline <style> blocks left. Nothing to do.'))
+            return
+
+        # 3. Size report. Child pages also ship the base layout, so the page total includes base.html
+        base_row = next((r for r in rows if r[0] == BASE_TEMPLATE), None)
+        base_before, base_after = (base_row[1], base_row[2]) if base_row else (0, 0)
+
+        self.stdout.write(f"{'template':<45}{'page before':>12}{'page after':>12}{'saved':>8}{'css':>8}{'gzip':>8}{'br':>8}")
+        total_saved = 0
+        for rel_path, before, after, css in rows:
+            if rel_path != BASE_TEMPLATE:
+                before += base_before
+                after += base_after
+            total_saved += before - after
+            br_size = len(brotli.compress(css)) if brotli else '-'
+            self.stdout.write(
+                f"{rel_path:<45}{before:>12}{after:>12}{before - after:>8}{len(css):>8}{len(gzip.compress(css)):>8}{br_size:>8}"
+            )
+
+        self.stdout.write(self.style.SUCCESS('-----------------------------------'))
+        verb = 'Would extract' if dry_run else 'Extracted'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(rows)} style blocks, {total_saved} bytes less HTML per page view in total."))
+        if not dry_run:
+            self.stdout.write('Run "python manage.py collectstatic" to build the hashed, compressed bundles.')
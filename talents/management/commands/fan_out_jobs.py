@@ -0,0 +1,34 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from talents import feed
+from talents.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the job feeds from the active jobs (after deploying feeds, or changing FEED_* settings)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Only jobs posted in the last N days')
+
+    def handle(self, *args, **options):
+        # 1. Newest first, so every feed has its most recent jobs as early as possible
+        since = timezone.now() - timedelta(days=options['days'])
+        jobs = Job.objects.filter(is_active=True, created_at__gte=since).order_by('-created_at')
+
+        # 2. The same fan-out the 'feeds' workers run for each posted job
+        written = 0
+        pulled = 0
+        began = time.perf_counter()
+        for count, job in enumerate(jobs.iterator(), 1):
+            written += feed.fan_out(job)
+            pulled += job.feed_pull
+            if count % 100 == 0:
+                self.stdout.write(f"{count} jobs, {written} feed entries...")
+
+        elapsed = time.perf_counter() - began
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS(
+            f"Done! {written} feed entries written in {elapsed:.1f}s ({pulled} jobs left to pull at read time)."
+        ))
@@ -1,44 +1,122 @@
+import hashlib
+import json
 import os
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from django.core.management.base import BaseCommand
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.conf import settings
+from django.db.models import Q
+from talents import ranking
 from talents.models import Profile
 
+
 class Command(BaseCommand):
-    help = 'Downloads unique real faces for every profile'
+    help = 'Downloads unique real faces for every profile (parallel and resumable)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source-url', default='https://i.pravatar.cc/400?u={username}',
+                            help='Avatar URL template, {username} and {id} are filled in. '
+                                 'Point it at a local static server (python -m http.server) in tests.')
+        parser.add_argument('--workers', type=int, default=16, help='Parallel downloads')
+        parser.add_argument('--batch-size', type=int, default=500, help='Profiles saved per bulk_update')
+        parser.add_argument('--checkpoint', default=os.path.join(settings.BASE_DIR, '.fetch_real_faces.json'),
+                            help='Progress file, rerun the command to resume where it stopped')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and start over')
+        parser.add_argument('--no-verify', action='store_true', help='Skip TLS certificate verification')
+
+    def handle(self, *args, **options):
+        import requests
+        from requests.adapters import HTTPAdapter
 
-    def handle(self, *args, **kwargs):
         self.stdout.write('Starting download of unique faces... This requires internet.')
 
-        profiles = Profile.objects.all()
+        # 1. Load the checkpoint: last profile id reached + the ids that failed (retried on resume)
+        checkpoint_path = options['checkpoint']
+        state = {'last_id': 0, 'failed': []}
+        if not options['restart'] and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                state.update(json.load(f))
+            self.stdout.write(f"Resuming after profile #{state['last_id']} ({len(state['failed'])} failures to retry).")
+        in_flight = {}  # digest -> lock of the batch being downloaded
+        lock = threading.Lock()
+
+        # 2. One pooled session shared by every worker thread
+        workers = options['workers']
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=2)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.verify = not options['no_verify']
+
+        def fetch(profile):
+            username = profile.user.username
+            url = options['source_url'].format(username=username, id=profile.id)
+            response = session.get(url, timeout=10)
+            response.raise_for_status()
+
+            # Files are named after their content, so identical images (e.g. a fixture server or
+            # pravatar's fallback face) are stored once, across batches and reruns, with no state
+            digest = hashlib.sha256(response.content).hexdigest()
+            name = f"profile_pics/faces/{digest[:32]}.jpg"
+            with lock:
+                same_image = in_flight.setdefault(digest, threading.Lock())
+            with same_image:
+                if not default_storage.exists(name):
+                    name = default_storage.save(name, ContentFile(response.content))
+            return name
+
+        profiles = (
+            Profile.objects.select_related('user')
+            .filter(Q(id__gt=state['last_id']) | Q(id__in=state['failed']), user__is_superuser=False)
+            .only('id', 'profile_pic', 'user__username')
+            .order_by('id')
+        )
         total = profiles.count()
+        saved = 0
+        failed = []
 
-        for i, profile in enumerate(profiles):
-            # Skip admin
-            if profile.user.is_superuser:
-                continue
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            batch = []
+            for profile in profiles.iterator(chunk_size=options['batch_size']):
+                batch.append(profile)
+                if len(batch) >= options['batch_size']:
+                    saved += self.process_batch(pool, fetch, batch, state, failed, checkpoint_path)
+                    in_flight.clear()
+                    self.stdout.write(f"[{saved + len(failed)}/{total}] {saved} saved, {len(failed)} failed")
+                    batch = []
+            if batch:
+                saved += self.process_batch(pool, fetch, batch, state, failed, checkpoint_path)
 
-            # 1. Generate a unique URL based on their username
-            # This API ensures the same username always gets the same face, 
-            # but different usernames get different faces.
-            avatar_url = f"https://i.pravatar.cc/400?u={profile.user.username}"
+        self.stdout.write(self.style.SUCCESS('----------------------------------'))
+        self.stdout.write(self.style.SUCCESS(
+            f'DONE! {saved} profiles updated, {len(failed)} failed (rerun to retry them).'
+        ))
 
+    def process_batch(self, pool, fetch, batch, state, failed, checkpoint_path):
+        # 3. Download the batch in parallel, then write it with a single bulk_update
+        results = [pool.submit(fetch, profile) for profile in batch]
+        updated = []
+        for profile, future in zip(batch, results):
             try:
-                # 2. Download the image
-                response = requests.get(avatar_url, timeout=10, verify=False)
-                
-                if response.status_code == 200:
-                    # 3. Save it to the profile
-                    # We name the file "username_face.jpg"
-                    file_name = f"{profile.user.username}_face.jpg"
-                    profile.profile_pic.save(file_name, ContentFile(response.content), save=True)
-                    
-                    self.stdout.write(self.style.SUCCESS(f'[{i+1}/{total}] Saved face for {profile.user.username}'))
-                else:
-                    self.stdout.write(self.style.WARNING(f'Failed to download for {profile.user.username}'))
-
+                profile.profile_pic = future.result()
+                updated.append(profile)
             except Exception as e:
+                failed.append(profile.id)
                 self.stdout.write(self.style.ERROR(f'Error for {profile.user.username}: {e}'))
 
-        self.stdout.write(self.style.SUCCESS('----------------------------------'))
-        self.stdout.write(self.style.SUCCESS('DONE! All profiles now have unique, offline-ready images.'))
\ No newline at end of file
+        Profile.objects.bulk_update(updated, ['profile_pic'])
+        # bulk_update sends no post_save: the new pictures count towards the completeness
+        ranking.refresh([profile.id for profile in updated])
+
+        # 4. Checkpoint after every committed batch (atomic replace so a crash can't corrupt it).
+        # Profiles run in id order, so the last id is enough to resume, plus the failures to retry
+        # (this run's, and the earlier ones the run hasn't reached yet)
+        state['last_id'] = max(state['last_id'], batch[-1].id)
+        not_retried = [pk for pk in state['failed'] if pk > batch[-1].id]
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'last_id': state['last_id'], 'failed': failed + not_retried}, f)
+        os.replace(tmp_path, checkpoint_path)
+        return len(updated)
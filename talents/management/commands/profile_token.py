@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from talents.middleware import profile_token
+
+
+class Command(BaseCommand):
+    help = 'Prints a signed X-Profile-Token header value that makes the next requests run under cProfile'
+
+    def handle(self, *args, **options):
+        minutes = settings.PROFILING_TOKEN_MAX_AGE // 60
+        self.stdout.write(profile_token())
+        self.stdout.write(self.style.SUCCESS(
+            f"Valid for {minutes} minutes, e.g. curl -H 'X-Profile-Token: <token>' ... "
+            f"Profiles are written to {settings.PROFILING_DIR}"
+        ))
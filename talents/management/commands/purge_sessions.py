@@ -0,0 +1,41 @@
+import time
+from importlib import import_module
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DatabaseStore
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Deletes expired sessions in small batches (Django's clearsessions is one big DELETE)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Sessions deleted per statement')
+        parser.add_argument('--pause', type=float, default=0.05, help='Seconds to sleep between chunks')
+
+    def handle(self, *args, **options):
+        # 1. Only the database stores keep rows around; cache entries expire on their own and
+        # signed cookies live in the browser
+        engine = import_module(settings.SESSION_ENGINE)
+        if not issubclass(engine.SessionStore, DatabaseStore):
+            engine.SessionStore.clear_expired()
+            self.stdout.write(self.style.SUCCESS(f"{settings.SESSION_ENGINE} has no session table to purge."))
+            return
+
+        # 2. Delete by batches of keys (session keys are random, so there's no range to walk)
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now)
+        removed = 0
+        began = time.perf_counter()
+        while True:
+            keys = list(expired.values_list('session_key', flat=True)[:options['chunk_size']])
+            if not keys:
+                break
+            removed += Session.objects.filter(session_key__in=keys, expire_date__lt=now).delete()[0]
+            self.stdout.write(f"{removed} expired sessions deleted...")
+            time.sleep(options['pause'])
+
+        elapsed = time.perf_counter() - began
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS(f"Done! {removed} sessions deleted in {elapsed:.1f}s."))
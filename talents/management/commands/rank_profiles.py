@@ -0,0 +1,36 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from talents import ranking
+from talents.models import Profile
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the completeness and rank_score of every profile (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Profiles scored per transaction')
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between chunks')
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.select_related('user').order_by('pk')
+        ranked = 0
+        last_pk = 0
+        began = time.perf_counter()
+        while True:
+            # 1. The next primary key range: a handful of aggregate queries score all of it
+            chunk = list(profiles.filter(pk__gt=last_pk)[:options['chunk_size']])
+            if not chunk:
+                break
+
+            # 2. One bulk UPDATE per chunk, in its own short transaction
+            with transaction.atomic():
+                ranked += ranking.store(chunk)
+            last_pk = chunk[-1].pk
+            self.stdout.write(f"{ranked} profiles ranked...")
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        elapsed = time.perf_counter() - began
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS(f"Done! {ranked} profiles ranked in {elapsed:.1f}s."))
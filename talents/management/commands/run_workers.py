@@ -0,0 +1,91 @@
+import signal
+import time
+from multiprocessing import Event, Process
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.db.models import Count
+from talents import taskqueue
+from talents.models import Task, WorkerHeartbeat
+
+QUEUES = ['default', 'emails', 'payments', 'feeds', 'images']
+
+
+def work(queues, batch, poll, once, stop):
+    """Worker process loop: claim due tasks, run them, sleep when idle."""
+    # Forked from the parent: never share its database connection
+    connection.close()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent handles Ctrl+C and sets `stop`
+    worker = taskqueue.worker_id()
+    heartbeat_every = getattr(settings, 'TASKS_HEARTBEAT', 30)
+
+    last_sweep = 0
+    last_heartbeat = 0
+    while not stop.is_set():
+        # Liveness for /metrics: the worker runs as its own service, with no exporter
+        if time.monotonic() - last_heartbeat > heartbeat_every:
+            taskqueue.heartbeat(worker, queues)
+            last_heartbeat = time.monotonic()
+        # Tasks of workers that died mid-run go back to the queue once their lock expires
+        if time.monotonic() - last_sweep > 60:
+            taskqueue.requeue_stale()
+            last_sweep = time.monotonic()
+
+        tasks = taskqueue.claim(worker, queues, batch)
+        for task in tasks:
+            taskqueue.execute(task, worker)
+        close_old_connections()
+        if not tasks:
+            if once:
+                break
+            stop.wait(poll)
+
+    WorkerHeartbeat.objects.filter(worker=worker).delete()
+
+
+class Command(BaseCommand):
+    help = 'Runs background task workers (emails, notifications, payment checks) from the database queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Worker processes')
+        parser.add_argument('--queues', nargs='*', default=QUEUES, help='Queues to serve')
+        parser.add_argument('--batch', type=int, default=1, help='Tasks claimed per round trip')
+        parser.add_argument('--poll', type=float, default=1.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once the queues are drained (cron, CI)')
+        parser.add_argument('--retry-dead', action='store_true', help='Requeue dead tasks and exit')
+
+    def handle(self, *args, **options):
+        # 1. Dead letters: inspect last_error in the admin, then requeue them here once fixed
+        if options['retry_dead']:
+            count = Task.objects.filter(status='dead').update(status='queued', attempts=0, locked_by='')
+            self.stdout.write(self.style.SUCCESS(f"Requeued {count} dead tasks."))
+            return
+
+        queues = options['queues']
+        self.stdout.write(f"Starting {options['workers']} workers on queues: {', '.join(queues)}")
+
+        # 2. Fork the workers; Ctrl+C / SIGTERM lets them finish their current task
+        stop = Event()
+        connection.close()
+        processes = [
+            Process(target=work, args=(queues, options['batch'], options['poll'], options['once'], stop))
+            for _ in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+
+        def shutdown(signum, frame):
+            self.stdout.write('Stopping workers after their current task...')
+            stop.set()
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+        for process in processes:
+            process.join()
+
+        counts = dict(Task.objects.values_list('status').annotate(n=Count('id')).order_by())
+        self.stdout.write(self.style.SUCCESS('-----'))
+        self.stdout.write(self.style.SUCCESS(
+            f"Done! {counts.get('queued', 0)} queued, {counts.get('running', 0)} running, "
+            f"{counts.get('dead', 0)} dead tasks left."
+        ))
@@ -0,0 +1,528 @@
+import math
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+from multiprocessing import Pool
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.text import slugify
+from talents import feed, ranking
+from talents.minhash import band_keys, signature
+from talents.models import (
+    Profile, Skill, Job, JobBand, Proposal, Contract, Transaction, Conversation, Message, Review, Notification,
+    FeedEntry,
+)
+
+# Same categories seed_talents always used, plus the tech skills jobs ask for
+CATEGORIES = [
+    'Account Management',
+    'Business Development',
+    'Customer Care & Success',
+    'Finance',
+    'IT / Software',
+    'Marketing',
+    'People / Talent Acquisition',
+    'PR & Communications',
+    'Product Design',
+    'Product Management',
+    'Sales',
+    'Operations',
+]
+TECH_SKILLS = [
+    'Python', 'Django', 'JavaScript', 'React', 'Vue', 'Node.js', 'TypeScript', 'PHP', 'Laravel', 'Java',
+    'Kotlin', 'Swift', 'Flutter', 'Go', 'Rust', 'SQL', 'PostgreSQL', 'AWS', 'Docker', 'Figma',
+    'Copywriting', 'SEO', 'Data Analysis', 'Excel', 'Video Editing', 'Illustration', 'UI/UX', 'DevOps',
+]
+LOCATIONS = ['Lagos', 'Abuja', 'Port Harcourt', 'Ibadan', 'Enugu', 'Kano', 'Benin City', 'Remote']
+JOB_TITLES = [
+    'Build an e-commerce website', 'Design a mobile app UI', 'Write blog articles', 'Set up a CRM',
+    'Fix a Django bug', 'Create a marketing plan', 'Bookkeeping for a small business', 'Develop a REST API',
+    'Edit a YouTube video', 'Design a company logo', 'Manage social media accounts', 'Migrate data to PostgreSQL',
+]
+
+# users, jobs per 100 users, proposals per job, conversations per 100 users, messages per conversation,
+# reviews per 100 users, follows per user, notifications per user
+PRESETS = {
+    'tiny':   dict(users=60, jobs=10, proposals=3, conversations=20, messages=6, reviews=50, follows=3, notifications=3),
+    'small':  dict(users=1_000, jobs=10, proposals=5, conversations=20, messages=10, reviews=50, follows=5, notifications=5),
+    'medium': dict(users=50_000, jobs=10, proposals=5, conversations=20, messages=10, reviews=50, follows=5, notifications=5),
+    'large':  dict(users=500_000, jobs=10, proposals=5, conversations=20, messages=10, reviews=50, follows=5, notifications=5),
+    'xl':     dict(users=2_000_000, jobs=10, proposals=5, conversations=20, messages=10, reviews=50, follows=5, notifications=5),
+}
+
+# Work is split into fixed-size chunks of entity indices. Every chunk seeds its own RNG from
+# (seed, kind, chunk start), so the data is identical whatever the number of workers.
+CHUNK = 5_000
+CLIENT_EVERY = 5  # every 5th user is a client, the rest are freelancers
+CONTRACT_RATE = 0.2
+PASSWORD = 'password123'
+RATINGS = [1, 2, 3, 4, 5]
+RATING_WEIGHTS = [1, 1, 3, 8, 12]
+FEED_DAYS = 30  # Open jobs this recent are fanned out into feeds, like 'manage.py fan_out_jobs'
+# Models whose ids the seeder picks itself (see Plan.user_id() etc.)
+EXPLICIT_ID_MODELS = [User, Profile, Job, Proposal, Contract, Conversation]
+
+
+def freelancer_index(n, users):
+    """The n-th freelancer's user index (skips every CLIENT_EVERY-th user)."""
+    n %= users - math.ceil(users / CLIENT_EVERY)
+    return n + n // (CLIENT_EVERY - 1) + 1
+
+
+def insert_rows(model, columns, rows):
+    """Inserts plain tuples with one executemany (multi-row VALUES off SQLite).
+
+    Going through model instances and bulk_create costs ~10x more per row than the
+    insert itself, which is what caps a seeder at a few thousand rows/s. Columns not
+    listed get the field's default ('' / None / default=), so new model fields keep working.
+    """
+    if not rows:
+        return 0
+    fields = {f.attname: f for f in model._meta.concrete_fields}
+    extra = [f for name, f in fields.items() if name not in columns and not f.primary_key]
+    names = [fields[c].column for c in columns] + [f.column for f in extra]
+    defaults = tuple(f.get_db_prep_save(f.get_default(), connection) for f in extra)
+    if defaults:
+        rows = [row + defaults for row in rows]
+
+    table = connection.ops.quote_name(model._meta.db_table)
+    column_sql = ', '.join(connection.ops.quote_name(n) for n in names)
+    placeholders = '(' + ', '.join(['%s'] * len(names)) + ')'
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.executemany(f"INSERT INTO {table} ({column_sql}) VALUES {placeholders}", rows)
+        else:
+            per_statement = 1000
+            for i in range(0, len(rows), per_statement):
+                chunk = rows[i:i + per_statement]
+                cursor.execute(
+                    f"INSERT INTO {table} ({column_sql}) VALUES {', '.join([placeholders] * len(chunk))}",
+                    [value for row in chunk for value in row],
+                )
+    return len(rows)
+
+
+class Plan:
+    """Everything a worker needs to generate its chunk without querying the database."""
+
+    def __init__(self, preset, seed, bases, skill_ids, now, password_hash, words, naive_datetimes):
+        self.__dict__.update(preset)
+        self.naive_datetimes = naive_datetimes
+        self.seed = seed
+        self.bases = bases
+        self.skill_ids = skill_ids
+        self.now = now
+        self.password_hash = password_hash
+        self.words = words
+        self.clients = math.ceil(self.users / CLIENT_EVERY)
+        self.total_jobs = self.users * self.jobs // 100
+        self.total_conversations = self.users * self.conversations // 100
+        self.total_reviews = self.users * self.reviews // 100
+        self.total_follows = self.users * self.follows
+        self.total_notifications = self.users * self.notifications
+
+    def user_id(self, u):
+        return self.bases['user'] + u + 1
+
+    def profile_id(self, u):
+        return self.bases['profile'] + u + 1
+
+    def job_id(self, j):
+        return self.bases['job'] + j + 1
+
+    def past(self, rng, days=365):
+        return self.now - timedelta(seconds=rng.randrange(days * 86400))
+
+    def db(self, value):
+        # SQLite stores naive UTC text; converting here is much cheaper than Django's adapter
+        return value.replace(tzinfo=None).isoformat(' ') if self.naive_datetimes else value
+
+    def units(self, phase):
+        totals = {
+            1: [('users', self.users)],
+            2: [
+                ('jobs', self.total_jobs), ('conversations', self.total_conversations),
+                ('reviews', self.total_reviews), ('follows', self.total_follows),
+                ('notifications', self.total_notifications),
+            ],
+            3: [('ranks', self.users), ('feeds', self.total_jobs)],
+        }[phase]
+        return [(kind, start, min(start + CHUNK, total)) for kind, total in totals for start in range(0, total, CHUNK)]
+
+
+def build_users(plan, rng, start, end):
+    first, last, bios, headlines = plan.words['first'], plan.words['last'], plan.words['bios'], plan.words['headlines']
+    users, profiles, profile_skills = [], [], []
+    for u in range(start, end):
+        user_id, profile_id = plan.user_id(u), plan.profile_id(u)
+        first_name, last_name = rng.choice(first), rng.choice(last)
+        username = f"{first_name.lower()}{user_id}"
+        joined = plan.db(plan.past(rng, 730))
+        users.append((
+            user_id, username, f"{username}@example.com", plan.password_hash, first_name, last_name, joined,
+            False, False, True,
+        ))
+
+        is_client = u % CLIENT_EVERY == 0
+        profiles.append((
+            profile_id, user_id, slugify(username), 'client' if is_client else 'freelancer',
+            rng.choice(headlines), rng.choice(LOCATIONS), rng.choice(bios),
+            None if is_client else rng.randint(30, 200), rng.randint(0, 15), rng.random() < 0.6, True,
+            joined, joined,
+        ))
+        if not is_client:
+            for skill_id in rng.sample(plan.skill_ids, rng.randint(1, 3)):
+                profile_skills.append((profile_id, skill_id))
+
+    return (
+        insert_rows(User, ('id', 'username', 'email', 'password', 'first_name', 'last_name', 'date_joined',
+                           'is_superuser', 'is_staff', 'is_active'), users)
+        + insert_rows(Profile, ('id', 'user_id', 'slug', 'role', 'headline', 'location', 'bio', 'hourly_rate',
+                                'years_experience', 'is_verified', 'onboarding_complete', 'created_at', 'updated_at'),
+                      profiles)
+        + insert_rows(Profile.skills.through, ('profile_id', 'skill_id'), profile_skills)
+    )
+
+
+_signatures = {}
+
+
+def job_signature(title, description):
+    # Titles and descriptions come from small pools, so most signatures are repeats
+    key = (title, description)
+    if key not in _signatures:
+        sig = signature(title, description)
+        _signatures[key] = (sig, band_keys(sig) if sig else [])
+    return _signatures[key]
+
+
+def build_jobs(plan, rng, start, end):
+    bios = plan.words['bios']
+    jobs, job_skills, job_bands, proposals, contracts, transactions = [], [], [], [], [], []
+    for j in range(start, end):
+        job_id = plan.job_id(j)
+        client_id = plan.user_id((j % plan.clients) * CLIENT_EVERY)
+        title = rng.choice(JOB_TITLES)
+        posted_at = plan.past(rng)
+        posted = plan.db(posted_at)
+        budget = Decimal(rng.randrange(5_000, 500_000, 500))
+        hired = rng.random() < CONTRACT_RATE
+        description = rng.choice(bios)  # Drawn in the same order as before, so a seed gives the same data
+        minhash, keys = job_signature(title, description)
+        jobs.append((
+            job_id, client_id, title, f"{slugify(title)}-{job_id}", description, rng.choice(['fixed', 'hourly']),
+            budget, rng.choice(['entry', 'intermediate', 'expert']), not hired, plan.db(Job.expiry_for(posted_at)),
+            minhash, posted, posted,
+        ))
+        job_bands += [(job_id, key) for key in keys]
+        for skill_id in rng.sample(plan.skill_ids, rng.randint(1, 3)):
+            job_skills.append((job_id, skill_id))
+
+        # Proposals get sparse, predictable ids so the contract can point at the first one
+        offset = rng.randrange(1 << 30)
+        for k in range(plan.proposals):
+            proposals.append((
+                plan.bases['proposal'] + j * plan.proposals + k + 1, job_id,
+                plan.user_id(freelancer_index(offset + k, plan.users)), rng.choice(bios),
+                budget * Decimal(rng.choice(['0.8', '0.9', '1', '1.1'])), rng.randint(2, 60),
+                'accepted' if hired and k == 0 else 'pending', posted, posted,
+            ))
+
+        if hired:
+            proposal_id, _, freelancer_id, _, price = proposals[-plan.proposals][:5]
+            contract_id = plan.bases['contract'] + j + 1
+            completed = rng.random() < 0.5
+            contracts.append((
+                contract_id, job_id, client_id, freelancer_id, proposal_id, price,
+                'completed' if completed else 'active', posted, posted, posted,
+            ))
+            # Same ledger entries the wallet and contract views write
+            ledger = [
+                (client_id, price, 'deposit', None, f"SEED-DEP-{contract_id}"),
+                (client_id, price, 'escrow_hold', contract_id, f"ESCROW-{contract_id}"),
+            ]
+            if completed:
+                ledger += [
+                    (client_id, -price, 'escrow_release', contract_id, f"RELEASE-{contract_id}"),
+                    (freelancer_id, price, 'fund_received', contract_id, f"PAYOUT-{contract_id}"),
+                ]
+            transactions.extend(row + ('success', posted, posted) for row in ledger)
+
+    return (
+        insert_rows(Job, ('id', 'client_id', 'title', 'slug', 'description', 'job_type', 'budget', 'experience_level',
+                          'is_active', 'expires_at', 'minhash', 'created_at', 'updated_at'), jobs)
+        + insert_rows(JobBand, ('job_id', 'key'), job_bands)
+        + insert_rows(Job.skills_required.through, ('job_id', 'skill_id'), job_skills)
+        + insert_rows(Proposal, ('id', 'job_id', 'freelancer_id', 'cover_letter', 'bid_amount', 'estimated_days',
+                                 'status', 'created_at', 'updated_at'), proposals)
+        + insert_rows(Contract, ('id', 'job_id', 'client_id', 'freelancer_id', 'proposal_id', 'agreed_price',
+                                 'status', 'start_date', 'created_at', 'updated_at'), contracts)
+        + insert_rows(Transaction, ('user_id', 'amount', 'transaction_type', 'contract_id', 'reference', 'status',
+                                    'created_at', 'updated_at'), transactions)
+    )
+
+
+def build_conversations(plan, rng, start, end):
+    conversations, participants, messages = [], [], []
+    for c in range(start, end):
+        conversation_id = plan.bases['conversation'] + c + 1
+        a_u = rng.randrange(plan.users)
+        a, b = plan.user_id(a_u), plan.user_id((a_u + 1 + rng.randrange(plan.users - 1)) % plan.users)
+        started = plan.past(rng)
+        conversations.append((conversation_id, plan.db(started), plan.db(started)))
+        participants += [(conversation_id, a), (conversation_id, b)]
+        sent = started
+        for m in range(plan.messages):
+            sender, recipient = (a, b) if m % 2 == 0 else (b, a)
+            sent = min(sent + timedelta(minutes=rng.randint(1, 600)), plan.now)
+            at = plan.db(sent)
+            messages.append((
+                conversation_id, sender, recipient, rng.choice(plan.words['bios']),
+                at if rng.random() < 0.8 else None, at, at,
+            ))
+
+    return (
+        insert_rows(Conversation, ('id', 'created_at', 'updated_at'), conversations)
+        + insert_rows(Conversation.participants.through, ('conversation_id', 'user_id'), participants)
+        + insert_rows(Message, ('conversation_id', 'sender_id', 'recipient_id', 'content', 'read_at', 'created_at',
+                                'updated_at'), messages)
+    )
+
+
+def build_reviews(plan, rng, start, end):
+    # Review r pairs the (r % F)-th freelancer with an author offset by r // F,
+    # which keeps (talent, author) unique without checking the table
+    freelancers = plan.users - plan.clients
+    reviews = []
+    for r in range(start, end):
+        talent_u = freelancer_index(r, plan.users)
+        author_u = (talent_u + 1 + r // freelancers) % plan.users
+        written = plan.db(plan.past(rng))
+        reviews.append((
+            plan.profile_id(talent_u), plan.user_id(author_u), rng.choices(RATINGS, weights=RATING_WEIGHTS)[0],
+            rng.choice(plan.words['bios']), written, written,
+        ))
+    return insert_rows(Review, ('talent_id', 'author_id', 'rating', 'comment', 'created_at', 'updated_at'), reviews)
+
+
+def build_follows(plan, rng, start, end):
+    # Same trick as reviews: follow f links profile f % U to the one (f // U) + 1 places after it
+    follows = [
+        (plan.profile_id(f % plan.users), plan.profile_id((f % plan.users + 1 + f // plan.users) % plan.users))
+        for f in range(start, end)
+    ]
+    return insert_rows(Profile.follows.through, ('from_profile_id', 'to_profile_id'), follows)
+
+
+def build_notifications(plan, rng, start, end):
+    notifications = []
+    for n in range(start, end):
+        created = plan.db(plan.past(rng, 180))
+        notifications.append((
+            plan.user_id(n % plan.users), rng.choice(plan.words['notifications']), rng.random() < 0.7,
+            created, created,
+        ))
+    return insert_rows(Notification, ('user_id', 'message', 'is_read', 'created_at', 'updated_at'), notifications)
+
+
+def build_ranks(plan, rng, start, end):
+    # Completeness and rank_score, once the skills, reviews and messages they count are in.
+    # 1000 at a time like 'manage.py rank_profiles', to keep the IN lists short. Written with
+    # one executemany UPDATE per chunk: bulk_update's CASE WHEN costs ~5x the scoring itself
+    table = connection.ops.quote_name(Profile._meta.db_table)
+    ranked = 0
+    for first in range(start, end, 1000):
+        last = min(first + 1000, end) - 1
+        profiles = Profile.objects.filter(id__range=(plan.profile_id(first), plan.profile_id(last))).select_related('user')
+        scores = ranking.compute(list(profiles))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {table} SET completeness = %s, rank_score = %s WHERE id = %s",
+                [(completeness, rank_score, profile_id) for profile_id, (completeness, rank_score) in scores.items()],
+            )
+        ranked += len(scores)
+    return ranked
+
+
+def build_feeds(plan, rng, start, end):
+    # What the 'feeds' workers' fan-out writes when a job is posted, for the whole job range
+    # in one INSERT ... SELECT instead of feed.fan_out() per job (a few queries per job and
+    # every entry through Python). Same matching: freelancers other than the client having
+    # at least FEED_MATCH_THRESHOLD of the job's skills, scored by the share they have.
+    # Grouped user first, so rows arrive in the order of the (user, ...) indexes they go into
+    qn = connection.ops.quote_name
+    job_skills = qn(Job.skills_required.through._meta.db_table)
+    profile_skills = qn(Profile.skills.through._meta.db_table)
+    first, last = plan.job_id(start), plan.job_id(end - 1)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {qn(FeedEntry._meta.db_table)} (user_id, job_id, score, posted_at)
+            SELECT p.user_id, j.id, COUNT(*) * 1.0 / required.n, j.created_at
+            FROM {qn(Job._meta.db_table)} j
+            JOIN (SELECT job_id, COUNT(*) AS n FROM {job_skills} WHERE job_id BETWEEN %s AND %s
+                  GROUP BY job_id) required ON required.job_id = j.id
+            JOIN {job_skills} js ON js.job_id = j.id
+            JOIN {profile_skills} ps ON ps.skill_id = js.skill_id
+            JOIN {qn(Profile._meta.db_table)} p ON p.id = ps.profile_id
+            WHERE j.id BETWEEN %s AND %s AND j.is_active = %s AND j.created_at >= %s
+              AND p.role = 'freelancer' AND p.user_id <> j.client_id
+            GROUP BY p.user_id, j.id, required.n, j.created_at
+            HAVING COUNT(*) >= %s * required.n
+            """,
+            [first, last, first, last, True, plan.db(plan.now - timedelta(days=FEED_DAYS)), feed.threshold()],
+        )
+        written = cursor.rowcount
+
+    # Jobs matching more than FEED_FANOUT_LIMIT freelancers are pulled at read time instead
+    pulled = list(
+        FeedEntry.objects.filter(job__gte=first, job__lte=last).order_by().values_list('job')
+        .annotate(n=Count('id')).filter(n__gt=feed.fanout_limit()).values_list('job', flat=True)
+    )
+    if pulled:
+        written -= FeedEntry.objects.filter(job__in=pulled).delete()[0]
+        Job.objects.filter(id__in=pulled).update(feed_pull=True)
+
+    # FEED_MAX_ENTRIES_PER_USER, 1000 users at a time like fan_out's chunks
+    users = list(FeedEntry.objects.filter(job__gte=first, job__lte=last).order_by('user').values_list('user', flat=True).distinct())
+    for i in range(0, len(users), 1000):
+        feed.trim(users[i:i + 1000])
+    return written
+
+
+BUILDERS = {
+    'users': build_users,
+    'jobs': build_jobs,
+    'conversations': build_conversations,
+    'reviews': build_reviews,
+    'follows': build_follows,
+    'notifications': build_notifications,
+    'ranks': build_ranks,
+    'feeds': build_feeds,
+}
+# These read before they write. Inside one long transaction, SQLite can't upgrade their read lock
+# to a write lock while other workers commit ('database is locked' right away, no busy wait), so
+# they commit in small steps of their own (an UPDATE per 1000 profiles, one feed INSERT ... SELECT)
+SELF_COMMITTING = {'ranks', 'feeds'}
+
+_plan = None
+
+
+def _init_worker(plan):
+    global _plan
+    import django
+    django.setup()
+    # Forked workers must not reuse the parent's connection
+    connection.close()
+    if connection.vendor == 'sqlite':
+        # SQLite has one writer at a time: wait for the other workers' chunks instead of failing
+        connection.settings_dict.setdefault('OPTIONS', {})['timeout'] = 300
+    _plan = plan
+
+
+def run_unit(unit):
+    kind, start, end = unit
+    rng = random.Random(f"{_plan.seed}:{kind}:{start}")
+    if kind in SELF_COMMITTING:
+        return BUILDERS[kind](_plan, rng, start, end)
+    with transaction.atomic():
+        return BUILDERS[kind](_plan, rng, start, end)
+
+
+class Command(BaseCommand):
+    help = 'Generates realistic load-test data (users, profiles, jobs, proposals, contracts, payments, chats, reviews)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', choices=PRESETS, default='small', help='Size preset')
+        parser.add_argument('--users', type=int, help='Override the number of users in the preset')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed, the same seed gives the same data')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes. On SQLite writes still serialize, so this mostly overlaps CPU work')
+
+    def handle(self, *args, **options):
+        preset = dict(PRESETS[options['size']])
+        if options['users']:
+            preset['users'] = options['users']
+        if preset['users'] < 2 * CLIENT_EVERY:
+            raise CommandError(f"Need at least {2 * CLIENT_EVERY} users.")
+
+        started = time.monotonic()
+        self.stdout.write(f"Seeding preset '{options['size']}' ({preset['users']:,} users) with seed {options['seed']}...")
+
+        # 1. Shared setup done once: skills, id offsets, one password hash, word pools
+        plan = Plan(
+            preset, options['seed'], self.id_bases(), self.skill_ids(), timezone.now(),
+            make_password(PASSWORD), self.word_pools(options['seed']),
+            naive_datetimes=connection.vendor == 'sqlite',
+        )
+
+        # 2. Users/profiles must exist before anything points at them, so they are a phase of their own.
+        # Scores and feeds (phase 3) are computed from everything else
+        total = 0
+        for phase in (1, 2, 3):
+            units = plan.units(phase)
+            if options['workers'] > 1:
+                connection.close()
+                with Pool(options['workers'], initializer=_init_worker, initargs=(plan,)) as pool:
+                    for rows in pool.imap_unordered(run_unit, units):
+                        total += rows
+                        self.progress(total, started)
+            else:
+                _init_worker(plan)
+                for unit in units:
+                    total += run_unit(unit)
+                    self.progress(total, started)
+
+        # 3. The rows above carry their own ids: move the sequences past them (PostgreSQL), or the
+        # next User, Job... created by the app would reuse an id. Nothing to do on SQLite
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), EXPLICIT_ID_MODELS):
+                cursor.execute(sql)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS('--------------------------------------'))
+        self.stdout.write(self.style.SUCCESS(
+            f"DONE! {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s). Password for every user: {PASSWORD}"
+        ))
+
+    def progress(self, total, started):
+        self.stdout.write(f"  {total:,} rows ({total / (time.monotonic() - started):,.0f} rows/s)")
+
+    def id_bases(self):
+        # New rows go after the current max id, so seeding never collides with real data
+        def base(model):
+            return model.objects.aggregate(m=Max('id'))['m'] or 0
+
+        return {
+            'user': base(User), 'profile': base(Profile), 'job': base(Job), 'proposal': base(Proposal),
+            'contract': base(Contract), 'conversation': base(Conversation),
+        }
+
+    def skill_ids(self):
+        names = CATEGORIES + TECH_SKILLS
+        existing = set(Skill.objects.filter(name__in=names).values_list('name', flat=True))
+        Skill.objects.bulk_create([Skill(name=name) for name in names if name not in existing])
+        return sorted(Skill.objects.filter(name__in=names).values_list('id', flat=True))
+
+    def word_pools(self, seed):
+        # Faker is slow per call, so build small pools once and sample from them
+        from faker import Faker
+
+        fake = Faker()
+        Faker.seed(seed)
+        return {
+            'first': [fake.first_name() for _ in range(500)],
+            'last': [fake.last_name() for _ in range(500)],
+            'bios': [fake.text(max_nb_chars=160) for _ in range(500)],
+            'headlines': [f"{fake.job()}" for _ in range(200)],
+            'notifications': [
+                'You received a new proposal.', 'Your proposal was viewed.', 'New 5★ review!',
+                'Someone started following you.', 'Payment received.', 'A job matching your skills was posted.',
+            ],
+        }
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import time
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from talents.models import Subscriber
+
+
+class Command(BaseCommand):
+    help = 'Emails a newsletter to every subscriber (batched, throttled and resumable)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('subject', help='Subject line')
+        parser.add_argument('body', help='Path to the plain text body')
+        parser.add_argument('--html', help='Path to an HTML alternative of the body')
+        parser.add_argument('--from-email', default=None, help='Sender (default: DEFAULT_FROM_EMAIL)')
+        parser.add_argument('--batch-size', type=int, default=settings.NEWSLETTER_BATCH_SIZE,
+                            help='Messages sent per SMTP connection')
+        parser.add_argument('--rate', type=float, default=settings.NEWSLETTER_RATE,
+                            help='Maximum messages per second (0 for no limit)')
+        parser.add_argument('--checkpoint', default=os.path.join(settings.BASE_DIR, '.send_newsletter.json'),
+                            help='Progress file, rerun the same newsletter to resume where it stopped')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and send to everyone')
+        parser.add_argument('--smtp-host', help='Send through this SMTP server instead of EMAIL_HOST, without '
+                                                'TLS or login (e.g. a local "python -m aiosmtpd -n" debugging server)')
+        parser.add_argument('--smtp-port', type=int, default=1025)
+
+    def handle(self, *args, **options):
+        with open(options['body']) as f:
+            body = f.read()
+        html = None
+        if options['html']:
+            with open(options['html']) as f:
+                html = f.read()
+        subject = options['subject']
+
+        # 1. Load the checkpoint. It belongs to one newsletter: a different subject or body
+        # starts from the first subscriber again
+        campaign = hashlib.sha256(f"{subject}\n{body}\n{html}".encode()).hexdigest()[:16]
+        checkpoint_path = options['checkpoint']
+        state = {'campaign': campaign, 'last_id': 0, 'sent': 0}
+        if not options['restart'] and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                saved = json.load(f)
+            if saved.get('campaign') == campaign:
+                state = saved
+                self.stdout.write(f"Resuming after subscriber #{state['last_id']} ({state['sent']} already sent).")
+
+        # 2. Stream subscribers in id order, never the whole table in memory
+        subscribers = (
+            Subscriber.objects.filter(id__gt=state['last_id'])
+            .order_by('id').values_list('id', 'email')
+        )
+        total = subscribers.count()
+        self.stdout.write(f"Sending '{subject}' to {total} subscribers...")
+
+        batch_size = options['batch_size']
+        self.throttle = Throttle(options['rate'])
+        batch = []
+        sent = 0
+        for row in subscribers.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                sent += self.send_batch(batch, subject, body, html, state, options)
+                self.stdout.write(f"[{sent}/{total}] sent")
+                batch = []
+        if batch:
+            sent += self.send_batch(batch, subject, body, html, state, options)
+
+        self.stdout.write(self.style.SUCCESS('----------------------------------'))
+        self.stdout.write(self.style.SUCCESS(f"DONE! {sent} emails sent ({state['sent']} in total for this newsletter)."))
+
+    def open_connection(self, options):
+        if options['smtp_host']:
+            return get_connection('django.core.mail.backends.smtp.EmailBackend',
+                                  host=options['smtp_host'], port=options['smtp_port'],
+                                  username='', password='', use_tls=False, use_ssl=False)
+        return get_connection()
+
+    def send_batch(self, batch, subject, body, html, state, options):
+        # 3. One connection (TCP + TLS handshake + login) for the whole batch. Messages go out
+        # one by one so a failure leaves an exact checkpoint behind
+        sent = 0
+        connection = self.open_connection(options)
+        try:
+            connection.open()
+            for subscriber_id, email in batch:
+                message = EmailMultiAlternatives(subject, body, options['from_email'], [email], connection=connection)
+                if html:
+                    message.attach_alternative(html, 'text/html')
+                self.throttle.wait()
+                message.send()
+                sent += 1
+                state['last_id'] = subscriber_id
+        except Exception as e:
+            raise CommandError(f"Sending stopped after subscriber #{state['last_id']}: {e}. "
+                               f"Run the command again to resume.")
+        finally:
+            state['sent'] += sent
+            self.save_checkpoint(state, options['checkpoint'])
+            connection.close()
+        return sent
+
+    def save_checkpoint(self, state, checkpoint_path):
+        # 4. Atomic replace, so a crash mid-write can't corrupt the progress file
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, checkpoint_path)
+
+
+class Throttle:
+    """Spaces calls to wait() so they average at most `rate` per second."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_at = time.monotonic()
+
+    def wait(self):
+        now = time.monotonic()
+        if self.next_at > now:
+            time.sleep(self.next_at - now)
+        self.next_at = max(now, self.next_at) + self.interval
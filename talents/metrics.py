@@ -0,0 +1,104 @@
+import functools
+import os
+
+from django.conf import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest, multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+# With PROMETHEUS_MULTIPROC_DIR set (one shared directory per host, emptied before gunicorn
+# starts), every worker writes its samples to mmap'd files there and /metrics sums them up.
+# Without it the registry is per process, which is fine for runserver.
+MULTIPROCESS = bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+REQUEST_LATENCY = Histogram(
+    'talents_request_duration_seconds', 'Request latency by URL name',
+    ['view', 'method'], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    'talents_requests_total', 'Requests by URL name and status code',
+    ['view', 'method', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'talents_request_db_queries', 'SQL queries per request by URL name',
+    ['view'], buckets=QUERY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'talents_cache_requests_total', 'Cache lookups by cache backend and result (hit/miss)',
+    ['backend', 'result'],
+)
+_MISSING = object()
+_instrumented = set()
+
+
+def instrument_caches():
+    """Counts hits and misses of every configured cache by wrapping its backend's get()."""
+    from django.core.cache import caches
+
+    for alias in getattr(settings, 'CACHES', {'default': {}}):
+        backend = type(caches[alias])
+        if backend in _instrumented:
+            continue
+        _instrumented.add(backend)
+        backend.get = _counted_get(backend.get)
+
+
+def _counted_get(get):
+    @functools.wraps(get)
+    def wrapper(self, key, default=None, version=None):
+        value = get(self, key, _MISSING, version=version)
+        if value is _MISSING:
+            CACHE_REQUESTS.labels(type(self).__name__, 'miss').inc()
+            return default
+        CACHE_REQUESTS.labels(type(self).__name__, 'hit').inc()
+        return value
+    return wrapper
+
+
+class TaskQueueCollector:
+    """The task queue, read from the database at scrape time: talents_task_queue_depth from
+    the Task table, talents_background_workers from the worker heartbeats. Not Gauges: in
+    multiprocess mode a Gauge keeps whatever each process last wrote to its file, and the
+    workers run as their own service, not in the web processes serving /metrics."""
+
+    depth = ('talents_task_queue_depth', 'Tasks in the database queue by queue and status (queued, running, dead)')
+    workers = ('talents_background_workers', 'run_workers processes with a recent heartbeat, by queue served')
+
+    def describe(self):
+        return [GaugeMetricFamily(*self.depth, labels=['queue', 'status']),
+                GaugeMetricFamily(*self.workers, labels=['queue'])]
+
+    def collect(self):
+        from collections import Counter
+        from django.db.models import Count
+        from . import taskqueue
+        from .models import Task
+
+        depth = GaugeMetricFamily(*self.depth, labels=['queue', 'status'])
+        rows = Task.objects.exclude(status='done').values_list('queue', 'status').annotate(n=Count('id')).order_by()
+        for queue, status, count in rows:
+            depth.add_metric([queue, status], count)
+        yield depth
+
+        workers = GaugeMetricFamily(*self.workers, labels=['queue'])
+        serving = Counter(queue for queues in taskqueue.live_workers().values_list('queues', flat=True)
+                          for queue in queues)
+        for queue, count in sorted(serving.items()):
+            workers.add_metric([queue], count)
+        yield workers
+
+
+def render():
+    """(body, content type) of the Prometheus text exposition."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    tasks = CollectorRegistry()
+    tasks.register(TaskQueueCollector())
+    return generate_latest(registry) + generate_latest(tasks), CONTENT_TYPE_LATEST
@@ -0,0 +1,308 @@
+import contextlib
+import cProfile
+import logging
+import random
+import re
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.functional import empty
+
+from . import db, profiling, routers
+
+logger = logging.getLogger('talents.queries')
+
+# Literals and IN-lists are folded so "the same query for another row" gets the same shape
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def fingerprint(sql):
+    """The shape of a query: literals, numbers and IN-lists replaced by placeholders."""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('(...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+def query_origin():
+    """Where the current query comes from: the innermost template node being rendered
+    ("talents/browse.html:62"), else the innermost frame of project code."""
+    base_dir = str(settings.BASE_DIR)
+    project_frame = None
+    frame = sys._getframe(1)
+    # Skip the execute wrappers themselves (this one and any other installed, e.g. by a benchmark)
+    while frame is not None and frame.f_code.co_name != '_execute_with_wrappers':
+        frame = frame.f_back
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            token = getattr(node, 'token', None)
+            origin = getattr(node, 'origin', None)
+            if token is not None and origin is not None:
+                return f"{origin.template_name}:{token.lineno}"
+        if (project_frame is None and code.co_filename.startswith(base_dir)
+                and 'site-packages' not in code.co_filename):
+            project_frame = f"{code.co_filename[len(base_dir) + 1:]}:{frame.f_lineno}"
+        frame = frame.f_back
+    return project_frame or 'unknown'
+
+
+class QueryInspector:
+    """Counts the queries of one request and remembers where repeated shapes came from."""
+
+    def __init__(self):
+        self.count = 0
+        self.shapes = Counter()
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        shape = fingerprint(sql)
+        self.shapes[shape] += 1
+        if self.shapes[shape] == 2:
+            # Only repeats are worth the stack walk
+            self.origins[shape] = query_origin()
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold):
+        return [
+            (shape, times, self.origins.get(shape, 'unknown'))
+            for shape, times in self.shapes.most_common()
+            if times >= threshold
+        ]
+
+
+class AsyncCapableMiddleware:
+    """Base of the middleware that runs in production: it works natively under ASGI too, so
+    an async view (verify_payment) isn't handed between the event loop and a thread at each
+    of them. Subclasses wrap the view in `around(request)`, a context manager yielding a
+    namespace whose `response` is set once the view returned."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.around(request) as result:
+            result.response = self.get_response(request)
+        return result.response
+
+    async def __acall__(self, request):
+        with self.around(request) as result:
+            result.response = await self.get_response(request)
+        return result.response
+
+    def around(self, request):
+        raise NotImplementedError
+
+
+class QueryBudgetMiddleware:
+    """Development/test guard against query explosions.
+
+    Every request is checked against QUERY_BUDGETS[url_name] (falling back to
+    QUERY_BUDGET_DEFAULT) and for N+1 patterns: the same query shape running
+    QUERY_N_PLUS_ONE_THRESHOLD times or more. Violations raise QueryBudgetExceeded when
+    QUERY_INSPECTOR_RAISE is on (tests) and are logged to 'talents.queries' otherwise
+    (staging). Disabled entirely unless QUERY_INSPECTOR_ENABLED, so it stays sync-only.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_INSPECTOR_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        inspector = QueryInspector()
+        with db.observe_queries(inspector):
+            response = self.get_response(request)
+            # Lazy TemplateResponses render their queries here, inside the wrappers
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+
+        match = request.resolver_match
+        url_name = match.url_name if match else None
+        problems = self.check(url_name, inspector)
+        if problems:
+            message = f"{request.method} {request.path} ({url_name}): " + '; '.join(problems)
+            if getattr(settings, 'QUERY_INSPECTOR_RAISE', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def check(self, url_name, inspector):
+        problems = []
+        budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        budget = budgets.get(url_name, getattr(settings, 'QUERY_BUDGET_DEFAULT', None))
+        if budget is not None and inspector.count > budget:
+            problems.append(f"{inspector.count} queries, budget is {budget}")
+
+        threshold = getattr(settings, 'QUERY_N_PLUS_ONE_THRESHOLD', 5)
+        for shape, times, origin in inspector.repeated(threshold):
+            problems.append(f"N+1 at {origin}: {times}x {shape[:200]}")
+        return problems
+
+
+PROFILE_HEADER = 'HTTP_X_PROFILE_TOKEN'
+PROFILE_SALT = 'talents.profiling'
+
+
+def profile_token():
+    """A token for the X-Profile-Token header, valid for PROFILING_TOKEN_MAX_AGE seconds.
+    See 'manage.py profile_token'."""
+    return signing.TimestampSigner(salt=PROFILE_SALT).sign('profile')
+
+
+class RequestProfilingMiddleware(AsyncCapableMiddleware):
+    """Times the phases of every request and reports them in a Server-Timing header:
+    db (SQL, with the query count), tpl (template rendering), http (outbound calls such as
+    Paystack), media (storage URL building, i.e. Cloudinary) and app (everything else).
+
+    The header reveals DB time and query counts, so unless SERVER_TIMING_PUBLIC (on with
+    DEBUG) it is only sent to staff users and to requests carrying a valid signed
+    X-Profile-Token header.
+
+    A PROFILING_SAMPLE_RATE fraction of requests, plus any request carrying the token, also
+    run under cProfile; the stats are written to PROFILING_DIR for offline analysis
+    (python -m pstats / snakeviz). Under ASGI cProfile only sees the event loop's thread,
+    not the sync views and ORM calls run in worker threads.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SERVER_TIMING_ENABLED', True):
+            raise MiddlewareNotUsed
+        profiling.install()
+        super().__init__(get_response)
+
+    @contextlib.contextmanager
+    def around(self, request):
+        result = SimpleNamespace(response=None)
+        timings = profiling.RequestTimings()
+        token = profiling.current.set(timings)
+        has_token = self.has_token(request)
+        profiler = cProfile.Profile() if has_token or self.sampled() else None
+        began = time.perf_counter()
+        try:
+            with db.observe_queries(profiling.time_query):
+                if profiler:
+                    profiler.enable()
+                try:
+                    yield result
+                finally:
+                    if profiler:
+                        profiler.disable()
+        finally:
+            profiling.current.reset(token)
+
+        response = result.response
+        total_ms = (time.perf_counter() - began) * 1000
+        if has_token or getattr(settings, 'SERVER_TIMING_PUBLIC', False) or self.is_staff(request):
+            response['Server-Timing'] = timings.server_timing(total_ms)
+        if profiler:
+            path = profiling.profile_path(request, total_ms)
+            profiler.dump_stats(path)
+            logger.info('Profiled %s %s in %.0fms: %s', request.method, request.path, total_ms, path)
+
+    def has_token(self, request):
+        token = request.META.get(PROFILE_HEADER)
+        if not token:
+            return False
+        try:
+            signing.TimestampSigner(salt=PROFILE_SALT).unsign(
+                token, max_age=getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600))
+            return True
+        except signing.BadSignature:
+            return False
+
+    def sampled(self):
+        rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+        return rate > 0 and random.random() < rate
+
+    def is_staff(self, request):
+        # Set by AuthenticationMiddleware further down; absent when a middleware answered first
+        user = getattr(request, 'user', None)
+        # Under ASGI, only a user the view already loaded: the lookup would block the event loop
+        if user is None or (iscoroutinefunction(self) and getattr(user, '_wrapped', None) is empty):
+            return False
+        return bool(user.is_authenticated and user.is_staff)
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """Feeds the Prometheus registry in talents.metrics: latency, status and query count
+    per URL name. Served on /metrics (see talents.views.ops)."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        # Imported here: the admin checks import every middleware, and management commands
+        # have no use for prometheus_client
+        from . import metrics
+        metrics.instrument_caches()
+        self.metrics = metrics
+        super().__init__(get_response)
+
+    @contextlib.contextmanager
+    def around(self, request):
+        result = SimpleNamespace(response=None)
+        queries = [0]
+
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        began = time.perf_counter()
+        with db.observe_queries(count):
+            yield result
+        elapsed = time.perf_counter() - began
+        response = result.response
+
+        # URL names keep the label set small; unmatched paths (404s, static) share one label
+        match = request.resolver_match
+        view = (match.view_name if match else None) or 'unresolved'
+        self.metrics.REQUEST_LATENCY.labels(view, request.method).observe(elapsed)
+        self.metrics.REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+        self.metrics.REQUEST_QUERIES.labels(view).observe(queries[0])
+
+
+class ReplicaPinMiddleware(AsyncCapableMiddleware):
+    """Pins a browser to the primary database for REPLICA_PIN_SECONDS after any request that
+    wrote (including session saves), so @replica_reads views show users their own changes
+    despite replication lag. Listed before SessionMiddleware so session writes count."""
+
+    def __init__(self, get_response):
+        if not routers.replicas():
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    @contextlib.contextmanager
+    def around(self, request):
+        result = SimpleNamespace(response=None)
+        tracker, token = routers.start_request()
+        try:
+            yield result
+        finally:
+            routers.end_request(token)
+        if tracker['wrote']:
+            result.response.set_cookie(
+                routers.PIN_COOKIE, '1', max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 10),
+                httponly=True, samesite='Lax',
+            )
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talents', '0014_task'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='transaction',
+            name='reference',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-19 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talents', '0015_transaction_reference_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='completeness',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='rank_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['-rank_score'], name='profile_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['role', '-rank_score'], name='profile_role_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-19 14:07
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_expires_at(apps, schema_editor):
+    # Existing jobs get the same lifetime as new ones; the first expire_jobs run closes the stale ones
+    Job = apps.get_model('talents', 'Job')
+    Job.objects.filter(expires_at=None).update(
+        expires_at=models.F('created_at') + timedelta(days=getattr(settings, 'JOB_LIFETIME_DAYS', 30))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talents', '0017_job_feed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_expires_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='job_active_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['expires_at'], name='job_active_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-19 14:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talents', '0018_job_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='minhash',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.CreateModel(
+            name='JobBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField(db_index=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='minhash_bands', to='talents.job')),
+            ],
+        ),
+    ]
@@ -0,0 +1,105 @@
+import math
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import Avg, Count, Max
+from django.utils import timezone
+
+# The scoring of talents.ranking as it was when this migration was written, frozen so that
+# replaying migrations keeps working (and scoring the same) whatever that module becomes
+CHUNK_SIZE = 1000
+DEFAULT_IMAGE = 'default.jpg'
+COMPLETENESS_POINTS = {'bio': 20, 'location': 20, 'profile_pic': 20, 'cover_photo': 10, 'skills': 30}
+WEIGHTS = {'completeness': 0.3, 'verified': 0.15, 'rating': 0.25, 'response_rate': 0.15, 'activity': 0.15}
+RATING_PRIOR = 3.0
+RATING_PRIOR_WEIGHT = 3
+WINDOW_DAYS = 90
+ACTIVITY_HALF_LIFE_DAYS = 30
+
+
+def score(apps, profiles, now):
+    Profile = apps.get_model('talents', 'Profile')
+    Message = apps.get_model('talents', 'Message')
+    Proposal = apps.get_model('talents', 'Proposal')
+    Review = apps.get_model('talents', 'Review')
+    since = now - timedelta(days=WINDOW_DAYS)
+    profile_ids = [p.id for p in profiles]
+    user_ids = [p.user_id for p in profiles]
+
+    with_skills = set(
+        Profile.skills.through.objects.filter(profile_id__in=profile_ids).values_list('profile_id', flat=True)
+    )
+    ratings = {
+        row['talent']: (row['average'], row['count'])
+        for row in Review.objects.filter(talent__in=profile_ids).order_by()
+        .values('talent').annotate(average=Avg('rating'), count=Count('id'))
+    }
+    wrote_to = {}
+    for sender, recipient in (Message.objects.filter(recipient__in=user_ids, created_at__gte=since)
+                              .order_by().values_list('sender', 'recipient').distinct()):
+        wrote_to.setdefault(recipient, set()).add(sender)
+    replied_to = {}
+    last_sent = {}
+    for sender, recipient, last in (Message.objects.filter(sender__in=user_ids, created_at__gte=since).order_by()
+                                    .values_list('sender', 'recipient').annotate(last=Max('created_at'))):
+        replied_to.setdefault(sender, set()).add(recipient)
+        last_sent[sender] = max(last, last_sent.get(sender, last))
+    last_proposal = dict(
+        Proposal.objects.filter(freelancer__in=user_ids).order_by()
+        .values_list('freelancer').annotate(last=Max('created_at'))
+    )
+
+    for profile in profiles:
+        user = profile.user
+        filled = {
+            'bio': bool(profile.bio),
+            'location': bool(profile.location),
+            'profile_pic': bool(profile.profile_pic) and profile.profile_pic.name != DEFAULT_IMAGE,
+            'cover_photo': bool(profile.cover_photo),
+            'skills': profile.id in with_skills,
+        }
+        points = sum(value for part, value in COMPLETENESS_POINTS.items() if filled[part])
+        average, count = ratings.get(profile.id, (None, 0))
+        rating = ((average or 0) * count + RATING_PRIOR * RATING_PRIOR_WEIGHT) / (count + RATING_PRIOR_WEIGHT) / 5
+        senders = wrote_to.get(user.id)
+        response_rate = len(senders & replied_to.get(user.id, set())) / len(senders) if senders else 0.5
+        last_active = max(filter(None, [
+            user.date_joined, user.last_login, profile.updated_at, last_sent.get(user.id), last_proposal.get(user.id),
+        ]))
+        days = max((now - last_active).total_seconds() / 86400, 0)
+        profile.completeness = points
+        profile.rank_score = round(
+            WEIGHTS['completeness'] * points / 100
+            + WEIGHTS['verified'] * profile.is_verified
+            + WEIGHTS['rating'] * rating
+            + WEIGHTS['response_rate'] * response_rate
+            + WEIGHTS['activity'] * math.pow(0.5, days / ACTIVITY_HALF_LIFE_DAYS),
+            6,
+        )
+
+
+def backfill_rank_scores(apps, schema_editor):
+    # Profiles saved before 0016 start at 0 and would sink to the bottom of home and browse
+    # until the first nightly rank_profiles run: score them now, a primary key chunk at a time
+    Profile = apps.get_model('talents', 'Profile')
+    profiles = Profile.objects.select_related('user').order_by('pk')
+    now = timezone.now()
+    last_pk = 0
+    while True:
+        chunk = list(profiles.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+        if not chunk:
+            break
+        score(apps, chunk, now)
+        Profile.objects.bulk_update(chunk, ['completeness', 'rank_score'])
+        last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talents', '0019_job_minhash'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rank_scores, migrations.RunPython.noop),
+    ]
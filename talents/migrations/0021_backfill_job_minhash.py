@@ -0,0 +1,37 @@
+from django.db import migrations
+
+from talents.minhash import band_keys, signature
+
+CHUNK_SIZE = 1000
+
+
+def backfill_minhash(apps, schema_editor):
+    # Jobs posted before 0019 have no signature, so near_duplicates() and post_job's warning
+    # can't find them: sign them and write their bands, a primary key chunk at a time
+    Job = apps.get_model('talents', 'Job')
+    JobBand = apps.get_model('talents', 'JobBand')
+    unsigned = Job.objects.filter(minhash__isnull=True).order_by('pk').only('id', 'title', 'description')
+    last_pk = 0
+    while True:
+        jobs = list(unsigned.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+        if not jobs:
+            break
+        bands = []
+        for job in jobs:
+            job.minhash = signature(job.title, job.description)
+            if job.minhash:
+                bands += [JobBand(job_id=job.id, key=key) for key in band_keys(job.minhash)]
+        Job.objects.bulk_update(jobs, ['minhash'])
+        JobBand.objects.bulk_create(bands)
+        last_pk = jobs[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talents', '0020_backfill_profile_rank_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_minhash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-19 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talents', '0021_backfill_job_minhash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerHeartbeat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('worker', models.CharField(max_length=100, unique=True)),
+                ('queues', models.JSONField(default=list)),
+                ('seen_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,69 @@
+"""MinHash signatures of job postings, for finding near-duplicates without comparing every pair.
+
+A job's title and description become a set of word 3-grams (shingles). The signature keeps,
+for each of NUM_PERM hash functions, the smallest hash of any shingle: the share of equal
+slots between two signatures estimates the Jaccard similarity of their shingle sets.
+
+For lookups, the signature is cut into BANDS bands of ROWS values, each hashed to a key stored
+in JobBand (indexed). Two postings sharing any key are candidates, so finding the near
+duplicates of a job is BANDS index lookups plus a comparison with the few candidates. With
+16 bands of 4 rows, pairs at 0.8 similarity share a band 99.9% of the time, pairs at 0.3 12%.
+"""
+import hashlib
+import random
+import re
+import struct
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed: signatures are stored, so the hash functions must never change
+_rng = random.Random(1)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_WORD = re.compile(r'[a-z0-9]+')
+_PACKING = struct.Struct(f'<{NUM_PERM}I')  # Little-endian whatever the machine
+
+
+def shingles(text):
+    words = _WORD.findall(text.lower())
+    if len(words) <= SHINGLE_WORDS:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def signature(title, description):
+    """The signature as NUM_PERM 32-bit values packed in bytes (256 bytes), or None for a
+    posting without any words."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'little')
+        for shingle in shingles(f"{title} {description}")
+    ]
+    if not hashes:
+        return None
+    return _PACKING.pack(*(min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH for a, b in _PERMUTATIONS))
+
+
+def unpack(sig):
+    return _PACKING.unpack(bytes(sig))
+
+
+def band_keys(sig):
+    """One signed 64-bit key per band (the band number is part of the key, so one indexed
+    column holds all bands)."""
+    raw = bytes(sig)
+    size = ROWS * 4
+    return [
+        int.from_bytes(hashlib.blake2b(bytes([band]) + raw[band * size:(band + 1) * size], digest_size=8).digest(),
+                       'little', signed=True)
+        for band in range(BANDS)
+    ]
+
+
+def similarity(sig1, sig2):
+    """Estimated Jaccard similarity of the two postings, 0..1."""
+    a, b = unpack(sig1), unpack(sig2)
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
@@ -5,8 +5,11 @@ from django.urls import reverse
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import User
 from django.utils import timezone
+from datetime import timedelta
 import uuid
 
+from .minhash import band_keys, signature as minhash_signature, similarity
+
 # 1. Abstract Base Model (Professional Standard)
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -79,6 +82,17 @@ class Profile(TimeStampedModel):
     # --- SOCIAL ---
     follows = models.ManyToManyField('self', related_name='followers', symmetrical=False, blank=True)
 
+    # --- RANKING (kept up to date by talents.ranking and 'manage.py rank_profiles') ---
+    completeness = models.PositiveSmallIntegerField(default=0, editable=False)  # 0-100, see ranking.COMPLETENESS_POINTS
+    rank_score = models.FloatField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # "Top talents" on home and the default order of browse
+            models.Index(fields=['-rank_score'], name='profile_rank_idx'),
+            models.Index(fields=['role', '-rank_score'], name='profile_role_rank_idx'),
+        ]
+
     # Helper method to check if profile is "Complete"
     def is_complete(self):
         # Returns True if essential fields are filled
@@ -182,7 +196,34 @@ class Job(TimeStampedModel):
     
     # Status
     is_active = models.BooleanField(default=True)
+    # Closed by 'manage.py expire_jobs' once past, if nobody was hired (JOB_LIFETIME_DAYS after posting)
+    expires_at = models.DateTimeField(null=True, blank=True)
     applicants = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='applied_jobs', blank=True)
+    # Matches too many freelancers to fan out: feeds pull it at read time (see talents.feed)
+    feed_pull = models.BooleanField(default=False, editable=False)
+    # MinHash of title + description (talents.minhash), its bands are in JobBand
+    minhash = models.BinaryField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='job_feed_pull_idx',
+                         condition=models.Q(feed_pull=True, is_active=True)),
+            # Partial indexes: only the open jobs, however many closed ones pile up.
+            # job_list/home ("newest open jobs") and expire_jobs ("open jobs past expiry")
+            models.Index(fields=['-created_at'], name='job_active_recent_idx', condition=models.Q(is_active=True)),
+            models.Index(fields=['expires_at'], name='job_active_expiry_idx', condition=models.Q(is_active=True)),
+        ]
+
+    @staticmethod
+    def expiry_for(created_at):
+        return created_at + timedelta(days=settings.JOB_LIFETIME_DAYS)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        job = super().from_db(db, field_names, values)
+        # The text the stored minhash was computed from (None when deferred)
+        job._signed_text = (job.__dict__.get('title'), job.__dict__.get('description'))
+        return job
 
     # --- THIS IS THE CRITICAL FIX ---
     def save(self, *args, **kwargs):
@@ -190,7 +231,50 @@ class Job(TimeStampedModel):
             # We add a random UUID to ensure the slug is ALWAYS unique and never empty
             # Example: "python-developer-a1b2c3d4"
             self.slug = f"{slugify(self.title)}-{str(uuid.uuid4())[:8]}"
+        if not self.expires_at:
+            self.expires_at = Job.expiry_for(self.created_at or timezone.now())
+
+        # Re-sign only when the title or description changed (hiring, closing, ... don't)
+        update_fields = kwargs.get('update_fields')
+        changed = False
+        if update_fields is None or {'title', 'description'} & set(update_fields):
+            text = (self.title, self.description)
+            if text != getattr(self, '_signed_text', None) or self.minhash is None:
+                signature = minhash_signature(*text)
+                changed = signature != (bytes(self.minhash) if self.minhash is not None else None)
+                self.minhash = signature
+                self._signed_text = text
+                if changed and update_fields is not None:
+                    kwargs['update_fields'] = {*update_fields, 'minhash'}
         super().save(*args, **kwargs)
+        if changed:
+            self.minhash_bands.all().delete()
+            if signature:
+                JobBand.objects.bulk_create([JobBand(job=self, key=key) for key in band_keys(signature)])
+
+    def near_duplicates(self, jobs=None, threshold=None):
+        """The jobs of `jobs` (all by default) whose text is at least `threshold`
+        (DUPLICATE_JOB_THRESHOLD) similar to this one, most similar first, each with a
+        `similarity` attribute. Works before the job is saved too.
+
+        Only jobs sharing a MinHash band are compared: a few index lookups, whatever the
+        size of the table.
+        """
+        signature = self.minhash or minhash_signature(self.title, self.description)
+        if not signature:
+            return []
+        threshold = threshold or settings.DUPLICATE_JOB_THRESHOLD
+        jobs = (Job.objects.all() if jobs is None else jobs).filter(
+            pk__in=JobBand.objects.filter(key__in=band_keys(signature)).values('job_id')
+        )
+        if self.pk:
+            jobs = jobs.exclude(pk=self.pk)
+        duplicates = []
+        for job in jobs:
+            job.similarity = similarity(signature, job.minhash)
+            if job.similarity >= threshold:
+                duplicates.append(job)
+        return sorted(duplicates, key=lambda job: job.similarity, reverse=True)
 
     def __str__(self):
         return self.title
@@ -286,7 +370,74 @@ class Transaction(TimeStampedModel):
     transaction_type = models.CharField(max_length=20, choices=TRANSACTION_TYPES)
     contract = models.ForeignKey('Contract', on_delete=models.SET_NULL, null=True, blank=True)
     status = models.CharField(max_length=20, default='pending') # pending, success, failed
-    reference = models.CharField(max_length=100, blank=True, null=True) # For Paystack/Flutterwave Ref IDs
+    reference = models.CharField(max_length=100, blank=True, null=True, db_index=True) # For Paystack/Flutterwave Ref IDs
+
+    def __str__(self):
+        return f"{self.user.username} - {self.transaction_type} - ₦{self.amount}"
+
+# 13. BACKGROUND TASKS (see talents/taskqueue.py and 'manage.py run_workers')
+class Task(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('dead', 'Dead'),  # Gave up after max_attempts, kept for inspection and requeueing
+    ]
+    name = models.CharField(max_length=200)  # Dotted path of the @task function
+    queue = models.CharField(max_length=50, default='default')
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Workers poll "queued tasks of my queues that are due, oldest first"
+            models.Index(fields=['status', 'queue', 'run_at'], name='task_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}]"
+
+
+# Last sign of life of each run_workers process (see taskqueue.heartbeat), read by /metrics
+class WorkerHeartbeat(models.Model):
+    worker = models.CharField(max_length=100, unique=True)  # taskqueue.worker_id(): host:pid
+    queues = models.JSONField(default=list)
+    seen_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.worker
+
+
+# Buckets of Job.minhash for the near-duplicate lookups
+class JobBand(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='minhash_bands')
+    key = models.BigIntegerField(db_index=True)  # One per band, see minhash.band_keys
+
+    def __str__(self):
+        return f"{self.job_id}:{self.key}"
+
+
+# 14. JOB FEED (written by talents.feed when a job is posted or edited)
+class FeedEntry(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='feed_entries')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='feed_entries')
+    score = models.FloatField()  # Share of the job's skills the freelancer has
+    posted_at = models.DateTimeField()  # The job's created_at, copied so a feed page is one index range
+
+    class Meta:
+        unique_together = ('user', 'job')
+        indexes = [
+            models.Index(fields=['user', '-posted_at'], name='feed_page_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.transaction_type} - ₦{self.amount}"
\ No newline at end of file
+        return f"{self.job} in {self.user}'s feed"
@@ -0,0 +1,54 @@
+import functools
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+
+# Pages served from the cache carry 'X-Page-Cache: hit'
+HIT_HEADER = 'X-Page-Cache'
+
+
+def cache_key(request):
+    """The host, path and query string; the parameters are sorted so '?a=1&b=2' and
+    '?b=2&a=1' share an entry. Cookies aren't part of the key."""
+    query = urlencode(sorted((key, value) for key in request.GET for value in request.GET.getlist(key)))
+    url = f"{request.get_host()}{request.path}?{query}"
+    return 'pagecache:' + hashlib.md5(url.encode()).hexdigest()
+
+
+def is_anonymous(request):
+    """Only a session cookie can make a page personal (the user, their CSRF-protected forms).
+    Pending flash messages are shown on the next page, so those visitors skip the cache too."""
+    return (settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and CookieStorage.cookie_name not in request.COOKIES)
+
+
+def anonymous_page_cache(view):
+    """Serves the rendered page of a public view from the cache to visitors without a
+    session (GET/HEAD only), for ANONYMOUS_PAGE_CACHE_TIMEOUT seconds.
+
+    Only plain 200 responses are stored: nothing that sets a cookie or renders a CSRF token,
+    which would be handed to every other visitor. Logged-in users always get a fresh render;
+    their navbar bits come from the nav_state endpoint.
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        timeout = settings.ANONYMOUS_PAGE_CACHE_TIMEOUT
+        if not timeout or request.method not in ('GET', 'HEAD') or not is_anonymous(request):
+            return view(request, *args, **kwargs)
+
+        key = cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            response[HIT_HEADER] = 'hit'
+            return response
+
+        response = view(request, *args, **kwargs)
+        if (response.status_code == 200 and not response.streaming and not response.cookies
+                and not request.META.get('CSRF_COOKIE_USED')):
+            cache.set(key, response, timeout)
+            response[HIT_HEADER] = 'miss'
+        return response
+    return wrapper
@@ -0,0 +1,63 @@
+from django.core.paginator import Paginator
+from django.db.models import Avg, Count, F, FloatField, IntegerField, Max, Min, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+
+from .db import Median
+from .models import Profile, Proposal, Review
+
+# ?sort= values of manage_job. 'rating' and 'match' put the unknowns (no reviews, no skills) last
+PROPOSAL_SORTS = {
+    'newest': ('-created_at',),
+    'bid': ('bid_amount', '-created_at'),
+    '-bid': ('-bid_amount', '-created_at'),
+    'days': ('estimated_days', 'bid_amount'),
+    'rating': (F('rating').desc(nulls_last=True), 'bid_amount'),
+    'match': ('-match', 'bid_amount'),
+}
+SORT_CHOICES = [
+    ('newest', 'Newest'), ('bid', 'Lowest bid'), ('-bid', 'Highest bid'), ('days', 'Fastest delivery'),
+    ('rating', 'Rating'), ('match', 'Skill match'),
+]
+PROPOSALS_PER_PAGE = 10
+
+
+def with_pipeline_stats(jobs):
+    """Annotates each job with its proposal counts by status and min/median/max bid. All
+    of it is one GROUP BY over the proposals join, whatever the number of jobs."""
+    return jobs.annotate(
+        proposal_count=Count('proposals'),
+        pending_count=Count('proposals', filter=Q(proposals__status='pending')),
+        accepted_count=Count('proposals', filter=Q(proposals__status='accepted')),
+        rejected_count=Count('proposals', filter=Q(proposals__status='rejected')),
+        min_bid=Min('proposals__bid_amount'),
+        median_bid=Median('proposals__bid_amount'),
+        max_bid=Max('proposals__bid_amount'),
+    )
+
+
+def ranked_proposals(job, sort='newest'):
+    """The proposals of `job` with each freelancer's average rating and match score (share
+    of the job's skills on their profile), ordered by PROPOSAL_SORTS[sort]."""
+    skill_ids = list(job.skills_required.values_list('id', flat=True))
+    rating = (Review.objects.filter(talent__user=OuterRef('freelancer')).order_by()
+              .values('talent').annotate(average=Avg('rating')).values('average'))
+    matched = (Profile.skills.through.objects.filter(profile__user=OuterRef('freelancer'), skill_id__in=skill_ids)
+               .order_by().values('profile').annotate(count=Count('skill_id')).values('count'))
+    return (
+        Proposal.objects.filter(job=job)
+        .select_related('freelancer__profile', 'contract')
+        .annotate(
+            rating=Subquery(rating, output_field=FloatField()),
+            match=Cast(Coalesce(Subquery(matched, output_field=IntegerField()), Value(0)), FloatField())
+            / max(len(skill_ids), 1),
+        )
+        .order_by(*PROPOSAL_SORTS.get(sort, PROPOSAL_SORTS['newest']))
+    )
+
+
+def proposal_page(job, sort, page_number):
+    """A page of ranked_proposals. `job` comes from with_pipeline_stats, so its
+    proposal_count stands in for the paginator's COUNT(*)."""
+    paginator = Paginator(ranked_proposals(job, sort), PROPOSALS_PER_PAGE)
+    paginator.count = job.proposal_count
+    return paginator.get_page(page_number)
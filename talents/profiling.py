@@ -0,0 +1,109 @@
+import contextvars
+import functools
+import os
+import time
+
+from django.conf import settings
+
+# Timings of the request being served by this thread/task, None outside RequestProfilingMiddleware
+current = contextvars.ContextVar('talents_request_timings', default=None)
+
+_installed = False
+
+
+class RequestTimings:
+    """Accumulated time (ms) and call count per phase for one request.
+
+    Phases are exclusive: a query run while a template renders counts as db, not tpl, so
+    the phases always add up to no more than the request total.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.counts = {}
+        # [phase, time spent in nested phases] for each phase being timed right now
+        self._stack = []
+
+    def add(self, phase, ms):
+        self.durations[phase] = self.durations.get(phase, 0.0) + ms
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def server_timing(self, total_ms):
+        """The Server-Timing header value. 'app' is what's left once the measured phases
+        are taken out: view code, middleware and serialisation."""
+        measured = sum(self.durations.values())
+        parts = [f"total;dur={total_ms:.1f}", f"app;dur={max(total_ms - measured, 0):.1f}"]
+        for phase, ms in self.durations.items():
+            unit = 'queries' if phase == 'db' else 'calls'
+            parts.append(f'{phase};dur={ms:.1f};desc="{self.counts[phase]} {unit}"')
+        return ', '.join(parts)
+
+
+def timed(phase, func):
+    """Wraps `func` so its time is added to `phase` of the current request.
+    Nested calls (template includes, a storage call inside a template) count once."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timings = current.get()
+        if timings is None or any(frame[0] == phase for frame in timings._stack):
+            return func(*args, **kwargs)
+        frame = [phase, 0.0]
+        timings._stack.append(frame)
+        began = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = (time.perf_counter() - began) * 1000
+            timings._stack.pop()
+            timings.add(phase, elapsed - frame[1])
+            if timings._stack:
+                timings._stack[-1][1] += elapsed
+    return wrapper
+
+
+def atimed(phase, func):
+    """timed() for coroutine functions, e.g. async HTTP clients."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        timings = current.get()
+        if timings is None:
+            return await func(*args, **kwargs)
+        began = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            timings.add(phase, (time.perf_counter() - began) * 1000)
+    return wrapper
+
+
+def time_query(execute, sql, params, many, context):
+    """DB execute wrapper feeding the 'db' phase."""
+    return timed('db', execute)(sql, params, many, context)
+
+
+def install():
+    """Patches the slow-call boundaries once per process: template rendering, outbound HTTP
+    (requests, used for Paystack) and media URL building (Cloudinary).
+    requests is already loaded by the allauth providers, so importing it here is free."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    from django.db.models.fields.files import FieldFile
+    from django.template.base import Template
+    import requests
+
+    Template.render = timed('tpl', Template.render)
+    requests.Session.send = timed('http', requests.Session.send)
+    # Timed at the field rather than the storage class, so the storage backend (and the
+    # cloudinary SDK) is only loaded once a page actually needs a media URL
+    FieldFile.url = property(timed('media', FieldFile.url.fget))
+
+
+def profile_path(request, total_ms):
+    url_name = request.resolver_match.url_name if request.resolver_match else 'unresolved'
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{url_name}-{total_ms:.0f}ms.prof"
+    directory = getattr(settings, 'PROFILING_DIR', os.path.join(settings.BASE_DIR, 'profiles'))
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, name)
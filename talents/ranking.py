@@ -0,0 +1,162 @@
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, Max
+from django.utils import timezone
+
+from .images import DEFAULT_IMAGE
+from .models import Message, Profile, Proposal, Review
+
+# Points per filled-in part of a profile, out of 100 (shown on the dashboard)
+COMPLETENESS_POINTS = {'bio': 20, 'location': 20, 'profile_pic': 20, 'cover_photo': 10, 'skills': 30}
+# The Profile fields feeding the score: saves with update_fields outside them aren't rescored
+RANKED_FIELDS = {'bio', 'location', 'profile_pic', 'cover_photo', 'is_verified'}
+
+
+def weights():
+    return getattr(settings, 'RANK_WEIGHTS', {
+        'completeness': 0.3, 'verified': 0.15, 'rating': 0.25, 'response_rate': 0.15, 'activity': 0.15,
+    })
+
+
+def completeness(profile, has_skills):
+    filled = {
+        'bio': bool(profile.bio),
+        'location': bool(profile.location),
+        'profile_pic': bool(profile.profile_pic) and profile.profile_pic.name != DEFAULT_IMAGE,
+        'cover_photo': bool(profile.cover_photo),
+        'skills': has_skills,
+    }
+    return sum(points for part, points in COMPLETENESS_POINTS.items() if filled[part])
+
+
+def rating_score(average, count):
+    """Average rating pulled towards RANK_RATING_PRIOR by RANK_RATING_PRIOR_WEIGHT phantom
+    reviews, so one 5-star review doesn't outrank fifty 4.8s. 0..1."""
+    prior = getattr(settings, 'RANK_RATING_PRIOR', 3.0)
+    prior_weight = getattr(settings, 'RANK_RATING_PRIOR_WEIGHT', 3)
+    return ((average or 0) * count + prior * prior_weight) / (count + prior_weight) / 5
+
+
+def activity_score(last_active, now):
+    """1 for someone active today, halving every RANK_ACTIVITY_HALF_LIFE_DAYS."""
+    half_life = getattr(settings, 'RANK_ACTIVITY_HALF_LIFE_DAYS', 30)
+    days = max((now - last_active).total_seconds() / 86400, 0)
+    return math.pow(0.5, days / half_life)
+
+
+def compute(profiles, now=None):
+    """{profile id: (completeness, rank_score)} for `profiles` (with their users loaded).
+
+    A fixed number of aggregate queries per call however many profiles are passed, so
+    'manage.py rank_profiles' scores them a chunk at a time. (Migration 0020 has a frozen
+    copy for its backfill; the nightly run brings old scores up to date with changes here.)
+    """
+    now = now or timezone.now()
+    since = now - timedelta(days=getattr(settings, 'RANK_WINDOW_DAYS', 90))
+    profile_ids = [p.id for p in profiles]
+    user_ids = [p.user_id for p in profiles]
+
+    with_skills = set(
+        Profile.skills.through.objects.filter(profile_id__in=profile_ids).values_list('profile_id', flat=True)
+    )
+    ratings = {
+        row['talent']: (row['average'], row['count'])
+        for row in Review.objects.filter(talent__in=profile_ids).order_by()
+        .values('talent').annotate(average=Avg('rating'), count=Count('id'))
+    }
+
+    # Response rate: of the people who wrote to a user lately, how many got a reply
+    wrote_to = {}
+    for sender, recipient in (Message.objects.filter(recipient__in=user_ids, created_at__gte=since)
+                              .order_by().values_list('sender', 'recipient').distinct()):
+        wrote_to.setdefault(recipient, set()).add(sender)
+    replied_to = {}
+    last_sent = {}
+    for sender, recipient, last in (Message.objects.filter(sender__in=user_ids, created_at__gte=since).order_by()
+                                    .values_list('sender', 'recipient').annotate(last=Max('created_at'))):
+        replied_to.setdefault(sender, set()).add(recipient)
+        last_sent[sender] = max(last, last_sent.get(sender, last))
+    last_proposal = dict(
+        Proposal.objects.filter(freelancer__in=user_ids).order_by()
+        .values_list('freelancer').annotate(last=Max('created_at'))
+    )
+
+    weight = weights()
+    scores = {}
+    for profile in profiles:
+        user = profile.user
+        points = completeness(profile, profile.id in with_skills)
+        senders = wrote_to.get(user.id)
+        # Nobody to answer yet is neither good nor bad
+        response_rate = len(senders & replied_to.get(user.id, set())) / len(senders) if senders else 0.5
+        last_active = max(filter(None, [
+            user.date_joined, user.last_login, profile.updated_at, last_sent.get(user.id), last_proposal.get(user.id),
+        ]))
+        score = (
+            weight['completeness'] * points / 100
+            + weight['verified'] * profile.is_verified
+            + weight['rating'] * rating_score(*ratings.get(profile.id, (None, 0)))
+            + weight['response_rate'] * response_rate
+            + weight['activity'] * activity_score(last_active, now)
+        )
+        scores[profile.id] = (points, round(score, 6))
+    return scores
+
+
+def store(profiles):
+    """Computes and saves the scores of `profiles` with one bulk UPDATE (not save(), so
+    no signals and no updated_at bump)."""
+    scores = compute(profiles)
+    for profile in profiles:
+        profile.completeness, profile.rank_score = scores[profile.id]
+    Profile.objects.bulk_update(profiles, ['completeness', 'rank_score'])
+    return len(profiles)
+
+
+def refresh(profile_ids):
+    return store(list(Profile.objects.filter(id__in=profile_ids).select_related('user')))
+
+
+def schedule(profile_ids):
+    """Queues the rescoring of `profile_ids` (a handful of aggregate queries) for a worker."""
+    from .tasks import refresh_rank_scores  # tasks imports this module
+
+    refresh_rank_scores.delay(list(profile_ids))
+
+
+def store_completeness(profile, has_skills):
+    """Saves the completeness of one profile right away, for the dashboard: one UPDATE, and
+    only when it changed."""
+    points = completeness(profile, has_skills)
+    if points != profile.completeness:
+        Profile.objects.filter(pk=profile.pk).update(completeness=points)
+        profile.completeness = points
+
+
+# Receivers connected in TalentsConfig.ready(). The profile's own fields, its skills and its
+# reviews change the score soon after (through the queue); response rate and activity drift
+# daily and are picked up by the nightly 'manage.py rank_profiles'.
+
+def profile_saved(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not RANKED_FIELDS & set(update_fields)):
+        return
+    store_completeness(instance, not created and instance.skills.exists())
+    schedule([instance.id])
+
+
+def profile_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # skill.profiles.add(...): the task stores their completeness too
+        schedule(pk_set or [])
+        return
+    store_completeness(instance, instance.skills.exists())
+    schedule([instance.id])
+
+
+def review_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule([instance.talent_id])
@@ -0,0 +1,82 @@
+import contextvars
+import functools
+import random
+
+from django.conf import settings
+from django.db import connections
+
+PIN_COOKIE = 'db_primary_pin'
+
+# True while a @replica_reads view runs for a request that isn't pinned to the primary
+_use_replica = contextvars.ContextVar('talents_use_replica', default=False)
+# Set by the router on the first write of a request (see ReplicaPinMiddleware)
+_wrote = contextvars.ContextVar('talents_wrote', default=None)
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def is_pinned(request):
+    """Requests shortly after a write by the same browser read from the primary, so users
+    see their own changes even if the replicas lag behind."""
+    return PIN_COOKIE in request.COOKIES
+
+
+def replica_reads(view):
+    """Lets the ORM reads of a read-only view go to a replica (GET/HEAD only).
+
+    Writes still go to the primary, and once the view writes or opens a transaction the
+    rest of its reads follow it there.
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not replicas() or is_pinned(request):
+            return view(request, *args, **kwargs)
+        token = _use_replica.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+def start_request():
+    """Called by ReplicaPinMiddleware: returns the write tracker for the request."""
+    tracker = {'wrote': False}
+    return tracker, _wrote.set(tracker)
+
+
+def end_request(token):
+    _wrote.reset(token)
+
+
+class ReplicaRouter:
+    """Sends reads to DATABASE_REPLICAS inside @replica_reads views, everything else to
+    'default'."""
+
+    # Sessions decide who the user is; a stale copy would log people out or drop messages
+    PRIMARY_ONLY_APPS = {'sessions'}
+
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get() or model._meta.app_label in self.PRIMARY_ONLY_APPS:
+            return 'default'
+        tracker = _wrote.get()
+        if (tracker and tracker['wrote']) or connections['default'].in_atomic_block:
+            return 'default'
+        return random.choice(replicas())
+
+    def db_for_write(self, model, **hints):
+        tracker = _wrote.get()
+        if tracker is not None:
+            tracker['wrote'] = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Real replicas get their schema through replication; local SQLite copies are
+        # migrated like the primary ('migrate --database replica1')
+        return True
@@ -0,0 +1,85 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+from django.utils.module_loading import import_string
+
+from .images import DEFAULT_IMAGE
+
+
+@deconstructible
+class CachedURLStorage(Storage):
+    """DEFAULT_FILE_STORAGE wrapper that memoizes url() in the cache.
+
+    Files are stored by MEDIA_STORAGE_BACKEND (Cloudinary in production, the local
+    MEDIA_ROOT in tests). Cloudinary builds every URL in Python, and a browse page asks for
+    ten per card (original plus srcset derivatives), so resolved URLs are cached per name
+    for MEDIA_URL_CACHE_TIMEOUT seconds. The default avatar is resolved once per process,
+    without touching the cache or the storage.
+    """
+
+    def __init__(self, backend=None):
+        self.backend_path = backend or settings.MEDIA_STORAGE_BACKEND
+        self.backend = import_string(self.backend_path)()
+        self._default_url = None
+
+    def url_key(self, name):
+        # Hashed: names can be longer than memcached allows, and contain spaces
+        digest = hashlib.md5(f"{self.backend_path}:{name}".encode()).hexdigest()
+        return f"media-url:{digest}"
+
+    def url(self, name):
+        if name == DEFAULT_IMAGE:
+            if self._default_url is None:
+                self._default_url = self.backend.url(name)
+            return self._default_url
+        key = self.url_key(name)
+        url = cache.get(key)
+        if url is None:
+            url = self.backend.url(name)
+            cache.set(key, url, getattr(settings, 'MEDIA_URL_CACHE_TIMEOUT', 60 * 60 * 24))
+        return url
+
+    # Everything else goes straight to the backend. Writes drop the cached URL, since a
+    # replaced file can get a new one (Cloudinary versions).
+
+    def _open(self, name, mode='rb'):
+        return self.backend.open(name, mode)
+
+    def _save(self, name, content):
+        name = self.backend._save(name, content)
+        cache.delete(self.url_key(name))
+        return name
+
+    def delete(self, name):
+        cache.delete(self.url_key(name))
+        return self.backend.delete(name)
+
+    def exists(self, name):
+        return self.backend.exists(name)
+
+    def get_available_name(self, name, max_length=None):
+        return self.backend.get_available_name(name, max_length=max_length)
+
+    def get_valid_name(self, name):
+        return self.backend.get_valid_name(name)
+
+    def listdir(self, path):
+        return self.backend.listdir(path)
+
+    def size(self, name):
+        return self.backend.size(name)
+
+    def path(self, name):
+        return self.backend.path(name)
+
+    def get_accessed_time(self, name):
+        return self.backend.get_accessed_time(name)
+
+    def get_created_time(self, name):
+        return self.backend.get_created_time(name)
+
+    def get_modified_time(self, name):
+        return self.backend.get_modified_time(name)
@@ -0,0 +1,165 @@
+import functools
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('talents.tasks')
+
+
+def task(func=None, *, queue='default', max_attempts=3, retry_delay=30):
+    """Makes a module level function runnable by 'manage.py run_workers'.
+
+        @task(queue='emails', max_attempts=5)
+        def send_email(...): ...
+
+        send_email.delay(subject, ...)                      # as soon as a worker is free
+        send_email.enqueue(args=[...], countdown=3600)      # in an hour
+        send_email(subject, ...)                            # still a plain call
+
+    Arguments are stored as JSON, so pass ids rather than model instances. A failing task
+    runs up to max_attempts times, waiting retry_delay * 2**attempt seconds in between,
+    then is left in the 'dead' state.
+    """
+    def decorate(func):
+        func.task_name = f"{func.__module__}.{func.__qualname__}"
+        func.queue = queue
+        func.max_attempts = max_attempts
+        func.retry_delay = retry_delay
+
+        @functools.wraps(func)
+        def delay(*args, **kwargs):
+            return enqueue(func, args, kwargs)
+
+        def enqueue_with(args=(), kwargs=None, run_at=None, countdown=None):
+            if countdown is not None:
+                run_at = timezone.now() + timedelta(seconds=countdown)
+            return enqueue(func, args, kwargs or {}, run_at=run_at)
+
+        func.delay = delay
+        func.enqueue = enqueue_with
+        return func
+
+    return decorate(func) if func else decorate
+
+
+def enqueue(func, args, kwargs, run_at=None):
+    """Stores the call as a Task row. Inside a transaction the task only becomes visible to
+    workers when (and if) it commits. With TASKS_EAGER (handy in tests) it runs inline."""
+    from .models import Task
+
+    if getattr(settings, 'TASKS_EAGER', False):
+        func(*args, **kwargs)
+        return None
+    return Task.objects.create(
+        name=func.task_name, queue=func.queue, args=list(args), kwargs=kwargs,
+        run_at=run_at or timezone.now(), max_attempts=func.max_attempts,
+    )
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(worker, queues, batch=1):
+    """Marks up to `batch` due tasks as running for `worker` and returns them.
+
+    PostgreSQL (and anything with SKIP LOCKED) lets concurrent workers skip each other's
+    rows. SQLite has no row locks, so each task is claimed with a conditional UPDATE: the
+    row itself is the lock, and only the worker whose UPDATE flips it from 'queued' wins.
+    """
+    from .models import Task
+
+    now = timezone.now()
+    due = Task.objects.filter(status='queued', queue__in=queues, run_at__lte=now).order_by('run_at')
+    running = {'status': 'running', 'locked_by': worker, 'locked_at': now, 'attempts': F('attempts') + 1}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:batch])
+            Task.objects.filter(id__in=ids).update(**running)
+    else:
+        ids = []
+        for task_id in due.values_list('id', flat=True)[:batch * 4]:
+            if Task.objects.filter(id=task_id, status='queued').update(**running):
+                ids.append(task_id)
+                if len(ids) >= batch:
+                    break
+    return list(Task.objects.filter(id__in=ids).order_by('run_at'))
+
+
+def execute(task, worker):
+    """Runs one claimed task and records the outcome. Returns True on success."""
+    from .models import Task
+
+    mine = Task.objects.filter(id=task.id, locked_by=worker, status='running')
+    func = None
+    try:
+        func = import_string(task.name)
+        func(*task.args, **task.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if task.attempts >= task.max_attempts:
+            logger.error('Task %s #%s is dead after %s attempts:\n%s', task.name, task.id, task.attempts, error)
+            mine.update(status='dead', last_error=error, finished_at=timezone.now(), locked_by='')
+        else:
+            delay = getattr(func, 'retry_delay', 30) * 2 ** (task.attempts - 1)
+            logger.warning('Task %s #%s failed (attempt %s), retrying in %ss', task.name, task.id, task.attempts, delay)
+            mine.update(status='queued', last_error=error, locked_by='',
+                        run_at=timezone.now() + timedelta(seconds=delay))
+        return False
+
+    if getattr(settings, 'TASKS_KEEP_DONE', False):
+        mine.update(status='done', finished_at=timezone.now(), locked_by='')
+    else:
+        mine.delete()
+    return True
+
+
+def requeue_stale(timeout=None):
+    """Puts tasks back in the queue whose worker died mid-run (locked for longer than
+    TASKS_LOCK_TIMEOUT seconds). Returns how many."""
+    from .models import Task
+
+    timeout = timeout or getattr(settings, 'TASKS_LOCK_TIMEOUT', 15 * 60)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return Task.objects.filter(status='running', locked_at__lt=cutoff).update(status='queued', locked_by='')
+
+
+def heartbeat(worker, queues):
+    """Records that `worker` is alive and serving `queues` (every TASKS_HEARTBEAT seconds)."""
+    from .models import WorkerHeartbeat
+
+    # Not update_or_create: its select_for_update transaction makes concurrent workers
+    # trip over SQLite's lock upgrade. Each worker only ever writes its own row.
+    now = timezone.now()
+    if not WorkerHeartbeat.objects.filter(worker=worker).update(queues=list(queues), seen_at=now):
+        WorkerHeartbeat.objects.create(worker=worker, queues=list(queues), seen_at=now)
+
+
+def live_workers():
+    """The heartbeats of the workers seen in the last 3 TASKS_HEARTBEAT periods; older
+    ones (workers killed without a clean exit) are deleted."""
+    from .models import WorkerHeartbeat
+
+    cutoff = timezone.now() - timedelta(seconds=3 * getattr(settings, 'TASKS_HEARTBEAT', 30))
+    WorkerHeartbeat.objects.filter(seen_at__lt=cutoff).delete()
+    return WorkerHeartbeat.objects.all()
+
+
+def run_pending(queues=('default',), worker='inline'):
+    """Runs every due task of `queues` in this process. Used by tests and 'run_workers --once'."""
+    done = 0
+    while True:
+        tasks = claim(worker, queues, batch=10)
+        if not tasks:
+            return done
+        for task in tasks:
+            done += execute(task, worker)
@@ -0,0 +1,48 @@
+from django.core.mail import send_mail
+
+from . import feed, images, paystack, ranking
+from .models import Job, Notification, Transaction
+from .taskqueue import task
+
+
+@task(queue='emails', max_attempts=5, retry_delay=60)
+def send_email(subject, message, recipient_list, from_email=None):
+    # SMTP (Gmail) round trips take seconds; raising lets the queue retry later
+    send_mail(subject, message, from_email, recipient_list)
+
+
+@task
+def create_notification(user_id, message):
+    Notification.objects.create(user_id=user_id, message=message)
+
+
+@task(queue='images', retry_delay=60)
+def build_image_derivatives(name):
+    """Writes the resized copies of an uploaded profile or cover photo (Pillow work is
+    CPU bound, so it stays out of the web workers)."""
+    images.generate_derivatives(name, force=True)
+
+
+@task
+def refresh_rank_scores(profile_ids):
+    """Rescores profiles after a change to their fields, skills or reviews."""
+    ranking.refresh(profile_ids)
+
+
+@task(queue='feeds', retry_delay=60)
+def fan_out_job(job_id):
+    """Writes a posted or edited job into the feeds of the matching freelancers."""
+    job = Job.objects.filter(id=job_id).first()
+    if job is not None:
+        feed.fan_out(job)
+
+
+@task(queue='payments', max_attempts=5, retry_delay=30)
+def verify_paystack_payment(transaction_id):
+    """Confirms a pending deposit with Paystack and notifies the user of the result.
+    Network errors raise, so the queue retries with backoff."""
+    transaction = Transaction.objects.get(id=transaction_id)
+    if transaction.status != 'pending':
+        # Already settled (e.g. by the callback view)
+        return
+    paystack.verify(transaction)
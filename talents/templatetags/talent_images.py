@@ -0,0 +1,24 @@
+from django import template
+from django.utils.html import format_html
+
+from talents import images
+
+register = template.Library()
+
+
+@register.simple_tag
+def srcset(image, display_px, fmt=None):
+    """Renders src/srcset/sizes attributes for an <img> (or a <picture> <source>).
+
+    Usage: <img {% srcset profile.profile_pic 48 %} class="avatar">
+
+    `display_px` is the CSS width the image is shown at; the browser picks the
+    smallest derivative that covers it at the device pixel ratio. Falls back to the
+    original file until the derivatives have been generated.
+    """
+    if not image:
+        return ''
+    candidates = images.srcset_candidates(image, fmt or images.formats()[0])
+    if not candidates:
+        return format_html('src="{}"', image.url)
+    return format_html('src="{}" srcset="{}" sizes="{}px"', image.url, candidates, display_px)
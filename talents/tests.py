@@ -1,3 +1,938 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve, reverse
+
+from talents import urls
+from talents import minhash, routers, taskqueue
+from talents.middleware import QueryBudgetExceeded, fingerprint
+from talents.management.commands.bench_async_verify import SlowGateway
+from talents.models import ContactMessage, Job, Notification, Subscriber, Task, Transaction, WorkerHeartbeat
+from talents.storage import CachedURLStorage
+from talents.tasks import create_notification
+
+
+class ExtractCssTests(SimpleTestCase):
+    def test_rerunning_appends_to_the_bundle_and_reuses_the_block(self):
+        base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_dir)
+        page = os.path.join(base_dir, 'talents', 'templates', 'talents', 'page.html')
+        os.makedirs(os.path.dirname(page))
+        with open(page, 'w') as f:
+            f.write("{% extends 'talents/base.html' %}\n<style>.a { color: red; }</style>\n{% block content %}{% endblock %}\n")
+
+        with override_settings(BASE_DIR=base_dir):
+            call_command('extract_css', stdout=io.StringIO())
+            with open(page) as f:
+                source = f.read()
+            with open(page, 'w') as f:
+                f.write(source.replace('{% block content %}', '<style>.b { color: blue; }</style>\n{% block content %}'))
+            call_command('extract_css', stdout=io.StringIO())
+
+        with open(page) as f:
+            source = f.read()
+        self.assertEqual(source.count('{% block extra_css %}'), 1)
+        self.assertNotIn('<style>', source)
+        with open(os.path.join(base_dir, 'talents', 'static', 'talents', 'css', 'talents', 'page.css')) as f:
+            self.assertEqual(f.read(), '.a { color: red; }\n.b { color: blue; }\n')
+
+
+@override_settings(IMAGE_DERIVATIVE_WIDTHS=(48, 96, 192), IMAGE_DERIVATIVE_FORMATS=('webp',))
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import FileSystemStorage
+        from PIL import Image
+
+        cache.clear()
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.storage = FileSystemStorage(location=location, base_url='/media/')
+        buffer = io.BytesIO()
+        Image.new('RGB', (150, 100), 'red').save(buffer, format='PNG')
+        self.image = mock.Mock(storage=self.storage)
+        self.image.name = self.storage.save('profile_pics/small.png', ContentFile(buffer.getvalue()))
+
+    def test_srcset_lists_the_real_widths(self):
+        from talents import images
+
+        self.assertEqual(images.srcset_candidates(self.image, 'webp'), '')
+        self.assertEqual(images.generate_derivatives(self.image.name, self.storage), 3)
+        # The 192w copy of a 150px original is 150px wide
+        self.assertEqual(images.srcset_candidates(self.image, 'webp'), (
+            '/media/profile_pics/derived/small_48w.webp 48w, /media/profile_pics/derived/small_96w.webp 96w, '
+            '/media/profile_pics/derived/small_192w.webp 150w'
+        ))
+
+        # Cache lost: the width is read back from the largest file
+        from django.core.cache import cache
+        cache.clear()
+        self.assertEqual(images.derived_width(self.image.name, self.storage), 150)
+
+    def test_uploads_are_resized_by_the_task_queue(self):
+        from talents import images
+
+        images.schedule_derivatives(self.image.name)
+        self.assertEqual(list(Task.objects.values_list('name', 'queue')),
+                         [('talents.tasks.build_image_derivatives', 'images')])
+
+
+class FaceServer(ThreadingHTTPServer):
+    """Serves /<username>.jpg: the same bytes for every user, 404 for the names in `missing`."""
+
+    def __init__(self):
+        from http.server import BaseHTTPRequestHandler
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.strip('/').split('.')[0] in server.missing:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Length', '4')
+                self.end_headers()
+                self.wfile.write(b'face')
+
+            def log_message(self, *args):
+                pass
+
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.missing = set()
+
+
+class FetchRealFacesTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from talents.models import Profile
+
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        overridden = override_settings(MEDIA_ROOT=media)
+        overridden.enable()
+        self.addCleanup(overridden.disable)
+        self.checkpoint = os.path.join(media, 'checkpoint.json')
+
+        self.server = FaceServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        for name in ('ada', 'bola', 'chidi'):
+            Profile.objects.create(user=User.objects.create_user(name), location='Lagos')
+
+    def fetch(self):
+        call_command('fetch_real_faces', source_url=f"http://127.0.0.1:{self.server.server_address[1]}/{{username}}.jpg",
+                     checkpoint=self.checkpoint, batch_size=2, workers=2, stdout=io.StringIO())
+        from talents.models import Profile
+        return dict(Profile.objects.values_list('user__username', 'profile_pic'))
+
+    def test_failures_are_retried_on_the_next_run(self):
+        self.server.missing = {'bola'}
+        pics = self.fetch()
+        self.assertEqual(pics['ada'], pics['chidi'])  # Same bytes, stored once
+        self.assertTrue(pics['ada'].startswith('profile_pics/faces/'))
+        self.assertNotEqual(pics['bola'], pics['ada'])
+        with open(self.checkpoint) as f:
+            self.assertEqual(len(json.load(f)['failed']), 1)
+
+        self.server.missing = set()
+        pics = self.fetch()
+        self.assertEqual(len(set(pics.values())), 1)
+        self.assertEqual(len(os.listdir(os.path.join(settings.MEDIA_ROOT, 'profile_pics', 'faces'))), 1)
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f)['failed'], [])
+
+
+class AssignImagesTests(TestCase):
+    def test_pictures_are_assigned_in_batches_and_rescored(self):
+        from django.contrib.auth.models import User
+        from talents.models import Profile
+
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        os.makedirs(os.path.join(media, 'profile_pics'))
+        for name in ('a.jpg', 'b.png', 'notes.txt'):
+            open(os.path.join(media, 'profile_pics', name), 'w').close()
+        for i in range(5):
+            Profile.objects.create(user=User.objects.create_user(f'user{i}'), location='Lagos')
+        admin = Profile.objects.create(user=User.objects.create_superuser('admin'), location='Lagos')
+
+        out = io.StringIO()
+        with override_settings(MEDIA_ROOT=media):
+            call_command('assign_local_images', batch_size=2, stdout=out)
+        self.assertEqual(out.getvalue().count('Successfully updated 5 profiles'), 1)
+
+        pics = Profile.objects.exclude(id=admin.id).values_list('profile_pic', 'completeness')
+        self.assertEqual({pic for pic, _ in pics}, {'profile_pics/a.jpg', 'profile_pics/b.png'})
+        self.assertEqual({completeness for _, completeness in pics}, {40})  # Location + picture
+        admin.refresh_from_db()
+        self.assertEqual(admin.completeness, 20)
+
+
+class SeedScaleTests(TestCase):
+    def test_seeded_data_is_scored_signed_and_fanned_out(self):
+        from django.contrib.auth.models import User
+        from talents.models import FeedEntry, JobBand, Profile
+
+        with mock.patch('talents.management.commands.seed_scale.FEED_DAYS', 365), \
+                override_settings(FEED_FANOUT_LIMIT=2):
+            call_command('seed_scale', size='tiny', stdout=io.StringIO())
+        self.assertEqual(Profile.objects.count(), 60)
+        self.assertFalse(Profile.objects.filter(completeness=0).exists())
+        self.assertFalse(Profile.objects.filter(rank_score=0).exists())
+        self.assertFalse(Job.objects.filter(minhash__isnull=True).exists())
+        self.assertEqual(JobBand.objects.count(), 16 * Job.objects.count())
+
+        # Same entries, scores and pulled jobs as the fan-out the workers run
+        seeded = set(FeedEntry.objects.values_list('user', 'job', 'score', 'posted_at'))
+        pulled = set(Job.objects.filter(feed_pull=True).values_list('id', flat=True))
+        self.assertTrue(seeded)
+        self.assertTrue(pulled)
+        with override_settings(FEED_FANOUT_LIMIT=2):
+            call_command('fan_out_jobs', days=365, stdout=io.StringIO())
+        self.assertEqual(set(FeedEntry.objects.values_list('user', 'job', 'score', 'posted_at')), seeded)
+        self.assertEqual(set(Job.objects.filter(feed_pull=True).values_list('id', flat=True)), pulled)
+
+        # The app's own inserts come after the seeded ids
+        self.assertGreater(User.objects.create_user('after-seed').id, User.objects.exclude(username='after-seed')
+                           .order_by('-id').values_list('id', flat=True)[0])
+
+
+class FingerprintTests(TestCase):
+    def test_literals_and_in_lists_are_folded(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND "name" = \'bob\' LIMIT 21'),
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s) AND "name" = \'alice\' LIMIT 5'),
+        )
+
+    def test_different_tables_differ(self):
+        self.assertNotEqual(fingerprint('SELECT * FROM "a" WHERE "id" = %s'),
+                            fingerprint('SELECT * FROM "b" WHERE "id" = %s'))
+
+
+@override_settings(
+    DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage',
+    MEDIA_ROOT=settings.BASE_DIR / 'media',
+)
+class QueryBudgetTests(TestCase):
+    """Renders every talents page on seeded data; QueryBudgetMiddleware raises on a page
+    over its QUERY_BUDGETS entry or running an N+1."""
+
+    @classmethod
+    def setUpTestData(cls):
+        from allauth.socialaccount.models import SocialApp
+        from django.contrib.sites.models import Site
+        from talents.management.commands.bench_endpoints import endpoint_kwargs
+
+        call_command('seed_scale', size='tiny', seed=1, stdout=io.StringIO())
+        for provider in ('google', 'github'):
+            SocialApp.objects.create(provider=provider, name=provider, client_id='test', secret='test').sites.add(
+                Site.objects.get_current())
+        cls.user, cls.kwargs = endpoint_kwargs()
+
+    def test_pages_stay_within_budget(self):
+        self.client.force_login(self.user)
+        for pattern in urls.urlpatterns:
+            # logout ends the session
+            if pattern.name == 'logout':
+                continue
+            with self.subTest(url=pattern.name):
+                self.client.get(reverse(pattern.name, kwargs=self.kwargs.get(pattern.name)))
+
+    def test_admin_changelists_have_no_n_plus_one(self):
+        from django.contrib import admin
+        from django.contrib.auth.models import User
+
+        admin_user = User.objects.create_superuser('admin-test', 'admin@example.com', 'x')
+        self.client.force_login(admin_user)
+        for model in admin.site._registry:
+            if model._meta.app_label != 'talents':
+                continue
+            with self.subTest(model=model.__name__):
+                url = reverse(f'admin:talents_{model._meta.model_name}_changelist')
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_chunked_update_covers_every_row(self):
+        from talents.admin import chunked_update
+        from talents.models import Profile
+
+        Profile.objects.update(is_verified=False)
+        count = chunked_update(Profile.objects.all(), chunk_size=2, is_verified=True)
+        self.assertEqual(count, Profile.objects.count())
+        self.assertFalse(Profile.objects.filter(is_verified=False).exists())
+
+    @override_settings(QUERY_BUDGETS={'about': 0})
+    def test_over_budget_raises(self):
+        self.client.force_login(self.user)
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'budget is 0'):
+            self.client.get(reverse('about'))
+
+    @override_settings(QUERY_N_PLUS_ONE_THRESHOLD=2)
+    def test_repeated_queries_report_template_line(self):
+        # The login page looks up each social app (Google, GitHub) separately
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'N+1 at talents/login.html:'):
+            self.client.get(reverse('login'))
+
+
+class NotificationsPageTests(TestCase):
+    def test_older_notifications_are_paged(self):
+        from datetime import timedelta
+        from django.contrib.auth.models import User
+        from django.utils import timezone
+        from talents.views.notifications import NOTIFICATIONS_PER_PAGE
+
+        user = User.objects.create_user('reader')
+        now = timezone.now()
+        for minutes in range(NOTIFICATIONS_PER_PAGE + 5):
+            notification = Notification.objects.create(user=user, message=f'Note {minutes}')
+            Notification.objects.filter(pk=notification.pk).update(created_at=now - timedelta(minutes=minutes))
+        self.client.force_login(user)
+
+        response = self.client.get(reverse('notifications'))
+        self.assertEqual(len(response.context['notifications']), NOTIFICATIONS_PER_PAGE)
+        self.assertContains(response, 'View Older Notifications')
+
+        response = self.client.get(reverse('notifications'), {'before': response.context['next_before']})
+        self.assertEqual([n.message for n in response.context['notifications']],
+                         [f'Note {minutes}' for minutes in range(NOTIFICATIONS_PER_PAGE, NOTIFICATIONS_PER_PAGE + 5)])
+        self.assertIsNone(response.context['next_before'])
+        self.assertNotContains(response, 'View Older Notifications')
+
+
+@override_settings(SERVER_TIMING_PUBLIC=False)
+class ServerTimingTests(TestCase):
+    def test_timings_are_only_shown_to_staff_and_token_holders(self):
+        from django.contrib.auth.models import User
+        from talents.middleware import profile_token
+
+        self.assertNotIn('Server-Timing', self.client.get(reverse('about')))
+        with override_settings(SERVER_TIMING_PUBLIC=True):
+            self.assertIn('total;dur=', self.client.get(reverse('about'))['Server-Timing'])
+
+        profiles = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, profiles)
+        with override_settings(PROFILING_DIR=profiles):
+            response = self.client.get(reverse('about'), HTTP_X_PROFILE_TOKEN=profile_token())
+            self.assertIn('Server-Timing', response)
+            self.assertEqual(len(os.listdir(profiles)), 1)  # Run under cProfile
+            self.assertNotIn('Server-Timing', self.client.get(reverse('about'), HTTP_X_PROFILE_TOKEN='forged'))
+        self.assertEqual(len(os.listdir(profiles)), 1)
+
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        self.assertIn('db;dur=', self.client.get(reverse('about'))['Server-Timing'])
+
+    @override_settings(SERVER_TIMING_PUBLIC=True)
+    async def test_async_requests_are_timed(self):
+        # The ORM runs in a sync_to_async thread, not on the event loop the middleware runs on
+        response = await self.async_client.get(reverse('browse'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+
+class MetricsEndpointTests(TestCase):
+    def test_metrics_need_the_token(self):
+        with override_settings(METRICS_TOKEN='', DEBUG=False):
+            self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+        with override_settings(METRICS_TOKEN='s3cret'):
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer nope').status_code, 403)
+
+            create_notification.delay(1, 'Hi')
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+            self.assertContains(response, 'talents_task_queue_depth{queue="default",status="queued"} 1.0')
+
+            # Drained queues disappear instead of keeping their last depth
+            Task.objects.all().delete()
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+            self.assertNotContains(response, 'talents_task_queue_depth{')
+            self.assertContains(response, 'talents_requests_total')
+
+    def test_workers_counted_from_heartbeats(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        taskqueue.heartbeat('web-1:10', ['default', 'emails'])
+        taskqueue.heartbeat('web-1:11', ['default'])
+        # Killed without a clean exit: its heartbeat has gone stale
+        WorkerHeartbeat.objects.create(worker='web-2:12', queues=['default'],
+                                       seen_at=timezone.now() - timedelta(hours=1))
+
+        with override_settings(METRICS_TOKEN='s3cret'):
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertContains(response, 'talents_background_workers{queue="default"} 2.0')
+        self.assertContains(response, 'talents_background_workers{queue="emails"} 1.0')
+        self.assertFalse(WorkerHeartbeat.objects.filter(worker='web-2:12').exists())
+
+
+class ImportTimeTests(TestCase):
+    """Cold start budget: every web worker and management command pays for what
+    `manage.py check` imports. Heavy SDKs must be imported inside the code that uses them,
+    and the view areas by their first request (see talents/urls.py)."""
+
+    # About 4x the ~500ms measured today: loose enough for a slow CI machine, tight enough
+    # to catch an SDK imported at startup again
+    BUDGET_MS = 2000
+    # PIL isn't listed: the ImageField system check imports it
+    LAZY_MODULES = {'cloudinary', 'prometheus_client', 'faker'}
+    # core/urls.py routes /metrics itself
+    EAGER_VIEWS = {'talents.views', 'talents.views.ops'}
+
+    def test_manage_check_imports(self):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', 'manage.py', 'check'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+        total_us = 0
+        imported = set()
+        for line in result.stderr.splitlines():
+            match = re.match(r'import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)', line)
+            if not match:
+                continue
+            cumulative, indent, module = match.groups()
+            imported.add(module)
+            if len(indent) == 1:  # top level imports; nested ones are included in these
+                total_us += int(cumulative)
+
+        self.assertEqual({module.split('.')[0] for module in imported} & self.LAZY_MODULES, set(),
+                         'imported at startup, move the import into the function using it')
+        self.assertEqual({module for module in imported if module.startswith('talents.views')},
+                         self.EAGER_VIEWS, 'talents/urls.py must route the views with lazy()')
+        self.assertLess(total_us / 1000, self.BUDGET_MS)
+
+    def test_lazy_views_resolve(self):
+        match = resolve('/payment/verify/abc/')
+        self.assertEqual(match.func.__module__, 'talents.views.payments')
+        self.assertTrue(asyncio.iscoroutinefunction(match.func))
+        self.assertEqual(self.client.get('/about/').status_code, 200)
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = routers.ReplicaRouter()
+
+    def route(self, request, write_first=False):
+        @routers.replica_reads
+        def view(request):
+            if write_first:
+                self.router.db_for_write(Job)
+            return self.router.db_for_read(Job)
+
+        tracker, token = routers.start_request()
+        try:
+            return view(request), tracker['wrote']
+        finally:
+            routers.end_request(token)
+
+    def test_reads_in_decorated_views_use_a_replica(self):
+        self.assertEqual(self.route(RequestFactory().get('/')), ('replica1', False))
+        # Outside a decorated view everything stays on the primary
+        self.assertEqual(self.router.db_for_read(Job), 'default')
+
+    def test_writes_pin_the_request_and_browser_to_primary(self):
+        self.assertEqual(self.route(RequestFactory().get('/'), write_first=True), ('default', True))
+        pinned = RequestFactory().get('/')
+        pinned.COOKIES[routers.PIN_COOKIE] = '1'
+        self.assertEqual(self.route(pinned)[0], 'default')
+
+    def test_unsafe_methods_use_primary(self):
+        self.assertEqual(self.route(RequestFactory().post('/'))[0], 'default')
+
+
+@taskqueue.task(max_attempts=2, retry_delay=0)
+def always_fails():
+    raise RuntimeError('boom')
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        self.user = User.objects.create_user('worker-test')
+
+    def test_enqueued_task_runs_and_is_removed(self):
+        create_notification.delay(self.user.id, 'Hello')
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 0)
+        self.assertEqual(taskqueue.run_pending(), 1)
+        self.assertTrue(Notification.objects.filter(user=self.user, message='Hello').exists())
+        self.assertFalse(Task.objects.exists())
+
+    def test_failing_task_is_retried_then_dead_lettered(self):
+        always_fails.delay()
+        taskqueue.run_pending()
+        task = Task.objects.get()
+        self.assertEqual((task.status, task.attempts), ('dead', 2))
+        self.assertIn('RuntimeError: boom', task.last_error)
+
+    def test_scheduled_task_waits_until_due(self):
+        create_notification.enqueue(args=[self.user.id, 'Later'], countdown=3600)
+        self.assertEqual(taskqueue.run_pending(), 0)
+        self.assertEqual(Task.objects.get().status, 'queued')
+
+
+class DebuggingSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept mail, one connection per handle() call."""
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.wfile.write(b'220 localhost debugging server\r\n')
+        while line := self.rfile.readline():
+            command = line[:4].upper()
+            if command == b'DATA':
+                self.wfile.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+                data = b''.join(iter(self.rfile.readline, b'.\r\n'))
+                if server.fail_after is not None and len(server.messages) >= server.fail_after:
+                    self.wfile.write(b'451 Try again later\r\n')
+                    continue
+                server.messages.append(data)
+                self.wfile.write(b'250 OK\r\n')
+            elif command == b'QUIT':
+                self.wfile.write(b'221 Bye\r\n')
+                return
+            else:
+                self.wfile.write(b'250 OK\r\n')
+
+
+class NewsletterTests(TestCase):
+    def setUp(self):
+        self.smtp = socketserver.ThreadingTCPServer(('127.0.0.1', 0), DebuggingSMTPHandler)
+        self.smtp.daemon_threads = True
+        self.smtp.connections, self.smtp.messages, self.smtp.fail_after = 0, [], None
+        threading.Thread(target=self.smtp.serve_forever, daemon=True).start()
+        self.addCleanup(self.smtp.server_close)
+        self.addCleanup(self.smtp.shutdown)
+
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.body = os.path.join(tmp, 'body.txt')
+        with open(self.body, 'w') as f:
+            f.write('News of the week')
+        self.checkpoint = os.path.join(tmp, 'checkpoint.json')
+        Subscriber.objects.bulk_create(Subscriber(email=f'reader{i}@example.com') for i in range(7))
+
+    def send(self):
+        call_command('send_newsletter', 'Weekly', self.body, batch_size=3, rate=0, checkpoint=self.checkpoint,
+                     smtp_host='127.0.0.1', smtp_port=self.smtp.server_address[1], stdout=io.StringIO())
+
+    def test_one_connection_per_batch(self):
+        self.send()
+        self.assertEqual(len(self.smtp.messages), 7)
+        self.assertEqual(self.smtp.connections, 3)
+
+    def test_resumes_after_a_failure(self):
+        self.smtp.fail_after = 4
+        with self.assertRaises(CommandError):
+            self.send()
+        self.smtp.fail_after = None
+        self.send()
+        recipients = [re.search(rb'^To: (.+)$', m, re.M).group(1) for m in self.smtp.messages]
+        self.assertEqual(len(recipients), 7)
+        self.assertEqual(len(set(recipients)), 7)
+
+
+class VerifyPaymentTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        self.user = User.objects.create_user('payer')
+        self.client.force_login(self.user)
+        self.transaction = Transaction.objects.create(
+            user=self.user, amount=500, transaction_type='deposit', status='pending', reference='ref-1')
+
+    def test_settles_against_the_gateway(self):
+        SlowGateway.delay = 0
+        gateway = ThreadingHTTPServer(('127.0.0.1', 0), SlowGateway)
+        threading.Thread(target=gateway.serve_forever, daemon=True).start()
+        self.addCleanup(gateway.server_close)
+        self.addCleanup(gateway.shutdown)
+
+        with override_settings(PAYSTACK_API_URL=f"http://127.0.0.1:{gateway.server_address[1]}"):
+            response = self.client.get(reverse('verify_payment', args=['ref-1']))
+        self.assertRedirects(response, reverse('wallet'), fetch_redirect_response=False)
+        self.transaction.refresh_from_db()
+        self.assertEqual(self.transaction.status, 'success')
+        self.assertTrue(Notification.objects.filter(user=self.user, message__startswith='Payment Verified').exists())
+
+    def test_late_verdict_reports_the_stored_status(self):
+        from talents import paystack
+
+        Transaction.objects.filter(pk=self.transaction.pk).update(status='failed')
+        paid = paystack.settle(self.transaction, {'status': True, 'data': {'status': 'success'}})
+        self.assertFalse(paid)
+        self.assertEqual(self.transaction.status, 'failed')
+        self.assertFalse(Notification.objects.exists())
+
+    @override_settings(PAYSTACK_API_URL='http://127.0.0.1:9')
+    def test_unreachable_gateway_falls_back_to_the_queue(self):
+        self.client.get(reverse('verify_payment', args=['ref-1']))
+        self.assertEqual(Task.objects.get().name, 'talents.tasks.verify_paystack_payment')
+        self.transaction.refresh_from_db()
+        self.assertEqual(self.transaction.status, 'pending')
+
+
+class CachedURLStorageTests(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.storage = CachedURLStorage('django.core.files.storage.FileSystemStorage')
+
+    def test_urls_are_resolved_once(self):
+        with mock.patch.object(self.storage.backend, 'url', return_value='/media/a.jpg') as url:
+            self.assertEqual(self.storage.url('a.jpg'), '/media/a.jpg')
+            self.assertEqual(self.storage.url('a.jpg'), '/media/a.jpg')
+        self.assertEqual(url.call_count, 1)
+
+    def test_default_avatar_skips_the_cache(self):
+        with mock.patch('talents.storage.cache') as cache:
+            self.storage.url('default.jpg')
+            self.storage.url('default.jpg')
+        self.assertFalse(cache.get.called)
+
+    def test_delete_forgets_the_url(self):
+        with mock.patch.object(self.storage.backend, 'url', side_effect=['/media/v1.jpg', '/media/v2.jpg']), \
+                mock.patch.object(self.storage.backend, 'delete'):
+            self.storage.url('a.jpg')
+            self.storage.delete('a.jpg')
+            self.assertEqual(self.storage.url('a.jpg'), '/media/v2.jpg')
+
+
+class RetentionTests(TestCase):
+    def test_expired_rows_are_deleted_or_archived(self):
+        from datetime import timedelta
+        from django.contrib.auth.models import User
+        from django.utils import timezone
+
+        user = User.objects.create_user('retention')
+        long_ago = timezone.now() - timedelta(days=400)
+        for is_read in (True, False):
+            Notification.objects.create(user=user, message='old', is_read=is_read)
+        Notification.objects.update(created_at=long_ago)
+        Notification.objects.create(user=user, message='new', is_read=True)
+        ContactMessage.objects.create(name='Ada', email='ada@example.com', subject='Hi', message='Old news')
+        ContactMessage.objects.update(created_at=long_ago)
+
+        archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_dir)
+        with override_settings(RETENTION_ARCHIVE_DIR=archive_dir):
+            call_command('apply_retention', chunk_size=1, pause=0, stdout=io.StringIO())
+
+        # Unread and recent notifications are kept
+        self.assertEqual(sorted(Notification.objects.values_list('message', 'is_read')),
+                         [('new', True), ('old', False)])
+        self.assertFalse(ContactMessage.objects.exists())
+        [archive] = os.listdir(archive_dir)
+        with gzip.open(os.path.join(archive_dir, archive), 'rt') as f:
+            self.assertEqual([json.loads(line)['subject'] for line in f], ['Hi'])
+
+    def test_archive_needs_a_configured_directory(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        ContactMessage.objects.create(name='Ada', email='ada@example.com', subject='Hi', message='Old news')
+        ContactMessage.objects.update(created_at=timezone.now() - timedelta(days=400))
+
+        with override_settings(RETENTION_ARCHIVE_DIR=''):
+            with self.assertRaisesMessage(CommandError, 'talents.ContactMessage'):
+                call_command('apply_retention', pause=0, stdout=io.StringIO())
+            self.assertTrue(ContactMessage.objects.exists())
+            # Delete-only policies still run
+            call_command('apply_retention', only=['talents.Notification'], pause=0, stdout=io.StringIO())
+
+
+class PurgeSessionsTests(TestCase):
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db')
+    def test_only_expired_sessions_are_deleted(self):
+        from datetime import timedelta
+        from django.contrib.sessions.models import Session
+        from django.utils import timezone
+
+        now = timezone.now()
+        for i in range(5):
+            Session.objects.create(session_key=f'expired{i}', session_data='', expire_date=now - timedelta(days=1))
+        Session.objects.create(session_key='live', session_data='', expire_date=now + timedelta(days=1))
+
+        call_command('purge_sessions', chunk_size=2, pause=0, stdout=io.StringIO())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['live'])
+
+
+@override_settings(ANONYMOUS_PAGE_CACHE_TIMEOUT=60)
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_repeat_visits_are_served_from_the_cache(self):
+        first = self.client.get(reverse('home'), {'a': 1, 'b': 2})
+        self.assertEqual(first['X-Page-Cache'], 'miss')
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('home') + '?b=2&a=1')
+        self.assertEqual(second['X-Page-Cache'], 'hit')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self.client.get(reverse('home'), {'a': 2})['X-Page-Cache'], 'miss')
+
+    def test_visitors_with_a_session_get_a_fresh_page(self):
+        from django.contrib.auth.models import User
+
+        self.client.get(reverse('home'))
+        user = User.objects.create_user('nav-user')
+        Notification.objects.create(user=user, message='Hi')
+        self.client.force_login(user)
+        self.assertNotIn('X-Page-Cache', self.client.get(reverse('home')))
+
+        state = self.client.get(reverse('nav_state')).json()
+        self.assertEqual((state['username'], state['unread_count']), ('nav-user', 1))
+
+
+@override_settings(TASKS_EAGER=True)
+class RankingTests(TestCase):
+    def test_scores_follow_profile_skill_and_review_changes(self):
+        from django.contrib.auth.models import User
+        from talents.models import Profile, Review, Skill
+
+        profile = Profile.objects.create(user=User.objects.create_user('ranked'), bio='Django', location='Lagos')
+        self.assertEqual(profile.completeness, 40)
+        profile.skills.add(Skill.objects.create(name='Python'))
+        profile.refresh_from_db()
+        self.assertEqual(profile.completeness, 70)
+
+        before = profile.rank_score
+        Review.objects.create(talent=profile, author=User.objects.create_user('client'), rating=5, comment='Great')
+        profile.refresh_from_db()
+        self.assertGreater(profile.rank_score, before)
+
+        # The nightly bulk pass agrees with the incremental updates
+        incremental = profile.rank_score
+        Profile.objects.update(rank_score=0)
+        call_command('rank_profiles', stdout=io.StringIO())
+        profile.refresh_from_db()
+        self.assertAlmostEqual(profile.rank_score, incremental, places=3)
+
+    @override_settings(TASKS_EAGER=False)
+    def test_saves_store_completeness_and_queue_the_score(self):
+        from django.contrib.auth.models import User
+        from talents.models import Profile
+
+        profile = Profile.objects.create(user=User.objects.create_user('queued'))
+        Task.objects.all().delete()
+        profile.location = 'Lagos'
+        with self.assertNumQueries(4):  # UPDATE, skills EXISTS, completeness UPDATE, task INSERT
+            profile.save()
+        self.assertEqual(Profile.objects.get(pk=profile.pk).completeness, 20)
+        self.assertEqual(Task.objects.get().name, 'talents.tasks.refresh_rank_scores')
+
+        # Fields outside the score don't rescore
+        profile.headline = 'Developer'
+        with self.assertNumQueries(1):
+            profile.save(update_fields=['headline'])
+
+    def test_admin_verification_rescores(self):
+        from django.contrib.auth.models import User
+        from talents.models import Profile
+
+        profile = Profile.objects.create(user=User.objects.create_user('unverified'), location='Lagos')
+        before = profile.rank_score
+        self.client.force_login(User.objects.create_superuser('staff'))
+        self.client.post(reverse('admin:talents_profile_changelist'),
+                         {'action': 'verify_profiles', '_selected_action': [profile.pk]})
+        profile.refresh_from_db()
+        self.assertTrue(profile.is_verified)
+        self.assertGreater(profile.rank_score, before)
+
+
+class JobFeedTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from talents.models import Profile, Skill
+
+        self.python, self.django, self.figma = (Skill.objects.create(name=n) for n in ('Python', 'Django', 'Figma'))
+        self.client_user = User.objects.create_user('client')
+        self.freelancers = []
+        for name, skills in (('both', [self.python, self.django]), ('python', [self.python]), ('design', [self.figma])):
+            user = User.objects.create_user(name)
+            Profile.objects.create(user=user, slug=name, location='Lagos').skills.set(skills)
+            self.freelancers.append(user)
+
+    def post_job(self, title, *skills):
+        job = Job.objects.create(client=self.client_user, title=title, description='-', budget=100)
+        job.skills_required.set(skills)
+        return job
+
+    def test_jobs_fan_out_to_matching_freelancers(self):
+        from talents import feed
+
+        job = self.post_job('API', self.python, self.django)
+        self.assertEqual(feed.fan_out(job), 2)  # 'python' has half the skills, 'design' none
+        both, python, design = self.freelancers
+        self.assertEqual(feed.page(both), [job])
+        self.assertEqual(feed.page(design), [])
+        self.client.force_login(both)
+        self.assertContains(self.client.get(reverse('job_feed')), 'API')
+
+        with override_settings(FEED_MAX_ENTRIES_PER_USER=2):
+            for title in ('Scraper', 'Bot'):
+                feed.fan_out(self.post_job(title, self.python))
+        self.assertEqual([j.title for j in feed.page(both)], ['Bot', 'Scraper'])
+
+    def test_popular_jobs_are_pulled_at_read_time(self):
+        from talents import feed
+        from talents.models import FeedEntry
+
+        with override_settings(FEED_FANOUT_LIMIT=1):
+            job = self.post_job('Anything Python', self.python)
+            self.assertEqual(feed.fan_out(job), 0)
+        self.assertTrue(job.feed_pull)
+        self.assertFalse(FeedEntry.objects.exists())
+        self.assertEqual(feed.page(self.freelancers[1]), [job])
+        self.assertEqual(feed.page(self.freelancers[2]), [])
+
+        # Newer pulled jobs below the threshold don't crowd out an older match
+        with override_settings(FEED_FANOUT_LIMIT=0):
+            for title in ('Full stack', 'Design system'):
+                feed.fan_out(self.post_job(title, self.python, self.django, self.figma))
+        with override_settings(FEED_PAGE_SIZE=1):
+            self.assertEqual(feed.page(self.freelancers[1]), [job])
+
+
+class HiringPipelineTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from talents.models import Contract, Profile, Proposal
+
+        self.owner = User.objects.create_user('owner')
+        Profile.objects.create(user=self.owner, slug='owner', location='Lagos')
+        self.job = Job.objects.create(client=self.owner, title='API', description='-', budget=500)
+        for name, bid, days, status in (('ada', 300, 3, 'pending'), ('bola', 100, 9, 'accepted'),
+                                        ('chidi', 200, 5, 'rejected'), ('dayo', 250, 1, 'pending')):
+            user = User.objects.create_user(name, first_name=name)
+            Profile.objects.create(user=user, slug=name, location='Lagos')
+            proposal = Proposal.objects.create(job=self.job, freelancer=user, cover_letter='-', bid_amount=bid,
+                                               estimated_days=days, status=status)
+            if status == 'accepted':
+                Contract.objects.create(job=self.job, client=self.owner, freelancer=user, proposal=proposal,
+                                        agreed_price=bid)
+
+    def test_stats_come_from_one_query(self):
+        from talents import pipeline
+
+        with self.assertNumQueries(1):
+            job = pipeline.with_pipeline_stats(Job.objects.filter(id=self.job.id)).get()
+        self.assertEqual((job.proposal_count, job.pending_count, job.accepted_count, job.rejected_count), (4, 2, 1, 1))
+        self.assertEqual((job.min_bid, job.median_bid, job.max_bid), (100, 225, 300))
+
+    def test_proposals_are_sorted_server_side(self):
+        from talents import pipeline
+
+        self.client.force_login(self.owner)
+        for sort in pipeline.PROPOSAL_SORTS:
+            with self.subTest(sort=sort):
+                response = self.client.get(reverse('manage_job', args=[self.job.slug]), {'sort': sort})
+                self.assertEqual(len(response.context['proposals']), 4)
+        names = [p.freelancer.username for p in pipeline.ranked_proposals(self.job, 'bid')]
+        self.assertEqual(names, ['bola', 'chidi', 'dayo', 'ada'])
+        names = [p.freelancer.username for p in pipeline.ranked_proposals(self.job, 'days')]
+        self.assertEqual(names, ['dayo', 'ada', 'chidi', 'bola'])
+
+
+class ExpireJobsTests(TestCase):
+    def test_expired_jobs_are_closed_and_clients_notified(self):
+        from datetime import timedelta
+        from django.contrib.auth.models import User
+        from django.utils import timezone
+
+        client = User.objects.create_user('client')
+        fresh = Job.objects.create(client=client, title='Fresh', description='-', budget=100)
+        self.assertAlmostEqual(fresh.expires_at, fresh.created_at + timedelta(days=settings.JOB_LIFETIME_DAYS),
+                               delta=timedelta(seconds=1))
+        for i in range(3):
+            Job.objects.create(client=client, title=f'Stale {i}', description='-', budget=100,
+                               expires_at=timezone.now() - timedelta(days=1))
+
+        call_command('expire_jobs', chunk_size=2, pause=0, stdout=io.StringIO())
+        self.assertEqual(list(Job.objects.filter(is_active=True)), [fresh])
+        self.assertEqual(Notification.objects.filter(user=client).count(), 3)
+
+
+class DuplicateJobTests(TestCase):
+    DESCRIPTION = ('We need a developer to build a REST API for our logistics startup in Lagos, with '
+                   'authentication, order tracking, payments through Paystack and an admin dashboard.')
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+
+        self.owner = User.objects.create_user('owner')
+        self.job = Job.objects.create(client=self.owner, title='Django REST API', description=self.DESCRIPTION,
+                                      budget=500)
+
+    def test_near_duplicates_are_found_through_the_bands(self):
+        repost = Job(client=self.owner, title='Django REST API', description=self.DESCRIPTION + ' Urgent!')
+        self.assertEqual(repost.near_duplicates(), [self.job])
+        self.assertGreaterEqual(repost.near_duplicates()[0].similarity, settings.DUPLICATE_JOB_THRESHOLD)
+        other = Job(client=self.owner, title='Logo design', description='A modern logo for a bakery in Abuja.')
+        self.assertEqual(other.near_duplicates(), [])
+
+    def test_post_job_offers_to_update_the_existing_job(self):
+        data = {'title': 'Django REST API', 'description': self.DESCRIPTION + ' Urgent!', 'job_type': 'fixed',
+                'budget': '800', 'skills_required': ''}
+        self.client.force_login(self.owner)
+        with mock.patch('talents.views.jobs.fan_out_job'):
+            response = self.client.post(reverse('post_job'), data)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([job.pk for job in response.context['duplicates']], [self.job.pk])
+            self.assertEqual(Job.objects.count(), 1)
+
+            self.client.post(reverse('post_job'), {**data, 'duplicate_action': f'merge:{self.job.pk}'})
+            self.assertEqual(Job.objects.count(), 1)
+            self.job.refresh_from_db()
+            self.assertEqual(self.job.budget, 800)
+
+            self.client.post(reverse('post_job'), {**data, 'duplicate_action': 'post'})
+            self.assertEqual(Job.objects.count(), 2)
+
+    def test_saves_only_resign_changed_text(self):
+        from talents.models import JobBand
+
+        job = Job.objects.get(pk=self.job.pk)
+        with mock.patch('talents.models.minhash_signature') as sign:
+            job.is_active = False
+            job.save()
+            job.save(update_fields=['is_active'])
+        sign.assert_not_called()
+
+        bands = set(JobBand.objects.filter(job=job).values_list('key', flat=True))
+        job.description = 'A modern logo for a bakery in Abuja, with business cards.'
+        job.save(update_fields=['description'])
+        job.refresh_from_db()
+        self.assertEqual(bytes(job.minhash), minhash.signature(job.title, job.description))
+        self.assertNotEqual(set(JobBand.objects.filter(job=job).values_list('key', flat=True)), bands)
+
+    def test_dedupe_jobs_keeps_one_job_per_group(self):
+        from talents.models import JobBand
+
+        repost = Job.objects.create(client=self.owner, title='Django REST API', description=self.DESCRIPTION,
+                                    budget=500)
+        Job.objects.update(minhash=None)
+        JobBand.objects.all().delete()
+
+        call_command('dedupe_jobs', stdout=io.StringIO())
+        self.assertEqual(JobBand.objects.count(), 32)
+        self.assertEqual(list(Job.objects.filter(is_active=True)), [repost])
+        self.assertEqual(Notification.objects.filter(user=self.owner).count(), 1)
@@ -1,58 +1,85 @@
+from importlib import import_module
+
 from django.urls import path
 from django.contrib.auth import views as auth_views
-from . import views
+
+
+def lazy(dotted, is_async=False):
+    """The view `module.function` of talents/views, imported by its first request.
+
+    Loading the URLconf (every worker, `manage.py check`) then doesn't import all the
+    areas. The wrapper carries no attributes of the view, so a view read by middleware
+    before it runs (csrf_exempt, ...) must be imported directly.
+    """
+    module, name = dotted.rsplit('.', 1)
+
+    def load():
+        return getattr(import_module(f'{__package__}.views.{module}'), name)
+
+    if is_async:
+        async def view(request, *args, **kwargs):
+            return await load()(request, *args, **kwargs)
+    else:
+        def view(request, *args, **kwargs):
+            return load()(request, *args, **kwargs)
+    view.__module__ = f'{__package__}.views.{module}'
+    view.__name__ = view.__qualname__ = name
+    return view
+
 
 urlpatterns = [
     # --- 1. LANDING & STATIC PAGES ---
-    path('', views.home, name='home'),
-    path('about/', views.about, name='about'),
-    path('privacy/', views.privacy, name='privacy'),
-    path('careers/', views.careers, name='careers'),
-    path('contact/', views.contact, name='contact'),
-    path('blog/', views.blog, name='blog'),
-    path('blog/<int:pk>/', views.blog_detail, name='blog_detail'),
+    path('', lazy('pages.home'), name='home'),
+    path('about/', lazy('pages.about'), name='about'),
+    path('privacy/', lazy('pages.privacy'), name='privacy'),
+    path('careers/', lazy('pages.careers'), name='careers'),
+    path('contact/', lazy('pages.contact'), name='contact'),
+    path('blog/', lazy('pages.blog'), name='blog'),
+    path('blog/<int:pk>/', lazy('pages.blog_detail'), name='blog_detail'),
 
     # --- 2. AUTHENTICATION ---
-    path('register/', views.register, name='register'),
+    path('register/', lazy('accounts.register'), name='register'),
     path('login/', auth_views.LoginView.as_view(template_name='talents/login.html'), name='login'),
     path('logout/', auth_views.LogoutView.as_view(next_page='home'), name='logout'),
 
     # --- 3. DASHBOARD & ONBOARDING ---
-    path('dashboard/', views.dashboard, name='dashboard'),
-    path('complete-onboarding/', views.complete_onboarding, name='complete_onboarding'),
-    path('notifications/', views.notifications, name='notifications'),
+    path('dashboard/', lazy('accounts.dashboard'), name='dashboard'),
+    path('complete-onboarding/', lazy('accounts.complete_onboarding'), name='complete_onboarding'),
+    path('notifications/', lazy('notifications.notifications'), name='notifications'),
+    path('nav-state/', lazy('notifications.nav_state'), name='nav_state'),
     
     # --- 4. PROFILES ---
-    path('profile/edit/', views.profile_update, name='profile_update'),
-    path('profile/<slug:slug>/', views.profile_detail, name='profile_detail'),
-    path('browse/', views.browse, name='browse'), # Talent Directory
-    path('follow/<int:profile_id>/', views.toggle_follow, name='toggle_follow'),
+    path('profile/edit/', lazy('accounts.profile_update'), name='profile_update'),
+    path('profile/<slug:slug>/', lazy('profiles.profile_detail'), name='profile_detail'),
+    path('browse/', lazy('profiles.browse'), name='browse'), # Talent Directory
+    path('follow/<int:profile_id>/', lazy('profiles.toggle_follow'), name='toggle_follow'),
 
     # --- 5. JOBS ---
-    path('find-work/', views.job_list, name='job_list'),
-    path('post-job/', views.post_job, name='post_job'),
-    path('my-jobs/', views.my_jobs, name='my_jobs'),
-    path('job/<slug:slug>/', views.job_detail, name='job_detail'),
-    path('job/<slug:slug>/save/', views.toggle_save_job, name='toggle_save_job'),
-    path('job/<slug:slug>/apply/', views.apply_to_job, name='apply_to_job'),
-    path('job/<slug:slug>/manage/', views.manage_job, name='manage_job'),
-    path('job/<slug:slug>/edit/', views.edit_job, name='edit_job'),
-    path('proposal/<int:proposal_id>/hire/', views.create_contract, name='create_contract'),
-    path('contract/<int:pk>/', views.contract_detail, name='contract_detail'),
+    path('find-work/', lazy('jobs.job_list'), name='job_list'),
+    path('find-work/for-you/', lazy('jobs.job_feed'), name='job_feed'),
+    path('post-job/', lazy('jobs.post_job'), name='post_job'),
+    path('my-jobs/', lazy('jobs.my_jobs'), name='my_jobs'),
+    path('job/<slug:slug>/', lazy('jobs.job_detail'), name='job_detail'),
+    path('job/<slug:slug>/save/', lazy('jobs.toggle_save_job'), name='toggle_save_job'),
+    path('job/<slug:slug>/apply/', lazy('jobs.apply_to_job'), name='apply_to_job'),
+    path('job/<slug:slug>/manage/', lazy('jobs.manage_job'), name='manage_job'),
+    path('job/<slug:slug>/edit/', lazy('jobs.edit_job'), name='edit_job'),
+    path('proposal/<int:proposal_id>/hire/', lazy('jobs.create_contract'), name='create_contract'),
+    path('contract/<int:pk>/', lazy('jobs.contract_detail'), name='contract_detail'),
     
     # --- 6. MESSAGES ---
-    path('messages/', views.inbox, name='inbox'),
-    path('messages/<str:username>/', views.chat_detail, name='chat_detail'),
+    path('messages/', lazy('messaging.inbox'), name='inbox'),
+    path('messages/<str:username>/', lazy('messaging.chat_detail'), name='chat_detail'),
     
     # --- 7. WALLET & PAYMENTS ---
-    path('wallet/', views.wallet, name='wallet'),
-    path('payment/checkout/<str:reference>/', views.payment_checkout, name='payment_checkout'),
-    path('payment/verify/<str:reference>/', views.verify_payment, name='verify_payment'),
+    path('wallet/', lazy('payments.wallet'), name='wallet'),
+    path('payment/checkout/<str:reference>/', lazy('payments.payment_checkout'), name='payment_checkout'),
+    path('payment/verify/<str:reference>/', lazy('payments.verify_payment', is_async=True), name='verify_payment'),
     
     # --- 8. SETTINGS & UTILS ---
-    path('settings/', views.settings_view, name='settings'),
-    path('verify-identity/', views.verify_identity, name='verify_identity'),
-    path('leave-review/', views.leave_review, name='leave_review'),
-    path('profile/@<str:username>/', views.public_profile, name='profile_view'),    
-    path('hire/<int:freelancer_id>/', views.hire_freelancer, name='hire_freelancer'),
+    path('settings/', lazy('accounts.settings_view'), name='settings'),
+    path('verify-identity/', lazy('accounts.verify_identity'), name='verify_identity'),
+    path('leave-review/', lazy('profiles.leave_review'), name='leave_review'),
+    path('profile/@<str:username>/', lazy('profiles.public_profile'), name='profile_view'),    
+    path('hire/<int:freelancer_id>/', lazy('jobs.hire_freelancer'), name='hire_freelancer'),
 ]
\ No newline at end of file
@@ -0,0 +1,4 @@
+# Views are split by area (pages, accounts, profiles, jobs, messaging, payments, ...) and
+# talents/urls.py imports each module directly. Keep this file empty so importing one area
+# doesn't load the others, and keep heavy dependencies (requests, prometheus_client) as
+# imports inside the views that use them.
@@ -0,0 +1,153 @@
+from django.contrib import messages
+from django.contrib.auth import login, logout as auth_logout
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.forms import AuthenticationForm
+from django.contrib.auth.models import User
+from django.shortcuts import redirect, render
+from django.urls import reverse
+
+from ..models import Profile, Skill
+from ..forms import ProfileUpdateForm, UserUpdateForm
+from ..images import schedule_derivatives
+
+
+def register(request):
+    if request.user.is_authenticated:
+        return redirect('dashboard')
+
+    if request.method == 'POST':
+        username = request.POST.get('username')
+        password = request.POST.get('password')
+
+        if User.objects.filter(username=username).exists():
+            messages.error(request, "That username is taken. Please choose another.")
+            return redirect('register')
+
+        try:
+            user = User.objects.create_user(username=username, password=password)
+            user.save()
+            login(request, user, backend='django.contrib.auth.backends.ModelBackend')
+            messages.success(request, "Account created! Welcome to the hub.")
+            return redirect('dashboard') 
+
+        except Exception as e:
+            messages.error(request, "An error occurred during signup.")
+            return redirect('register')
+
+    return render(request, 'talents/register.html')
+
+
+def login_view(request):
+    if request.user.is_authenticated:
+        return redirect('dashboard')
+
+    if request.method == 'POST':
+        form = AuthenticationForm(request, data=request.POST)
+        if form.is_valid():
+            user = form.get_user()
+            login(request, user)
+            next_url = request.GET.get('next', 'dashboard')
+            return redirect(next_url)
+    else:
+        form = AuthenticationForm()
+
+    return render(request, 'talents/login.html', {'form': form})
+
+
+def logout_view(request):
+    auth_logout(request)
+    messages.info(request, "You have been logged out.")
+    return redirect('login')
+
+
+@login_required
+def dashboard(request):
+    profile, created = Profile.objects.get_or_create(user=request.user)
+    
+    notifications = request.user.notifications.all().order_by('-created_at')[:5]
+    reviews = profile.reviews.select_related('author').order_by('-created_at')
+
+    context = {
+        'profile': profile,
+        'completeness': profile.completeness,  # Stored by talents.ranking on every profile change
+        'notifications': notifications,
+        'reviews': reviews,
+    }
+    return render(request, 'talents/dashboard.html', context)
+
+
+@login_required
+def complete_onboarding(request):
+    if request.method == 'POST':
+        profile = request.user.profile
+        
+        profile.role = request.POST.get('role', 'freelancer')
+        profile.headline = request.POST.get('headline')
+        profile.location = request.POST.get('location')
+        profile.bio = request.POST.get('bio', '')
+        profile.company_name = request.POST.get('company_name', '')
+        profile.project_link = request.POST.get('project_link', '')
+        
+        rate = request.POST.get('hourly_rate')
+        if rate and rate.strip():
+            profile.hourly_rate = rate
+        
+        years = request.POST.get('years_experience')
+        if years and years.strip():
+            profile.years_experience = int(years)
+
+        skills_input = request.POST.get('skills')
+        if skills_input:
+            profile.skills.clear() 
+            for skill_name in skills_input.split(','):
+                skill_name = skill_name.strip()
+                if skill_name:
+                    skill, _ = Skill.objects.get_or_create(name__iexact=skill_name, defaults={'name': skill_name})
+                    profile.skills.add(skill)
+
+        profile.onboarding_complete = True
+        profile.save()
+
+        dashboard_url = reverse('dashboard')
+        return redirect(f"{dashboard_url}?welcome=true")
+
+    return redirect('dashboard')
+
+
+@login_required
+def profile_update(request):
+    if request.method == 'POST':
+        u_form = UserUpdateForm(request.POST, instance=request.user)
+        p_form = ProfileUpdateForm(request.POST, request.FILES, instance=request.user.profile)
+
+        if u_form.is_valid() and p_form.is_valid():
+            u_form.save()
+            profile = p_form.save()
+
+            # Resize new pictures in the background; templates use the originals until it's done
+            for field in ('profile_pic', 'cover_photo'):
+                if field in p_form.changed_data:
+                    schedule_derivatives(getattr(profile, field).name)
+
+            messages.success(request, 'Your profile has been updated!')
+            return redirect('profile_detail', slug=request.user.profile.slug) 
+    else:
+        u_form = UserUpdateForm(instance=request.user)
+        p_form = ProfileUpdateForm(instance=request.user.profile)
+
+    context = {
+        'u_form': u_form,
+        'p_form': p_form
+    }
+    return render(request, 'talents/profile_update.html', context)
+
+
+@login_required
+def settings_view(request):
+    return render(request, 'talents/settings.html')
+
+
+@login_required
+def verify_identity(request):
+    return render(request, 'talents/verify_identity.html')
+
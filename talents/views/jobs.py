@@ -0,0 +1,373 @@
+import secrets
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.db.models import Q, Sum
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .. import feed, pipeline
+from ..models import Contract, Job, Proposal, SavedJob, Skill, Transaction
+from ..forms import JobForm, ProposalForm
+from ..pagecache import anonymous_page_cache
+from ..routers import replica_reads
+from ..tasks import fan_out_job
+
+
+@login_required
+@replica_reads
+def job_list(request):
+    jobs = Job.objects.filter(is_active=True).prefetch_related('skills_required').order_by('-created_at')
+    
+    # --- UPGRADE: Advanced Search & Filtering ---
+    query = request.GET.get('q')
+    if query:
+        jobs = jobs.filter(
+            Q(title__icontains=query) | 
+            Q(description__icontains=query) |
+            Q(skills_required__name__icontains=query) # Search by Skill Name too
+        ).distinct()
+
+    # Filter by Job Type (Fixed/Hourly)
+    job_type = request.GET.get('type')
+    if job_type:
+        jobs = jobs.filter(job_type=job_type)
+
+    context = {
+        'jobs': jobs, 
+        'job_count': jobs.count(),
+        'saved_job_ids': request.user.saved_jobs.values_list('job_id', flat=True) # For the bookmark icon
+    }
+    return render(request, 'talents/job_list.html', context)
+
+
+@login_required
+@replica_reads
+def job_feed(request):
+    # Jobs matched to the freelancer's skills, newest first; ?before= pages back in time
+    before = parse_datetime(request.GET.get('before') or '')
+    jobs = feed.page(request.user, before=before)
+    context = {
+        'jobs': jobs,
+        'feed': True,
+        'next_before': jobs[-1].created_at.isoformat() if len(jobs) == feed.page_size() else None,
+        'saved_job_ids': request.user.saved_jobs.values_list('job_id', flat=True),
+    }
+    return render(request, 'talents/job_list.html', context)
+
+
+@anonymous_page_cache
+def job_detail(request, slug):
+    job = get_object_or_404(Job, slug=slug)
+    has_applied = False
+    if request.user.is_authenticated:
+        # Check against both the old M2M and new Proposal model for thoroughness
+        has_applied = Proposal.objects.filter(job=job, freelancer=request.user).exists()
+    
+    context = {'job': job, 'has_applied': has_applied}
+    return render(request, 'talents/job_detail.html', context)
+
+
+@login_required
+def apply_to_job(request, slug):
+    job = get_object_or_404(Job, slug=slug)
+
+    if job.client == request.user:
+        messages.error(request, "You cannot apply to your own job.")
+        return redirect('job_detail', slug=slug)
+
+    # Check if already applied
+    if Proposal.objects.filter(job=job, freelancer=request.user).exists():
+        messages.warning(request, "You have already sent a proposal.")
+        return redirect('job_detail', slug=slug)
+
+    if request.method == 'POST':
+        form = ProposalForm(request.POST)
+        if form.is_valid():
+            proposal = form.save(commit=False)
+            proposal.job = job
+            proposal.freelancer = request.user
+            proposal.save()
+            
+            # Compatibility with legacy field
+            job.applicants.add(request.user) 
+            
+            messages.success(request, "Proposal sent successfully!")
+            return redirect('job_detail', slug=slug)
+    else:
+        form = ProposalForm(initial={'bid_amount': job.budget})
+
+    return render(request, 'talents/apply_job.html', {'form': form, 'job': job})
+
+
+@login_required
+def my_jobs(request):
+    # Jobs posted by the user, with their proposal counts and bids (one GROUP BY, no prefetch)
+    posted_jobs = pipeline.with_pipeline_stats(Job.objects.filter(client=request.user)).order_by('-created_at')
+    
+    # Jobs user applied to (using Proposal model)
+    proposals = Proposal.objects.filter(freelancer=request.user).select_related('job', 'job__client').order_by('-created_at')
+    
+    context = {
+        'posted_jobs': posted_jobs,
+        'proposals': proposals # Using proposals instead of 'applied_jobs' for better data
+    }
+    return render(request, 'talents/my_jobs.html', context)
+
+
+@login_required
+def manage_job(request, slug):
+    job = get_object_or_404(pipeline.with_pipeline_stats(Job.objects.all()), slug=slug)
+    
+    if request.user != job.client:
+        return redirect('dashboard')
+
+    # One page of proposals, sorted server-side (?sort=bid, -bid, days, rating, match)
+    sort = request.GET.get('sort', 'newest')
+    if sort not in pipeline.PROPOSAL_SORTS:
+        sort = 'newest'
+    proposals = pipeline.proposal_page(job, sort, request.GET.get('page'))
+
+    return render(request, 'talents/manage_job.html', {
+        'job': job, 'proposals': proposals, 'sort': sort, 'sort_choices': pipeline.SORT_CHOICES,
+    })
+
+
+@login_required
+def post_job(request):
+    if request.method == 'POST':
+        form = JobForm(request.POST)
+        if form.is_valid():
+            job = form.save(commit=False)
+            job.client = request.user
+
+            # Near-duplicates of the client's own open jobs: offer to update one instead of reposting
+            action = request.POST.get('duplicate_action', '')
+            if action.startswith('merge:') and action[6:].isdigit():
+                existing = get_object_or_404(Job, pk=action[6:], client=request.user, is_active=True)
+                for field in JobForm.Meta.fields:
+                    setattr(existing, field, form.cleaned_data[field])
+                job = existing
+            elif action != 'post':
+                duplicates = job.near_duplicates(Job.objects.filter(client=request.user, is_active=True))
+                if duplicates:
+                    return render(request, 'talents/post_job.html', {'form': form, 'duplicates': duplicates})
+            job.save()
+            
+            # --- UPGRADE: Handle comma-separated skills input ---
+            # If your form has a text field named 'skills_required' (or similar)
+            skills_input = request.POST.get('skills_required') 
+            if skills_input:
+                job.skills_required.clear()
+                for skill_name in skills_input.split(','):
+                    skill_name = skill_name.strip()
+                    if skill_name:
+                        # Get or Create the skill instantly
+                        skill, _ = Skill.objects.get_or_create(name__iexact=skill_name, defaults={'name': skill_name})
+                        job.skills_required.add(skill)
+            else:
+                form.save_m2m() # Fallback to standard handling
+            fan_out_job.delay(job.id)  # Into the feeds of matching freelancers
+            
+            if action.startswith('merge:'):
+                messages.success(request, f'Updated your existing job "{job.title}" instead of posting it twice.')
+            else:
+                messages.success(request, "Job posted successfully!")
+            return redirect('job_list')
+    else:
+        form = JobForm()
+    return render(request, 'talents/post_job.html', {'form': form})
+
+
+@login_required
+def edit_job(request, slug):
+    # 1. Get the job (Security: Ensure only the owner can edit)
+    job = get_object_or_404(Job, slug=slug, client=request.user)
+
+    if request.method == 'POST':
+        # 2. Load the form with existing data (instance=job)
+        form = JobForm(request.POST, instance=job)
+        if form.is_valid():
+            form.save()
+
+            # If you are using the tag system I gave you earlier:
+            skills_input = request.POST.get('skills_required')
+            if skills_input:
+                job.skills_required.clear()
+                for skill_name in skills_input.split(','):
+                    skill_name = skill_name.strip()
+                    if skill_name:
+                        # Get or Create the skill instantly
+                        skill, _ = Skill.objects.get_or_create(name__iexact=skill_name, defaults={'name': skill_name})
+                        job.skills_required.add(skill)
+            else:
+                form.save_m2m() # Fallback to standard handling
+            fan_out_job.delay(job.id)  # Skills may have changed: rewrite its feed entries
+
+            messages.success(request, "Job updated successfully!")
+            return redirect('job_detail', slug=job.slug)
+    else:
+        # 3. Pre-fill the form with the job's current details
+        form = JobForm(instance=job)
+
+    # 4. Reuse the 'post_job.html' template
+    return render(request, 'talents/post_job.html', {
+        'form': form,
+        'title': 'Edit Job'  # Pass a title variable
+    })
+
+
+@login_required
+def toggle_save_job(request, slug):
+    job = get_object_or_404(Job, slug=slug)
+    saved_job = SavedJob.objects.filter(user=request.user, job=job).first()
+    
+    if saved_job:
+        saved_job.delete()
+        messages.info(request, "Job removed from saved items.")
+    else:
+        SavedJob.objects.create(user=request.user, job=job)
+        messages.success(request, "Job saved successfully!")
+        
+    return redirect(request.META.get('HTTP_REFERER', 'job_list'))
+
+
+@login_required
+def hire_freelancer(request, freelancer_id):
+    freelancer = get_object_or_404(User, id=freelancer_id)
+    client_jobs = Job.objects.filter(client=request.user, is_active=True)
+
+    if request.method == 'POST':
+        job_id = request.POST.get('job_id')
+        job = get_object_or_404(Job, id=job_id, client=request.user)
+        
+        # Create a proposal on behalf of the client
+        proposal, created = Proposal.objects.get_or_create(
+            job=job,
+            freelancer=freelancer,
+            defaults={'bid_amount': job.budget, 'cover_letter': 'Hired directly by client.'}
+        )
+        
+        return redirect('create_contract', proposal_id=proposal.id)
+
+    context = {
+        'freelancer': freelancer,
+        'client_jobs': client_jobs,
+    }
+    return render(request, 'talents/hire_freelancer.html', context)
+
+
+@login_required
+def create_contract(request, proposal_id):
+    # 1. Get the Proposal and Job
+    proposal = get_object_or_404(Proposal, id=proposal_id)
+    job = proposal.job
+    amount = proposal.bid_amount
+
+    # Security: Ensure only the client can hire
+    if request.user != job.client:
+        messages.error(request, "You do not have permission to hire for this job.")
+        return redirect('dashboard')
+
+    # 2. Calculate Wallet Balance
+    deposits = Transaction.objects.filter(
+        user=request.user,
+        transaction_type='deposit',
+        status='success'
+    ).aggregate(Sum('amount'))['amount__sum'] or 0
+
+    withdrawals = Transaction.objects.filter(
+        user=request.user,
+        transaction_type='withdrawal',
+        status='success'
+    ).aggregate(Sum('amount'))['amount__sum'] or 0
+
+    escrow_holds = Transaction.objects.filter(
+        user=request.user,
+        transaction_type='escrow_hold',
+        status='success'
+    ).aggregate(Sum('amount'))['amount__sum'] or 0
+
+    current_balance = deposits - withdrawals - escrow_holds
+
+    # 3. Check for Insufficient Funds
+    if current_balance < amount:
+        messages.error(request, f"Insufficient funds. You need ₦{amount:,.2f} but only have ₦{current_balance:,.2f}.")
+        return redirect('wallet')
+
+    # 4. Create the Contract
+    contract = Contract.objects.create(
+        job=job,
+        client=request.user,
+        freelancer=proposal.freelancer,
+        proposal=proposal,
+        agreed_price=amount,
+        status='active'
+    )
+
+    # 5. Lock the Money (Escrow Hold)
+    Transaction.objects.create(
+        user=request.user,
+        amount=amount,
+        transaction_type='escrow_hold',
+        status='success',
+        contract=contract,
+        reference=f"ESCROW-{contract.id}-{secrets.token_hex(4)}"
+    )
+
+    # 6. Update Proposal & Job Status
+    proposal.status = 'accepted'
+    proposal.save()
+
+    # Optional: Close the job so no one else applies
+    job.is_active = False
+    job.save()
+
+    messages.success(request, f"Hired {proposal.freelancer.username}! Funds have been moved to escrow.")
+
+    # --- FIX: Use 'pk' here to match your urls.py ---
+    return redirect('contract_detail', pk=contract.id)
+
+
+@login_required
+def contract_detail(request, pk):
+    contract = get_object_or_404(Contract, pk=pk)
+    
+    if request.user != contract.client and request.user != contract.freelancer:
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+
+    if request.method == 'POST' and 'release_funds' in request.POST:
+        if request.user == contract.client and contract.status == 'active':
+            # 1. Update contract status
+            contract.status = 'completed'
+            contract.end_date = timezone.now()
+            contract.save()
+
+            # 2. Release funds from escrow for the client
+            Transaction.objects.create(
+                user=contract.client,
+                amount=-contract.agreed_price,
+                transaction_type='escrow_release',
+                status='success',
+                contract=contract,
+                reference=f"RELEASE-{contract.id}-{secrets.token_hex(4)}"
+            )
+
+            # 3. Add funds to the freelancer's wallet
+            Transaction.objects.create(
+                user=contract.freelancer,
+                amount=contract.agreed_price,
+                transaction_type='fund_received',
+                status='success',
+                contract=contract,
+                reference=f"PAYOUT-{contract.id}-{secrets.token_hex(4)}"
+            )
+
+            messages.success(request, f"Funds released to {contract.freelancer.username} successfully!")
+            return redirect('contract_detail', pk=pk)
+
+    return render(request, 'talents/contract_detail.html', {'contract': contract})
+
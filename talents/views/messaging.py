@@ -0,0 +1,65 @@
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.db.models import OuterRef, Q, Subquery
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+
+from ..models import Message
+
+
+def contacts(user):
+    """The people `user` exchanged messages with, newest conversation first, each with
+    last_message / last_message_at. One query, whatever the number of contacts."""
+    between = Message.objects.filter(
+        Q(sender=user, recipient=OuterRef('pk')) | Q(sender=OuterRef('pk'), recipient=user)
+    ).order_by('-created_at')
+    return (
+        User.objects.filter(
+            Q(id__in=Message.objects.filter(recipient=user).values('sender'))
+            | Q(id__in=Message.objects.filter(sender=user).values('recipient'))
+        )
+        .select_related('profile')
+        .annotate(
+            last_message=Subquery(between.values('content')[:1]),
+            last_message_at=Subquery(between.values('created_at')[:1]),
+        )
+        .order_by('-last_message_at')
+    )
+
+
+@login_required
+def inbox(request):
+    return render(request, 'talents/inbox.html', {'conversations': contacts(request.user)})
+
+
+@login_required
+def chat_detail(request, username):
+    other_user = get_object_or_404(User, username=username)
+    
+    # 1. Mark all messages from them as read
+    Message.objects.filter(sender=other_user, recipient=request.user, read_at__isnull=True).update(read_at=timezone.now())
+    
+    # 2. Fetch Chat History
+    messages = Message.objects.filter(
+        Q(sender=request.user, recipient=other_user) | 
+        Q(sender=other_user, recipient=request.user)
+    ).order_by('created_at')
+    
+    # Handle new message submission
+    if request.method == "POST":
+        content = request.POST.get('content')
+        if content:
+            Message.objects.create(
+                sender=request.user,
+                recipient=other_user,
+                content=content
+            )
+            return redirect('chat_detail', username=other_user.username)
+            
+    context = {
+        'conversations': contacts(request.user),
+        'other_user': other_user,
+        'chat_messages': messages
+    }
+    return render(request, 'talents/inbox.html', context) # Use the same template
+
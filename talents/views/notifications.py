@@ -0,0 +1,80 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import redirect, render
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.cache import never_cache
+
+from .. import images
+from ..models import Notification, Profile
+
+# Older notifications stay in the database until 'manage.py apply_retention' removes them
+NOTIFICATIONS_PER_PAGE = 50
+
+
+@login_required
+def mark_notifications_read(request):
+    Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+    return JsonResponse({'status': 'success'})
+
+
+@login_required
+def all_notifications(request):
+    notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
+    
+    # Mark all as read functionality
+    if request.method == "POST" and 'mark_read' in request.POST:
+        notifications.update(is_read=True)
+        messages.success(request, "All notifications marked as read.")
+        return redirect('notifications')
+        
+    notifications.update(is_read=True)
+    return render(request, 'talents/notifications.html', {'notifications': notifications})
+
+
+@login_required
+def notifications(request):
+    # Consolidating notifications view (it was defined twice in your file)
+    notifs = Notification.objects.filter(user=request.user).order_by('-created_at')
+    
+    if request.method == "POST" and 'mark_read' in request.POST:
+        notifs.update(is_read=True)
+        messages.success(request, "All notifications marked as read.")
+        return redirect('notifications')
+
+    # Newest first; ?before= pages back in time. One extra row tells whether there is an older page
+    before = parse_datetime(request.GET.get('before') or '')
+    if before:
+        notifs = notifs.filter(created_at__lt=before)
+    page = list(notifs[:NOTIFICATIONS_PER_PAGE + 1])
+    shown = page[:NOTIFICATIONS_PER_PAGE]
+    return render(request, 'talents/notifications.html', {
+        'notifications': shown,
+        'next_before': shown[-1].created_at.isoformat() if len(page) > NOTIFICATIONS_PER_PAGE else None,
+    })
+
+
+
+@never_cache
+def nav_state(request):
+    """The personal bits of the navbar (bell, avatar, profile link), fetched by base.html
+    after the page loads so the pages themselves render the same for everyone."""
+    if not request.user.is_authenticated:
+        return JsonResponse({'authenticated': False})
+
+    user = request.user
+    profile = Profile.objects.filter(user=user).only('slug', 'profile_pic').first()
+    avatar = None
+    if profile and profile.profile_pic and profile.profile_pic.name != images.DEFAULT_IMAGE:
+        avatar = {
+            'src': profile.profile_pic.url,
+            'srcset': images.srcset_candidates(profile.profile_pic, images.formats()[0]),
+        }
+    return JsonResponse({
+        'authenticated': True,
+        'username': user.username,
+        'unread_count': Notification.objects.filter(user=user, is_read=False).count(),
+        'avatar': avatar,
+        'profile_url': reverse('profile_detail', args=[profile.slug]) if profile and profile.slug else None,
+    })
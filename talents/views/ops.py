@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+
+def metrics_view(request):
+    # Prometheus scrape target, 'Authorization: Bearer <METRICS_TOKEN>'. Without a token
+    # configured it doesn't exist (except with DEBUG, for runserver)
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        if not settings.DEBUG:
+            raise Http404
+    elif not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    from ..metrics import render as render_metrics
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,139 @@
+from datetime import date
+
+from django.conf import settings
+from django.contrib import messages
+from django.shortcuts import redirect, render
+
+from ..models import ContactMessage, Job, Profile, Subscriber
+from ..pagecache import anonymous_page_cache
+from ..routers import replica_reads
+from ..tasks import send_email
+
+
+@anonymous_page_cache
+@replica_reads
+def home(request):
+    # Fetch 3 recent jobs
+    recent_jobs = Job.objects.filter(is_active=True).order_by('-created_at')[:3]
+
+    # Top 4 talents by stored rank_score (profile_rank_idx)
+    top_talents = Profile.objects.select_related('user').order_by('-rank_score')[:4]
+
+    # Simple Stats Counter
+    stats = {
+        'jobs_count': Job.objects.filter(is_active=True).count(),
+        'talents_count': Profile.objects.count(),
+    }
+
+    context = {
+        'recent_jobs': recent_jobs,
+        'top_talents': top_talents,  # <--- KEY NAME IS 'top_talents'
+        'stats': stats
+    }
+    return render(request, 'talents/home.html', context)
+
+
+BLOG_POSTS = [
+    {
+        'id': 1,
+        'title': "The Future of Freelancing in Nigeria: 2026 Outlook",
+        'slug': "future-of-freelancing-nigeria-2026",
+        'excerpt': "Explore the emerging trends...",
+        'content': """<p class="lead">The freelance landscape is evolving rapidly.</p>""",
+        'category': "Industry Trends",
+        'author': "Emmanuel Onen",
+        'date': date(2026, 1, 15), # <--- FIXED: using date()
+        'image': "https://images.unsplash.com/photo-1522071820081-009f0129c71c?ixlib=rb-1.2.1&auto=format&fit=crop&w=1350&q=80",
+        'featured': True
+    },
+    {
+        'id': 2,
+        'title': "5 Soft Skills Every Remote Developer Needs",
+        'slug': "5-soft-skills-remote-developers",
+        'excerpt': "Technical skills get you the job, but soft skills keep you there.",
+        'content': "<p>Content goes here...</p>",
+        'category': "Career Advice",
+        'author': "Sarah Jenkins",
+        'date': date(2026, 1, 10),
+        'image': "https://images.unsplash.com/photo-1516321318423-f06f85e504b3?ixlib=rb-1.2.1&auto=format&fit=crop&w=1350&q=80",
+        'featured': False
+    },
+    {
+        'id': 3,
+        'title': "How to Craft a Winning Proposal on TalentHub",
+        'slug': "craft-winning-proposal-talenthub",
+        'excerpt': "Stop sending generic cover letters.",
+        'content': "<p>Content goes here...</p>",
+        'category': "Platform Tips",
+        'author': "TalentHub Team",
+        'date': date(2026, 1, 5),
+        'image': "https://images.unsplash.com/photo-1454165804606-c3d57bc86b40?ixlib=rb-1.2.1&auto=format&fit=crop&w=1350&q=80",
+        'featured': False
+    },
+    {
+        'id': 4,
+        'title': "Setting Your Rates: A Guide for New Freelancers",
+        'slug': "setting-your-rates-guide",
+        'excerpt': "Undervaluing your work is a common mistake.",
+        'content': "<p>Content goes here...</p>",
+        'category': "Finance",
+        'author': "Michael Adebayo",
+        'date': date(2025, 12, 28),
+        'image': "https://images.unsplash.com/photo-1554224155-8d04cb21cd6c?ixlib=rb-1.2.1&auto=format&fit=crop&w=1350&q=80",
+        'featured': False
+    }
+]
+
+
+@anonymous_page_cache
+@replica_reads
+def blog(request):
+    featured_post = next((post for post in BLOG_POSTS if post['featured']), None)
+    other_posts = [post for post in BLOG_POSTS if not post['featured']]
+    context = {'featured_post': featured_post, 'posts': other_posts}
+    return render(request, 'talents/blog.html', context)
+
+
+def blog_detail(request, pk):
+    post = next((item for item in BLOG_POSTS if item["id"] == pk), None)
+    if not post:
+        return redirect('blog')
+    return render(request, 'talents/blog_detail.html', {'post': post})
+
+
+def contact(request):
+    if request.method == 'POST':
+        contact_message = ContactMessage.objects.create(
+            name=request.POST.get('name'), 
+            email=request.POST.get('email'), 
+            subject=request.POST.get('subject'), 
+            message=request.POST.get('message')
+        )
+        # Forward to the team inbox without making the visitor wait on SMTP
+        if settings.EMAIL_HOST_USER:
+            send_email.delay(
+                f"[Contact] {contact_message.subject}",
+                f"From {contact_message.name} <{contact_message.email}>\n\n{contact_message.message}",
+                [settings.EMAIL_HOST_USER],
+            )
+        messages.success(request, "Message sent! We'll get back to you shortly.")
+        return redirect('contact')
+    return render(request, 'talents/contact.html')
+
+
+def subscribe(request):
+    if request.method == 'POST':
+        email = request.POST.get('email')
+        if not Subscriber.objects.filter(email=email).exists():
+            Subscriber.objects.create(email=email)
+            messages.success(request, "Subscribed successfully!")
+        else:
+            messages.info(request, "You are already subscribed.")
+    return redirect(request.META.get('HTTP_REFERER', 'home'))
+
+
+def about(request): return render(request, 'talents/about.html')
+
+def careers(request): return render(request, 'talents/careers.html')
+
+def privacy(request): return render(request, 'talents/privacy.html')
@@ -0,0 +1,139 @@
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth import get_user
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import redirect_to_login
+from django.db.models import Sum
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect, render
+
+from .. import paystack
+from ..models import Transaction
+from ..forms import DepositForm, WithdrawForm
+from ..tasks import verify_paystack_payment
+
+
+@login_required
+def wallet(request):
+    # --- 1. HANDLE POST REQUESTS (Forms) ---
+    if request.method == 'POST':
+        # --- Handle Deposit (Redirects to Paystack) ---
+        if 'deposit_btn' in request.POST:
+            deposit_form = DepositForm(request.POST)
+            if deposit_form.is_valid():
+                transaction = deposit_form.save(commit=False)
+                transaction.user = request.user
+                transaction.transaction_type = 'deposit'
+                transaction.status = 'pending'  # Waiting for Paystack
+
+                # Generate unique reference
+                ref = secrets.token_urlsafe(10)
+                transaction.reference = ref
+                transaction.save()
+
+                return redirect('payment_checkout', reference=ref)
+
+        # --- Handle Withdrawal ---
+        elif 'withdraw_btn' in request.POST:
+            withdraw_form = WithdrawForm(request.POST)
+            if withdraw_form.is_valid():
+                amount = withdraw_form.cleaned_data['amount']
+
+                # Calculate real available balance (must exclude escrow money)
+                deposits = \
+                Transaction.objects.filter(user=request.user, transaction_type='deposit', status='success').aggregate(
+                    Sum('amount'))['amount__sum'] or 0
+                withdrawals = Transaction.objects.filter(user=request.user, transaction_type='withdrawal',
+                                                         status='success').aggregate(Sum('amount'))['amount__sum'] or 0
+                escrow_holds = Transaction.objects.filter(user=request.user, transaction_type='escrow_hold',
+                                                          status='success').aggregate(Sum('amount'))['amount__sum'] or 0
+
+                current_balance = deposits - withdrawals - escrow_holds
+
+                if amount > current_balance:
+                    messages.error(request, "Insufficient Funds! You cannot withdraw money that is held in escrow.")
+                else:
+                    transaction = withdraw_form.save(commit=False)
+                    transaction.user = request.user
+                    transaction.transaction_type = 'withdrawal'
+                    transaction.status = 'success'
+                    transaction.save()
+                    messages.success(request, f"Successfully withdrew ₦{amount:,.2f}")
+                    return redirect('wallet')
+
+    # --- 2. PREPARE DATA FOR GET REQUEST (Display) ---
+    deposits = Transaction.objects.filter(user=request.user, transaction_type='deposit', status='success').aggregate(
+        Sum('amount'))['amount__sum'] or 0
+    withdrawals = \
+    Transaction.objects.filter(user=request.user, transaction_type='withdrawal', status='success').aggregate(
+        Sum('amount'))['amount__sum'] or 0
+    escrow_holds = \
+    Transaction.objects.filter(user=request.user, transaction_type='escrow_hold', status='success').aggregate(
+        Sum('amount'))['amount__sum'] or 0
+
+    # The TRUE balance available to the user
+    available_balance = deposits - withdrawals - escrow_holds
+
+    # Get History
+    history = Transaction.objects.filter(user=request.user).order_by('-created_at')[:10]
+
+    # Initialize Forms
+    deposit_form = DepositForm()
+    withdraw_form = WithdrawForm()
+
+    context = {
+        'balance': available_balance,
+        'transactions': history,
+        'deposit_form': deposit_form,
+        'withdraw_form': withdraw_form
+    }
+    return render(request, 'talents/wallet.html', context)
+
+
+@login_required
+def payment_checkout(request, reference):
+    transaction = get_object_or_404(Transaction, reference=reference, user=request.user)
+    
+    context = {
+        'transaction': transaction,
+        'paystack_public_key': settings.PAYSTACK_PUBLIC_KEY,
+        'amount_value': int(transaction.amount * 100), # Paystack expects Kobo (Naira * 100)
+        'email': request.user.email
+    }
+    return render(request, 'talents/payment_checkout.html', context)
+
+
+async def verify_payment(request, reference):
+    # Paystack redirects here after checkout. The view is async so that, under ASGI, waiting
+    # on Paystack doesn't hold a worker (see core/asgi.py). login_required can't wrap
+    # coroutines before Django 5.0, hence the explicit check.
+    user = await sync_to_async(get_user)(request)
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+
+    transaction = await Transaction.objects.filter(reference=reference, user=user).afirst()
+    if transaction is None:
+        raise Http404("No Transaction matches the given query.")
+
+    # 1. Check if already verified
+    if transaction.status == 'success':
+        return redirect('wallet')
+
+    # 2. Ask Paystack right away; if it can't be reached, a background worker retries and
+    # the user gets a notification once it's settled
+    import httpx
+    try:
+        paid = await paystack.averify(transaction)
+    except (httpx.HTTPError, ValueError, KeyError):
+        await sync_to_async(verify_paystack_payment.delay)(transaction.id)
+        messages.info(request, "We're confirming your payment with Paystack. Your wallet will update in a moment.")
+        return redirect('wallet')
+
+    if paid:
+        messages.success(request, f"Payment Verified! ₦{transaction.amount} added to your wallet.")
+    else:
+        messages.error(request, "Payment verification failed.")
+    return redirect('wallet')
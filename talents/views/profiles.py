@@ -0,0 +1,146 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.db.models import Avg, Q
+from django.shortcuts import get_object_or_404, redirect, render
+
+from ..models import Profile, Skill
+from ..forms import ReviewForm
+from ..pagecache import anonymous_page_cache
+from ..routers import replica_reads
+from ..tasks import create_notification
+
+
+@anonymous_page_cache
+@replica_reads
+def browse(request):
+    # 1. Fetch profiles (Renamed variable to match template)
+    # Removing 'onboarding_complete=True' for now so you can see your test profiles
+    profiles = Profile.objects.select_related('user').prefetch_related('skills').filter(role='freelancer').order_by(
+        '-rank_score', '-id')  # profile_role_rank_idx
+
+    skills = Skill.objects.all()
+
+    # 2. Search Logic
+    query = request.GET.get('q')
+    if query:
+        profiles = profiles.filter(
+            Q(user__username__icontains=query) |
+            Q(user__first_name__icontains=query) |
+            Q(bio__icontains=query) |
+            Q(skills__name__icontains=query) |
+            Q(headline__icontains=query)
+        ).distinct()
+
+    # 3. Location Filter
+    location_query = request.GET.get('location')
+    if location_query:
+        profiles = profiles.filter(location__icontains=location_query)
+
+    # 4. Skill Filter
+    skill_filter = request.GET.get('skill')
+    if skill_filter:
+        profiles = profiles.filter(skills__name=skill_filter)
+
+    context = {
+        'profiles': profiles,  # <--- FIXED: Changed from 'talents' to 'profiles'
+        'skills': skills,
+        'search_query': query
+    }
+    return render(request, 'talents/browse.html', context)
+
+
+@anonymous_page_cache
+@replica_reads
+def profile_detail(request, slug):
+    profile = get_object_or_404(Profile.objects.select_related('user'), slug=slug)
+    
+    # Handle Review Submission
+    if request.method == 'POST' and request.user.is_authenticated:
+        if request.user == profile.user:
+            messages.error(request, "You cannot review your own profile.")
+            return redirect('profile_detail', slug=slug)
+
+        form = ReviewForm(request.POST)
+        if form.is_valid():
+            try:
+                review = form.save(commit=False)
+                review.talent = profile
+                review.author = request.user
+                review.save()
+                
+                create_notification.delay(
+                    profile.user_id, f"New {review.rating}★ review from {request.user.username}!"
+                )
+                messages.success(request, 'Review submitted successfully!')
+            except Exception: 
+                messages.error(request, "You have already reviewed this talent.")
+            
+            return redirect('profile_detail', slug=slug)
+    else:
+        form = ReviewForm()
+
+    reviews = profile.reviews.select_related('author').order_by('-created_at')
+    avg_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0
+    
+    is_following = False
+    if request.user.is_authenticated and request.user != profile.user:
+        is_following = request.user.profile.follows.filter(id=profile.id).exists()
+
+    context = {
+        'profile': profile,
+        'form': form,
+        'reviews': reviews,
+        'avg_rating': round(avg_rating, 1),
+        'review_count': reviews.count(),
+        'is_following': is_following,
+    }
+    return render(request, 'talents/profile_detail.html', context)
+
+
+@anonymous_page_cache
+def public_profile(request, username):
+    # Get the user by username (or 404 if not found)
+    profile_user = get_object_or_404(User, username=username)
+    
+    is_following = False
+    if request.user.is_authenticated and request.user != profile_user:
+        is_following = request.user.profile.follows.filter(id=profile_user.profile.id).exists()
+        
+    return render(request, 'talents/public_profile.html', {
+        'profile_user': profile_user,
+        'is_following': is_following
+    })
+
+
+@login_required
+def toggle_follow(request, profile_id):
+    target_profile = get_object_or_404(Profile, id=profile_id)
+    user_profile = request.user.profile
+    
+    if target_profile in user_profile.follows.all():
+        user_profile.follows.remove(target_profile)
+        # messages.info(request, f"You unfollowed {target_profile.user.username}.")
+    else:
+        user_profile.follows.add(target_profile)
+        # Notify the user
+        create_notification.delay(target_profile.user_id, f"{request.user.username} started following you.")
+        # messages.success(request, f"You are now following {target_profile.user.username}.")
+        
+    return redirect(request.META.get('HTTP_REFERER', 'home'))
+
+
+@login_required
+def leave_review(request):
+    if request.method == 'POST':
+        # Here you would save the Review model
+        messages.success(request, "Review submitted successfully!")
+        return redirect('dashboard')
+        
+    # Mock data for the preview
+    context = {
+        'freelancer_name': 'Sarah Jenkins',
+        'job_title': 'E-Commerce Website Redesign'
+    }
+    return render(request, 'talents/leave_review.html', context)
+